@@ -0,0 +1,79 @@
+"""
+Společné části benchmarků a kontrol.
+
+Měřený kód běží vždy v novém procesu Pythonu ve zdrojovém adresáři (jako
+CLI), aby výsledky neovlivnily importy ani cache skriptu, který měření
+spouští. Měřený kód (probe) vypíše výsledek jako JSON na poslední řádek
+standardního výstupu.
+"""
+
+import dataclasses
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCHMARKS_DIR.parent / 'src'
+
+
+def run_probe(probe: str, *args, env: dict = None):
+    """
+    Spustí měřený kód v novém procesu a vrátí jeho výsledek.
+
+    Měřený kód si může importovat tento modul (např. record).
+
+    Args:
+        probe: Zdrojový kód spouštěný přes python -c
+        *args: Argumenty předané kódu v sys.argv[1:]
+        env: Proměnné prostředí procesu (None = prostředí tohoto procesu)
+
+    Returns:
+        Poslední řádek výstupu načtený jako JSON
+    """
+    env = dict(os.environ if env is None else env)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(BENCHMARKS_DIR), env.get('PYTHONPATH')]))
+    output = subprocess.run(
+        [sys.executable, '-c', probe, *map(str, args)],
+        cwd=SRC_DIR, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_cli(*args, **kwargs) -> subprocess.CompletedProcess:
+    """
+    Spustí CLI generátoru (main.py) v novém procesu.
+
+    Args:
+        *args: Argumenty příkazové řádky
+        **kwargs: Další argumenty subprocess.run (výchozí check=True
+            a zachycený výstup)
+
+    Returns:
+        Dokončený proces
+    """
+    kwargs.setdefault('check', True)
+    kwargs.setdefault('capture_output', True)
+    return subprocess.run([sys.executable, 'main.py', *map(str, args)], cwd=SRC_DIR, **kwargs)
+
+
+def record(obj):
+    """
+    Převede model faktury na slovník ve tvaru JSON konfigurace.
+
+    Bere jen pole předávaná konstruktoru, bez interních polí (cache součtů)
+    a bez strict_validation, data převádí na ISO formát.
+
+    Args:
+        obj: Model (dataclass), seznam modelů nebo hodnota
+
+    Returns:
+        Hodnota serializovatelná do JSON
+    """
+    if dataclasses.is_dataclass(obj):
+        return {f.name: record(getattr(obj, f.name))
+                for f in dataclasses.fields(obj) if f.init and f.name != 'strict_validation'}
+    if isinstance(obj, list):
+        return [record(value) for value in obj]
+    return obj.isoformat() if hasattr(obj, 'isoformat') else obj
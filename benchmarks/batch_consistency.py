@@ -0,0 +1,117 @@
+"""
+Kontrola konzistence dávkového generování (počet souborů a reprodukovatelnost).
+
+Spustí CLI s konfigurací, ve které mají všechny faktury stejné číslo,
+na několika procesech a ověří, že N úloh dá N souborů - souběžné procesy
+si soubory se stejným názvem nesmí přepsat. Dále vygeneruje stejnou dávku
+se --seed (s QR kódem a ISDOC přílohou) v jednom a v --workers procesech
+do ZIP archivu a ověří, že se archivy shodují název po názvu a bajt po bajtu
+(porovnává se obsah položek, ne časová razítka archivu). Při porušení
+skončí kódem 1, takže jde použít jako automatická kontrola.
+
+Použití:
+    python benchmarks/batch_consistency.py [--count 64] [--workers 8] [--seed 42]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+from _common import SRC_DIR, run_cli
+
+# Konfigurace s pevným číslem faktury - všechny soubory chtějí stejný název
+_CONFIG = SRC_DIR / 'test_config.json'
+
+
+def check_file_count(count: int, workers: int) -> dict:
+    """
+    Vygeneruje dávku do prázdného adresáře a spočítá soubory.
+
+    Args:
+        count: Počet faktur
+        workers: Počet pracovních procesů
+
+    Returns:
+        Slovník s očekávaným a skutečným počtem souborů
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        run_cli('generate', '--count', count, '--config', _CONFIG, '--workers', workers,
+                '--output', output_dir)
+        files = [path for path in Path(output_dir).iterdir() if path.stat().st_size > 0]
+
+    return {'check': 'file_count', 'workers': workers, 'expected': count, 'files': len(files)}
+
+
+def seeded_archive(count: int, workers: int, seed: int, archive: Path) -> dict:
+    """
+    Vygeneruje reprodukovatelnou dávku do ZIP archivu.
+
+    Args:
+        count: Počet faktur
+        workers: Počet pracovních procesů
+        seed: Seed dávky
+        archive: Cesta k vytvořenému archivu
+
+    Returns:
+        Slovník název položky -> SHA-256 jejího obsahu (v pořadí archivu)
+    """
+    run_cli('generate', '--count', count, '--seed', seed, '--qr', '--isdoc',
+            '--workers', workers, '--sink', f'zip:{archive}')
+    with zipfile.ZipFile(archive) as zf:
+        return {name: hashlib.sha256(zf.read(name)).hexdigest() for name in zf.namelist()}
+
+
+def check_seeded_identity(count: int, workers: int, seed: int) -> dict:
+    """
+    Porovná dávku se seedem vygenerovanou v jednom a ve více procesech.
+
+    Args:
+        count: Počet faktur
+        workers: Počet pracovních procesů druhého běhu
+        seed: Seed dávky
+
+    Returns:
+        Slovník s počtem položek a seznamem rozdílných názvů
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        single = seeded_archive(count, 1, seed, Path(workdir) / 'single.zip')
+        parallel = seeded_archive(count, workers, seed, Path(workdir) / 'parallel.zip')
+
+    differing = sorted(name for name in single.keys() | parallel.keys()
+                       if single.get(name) != parallel.get(name))
+    return {'check': 'seeded_identity', 'workers': workers, 'seed': seed,
+            'files': len(single), 'order_matches': list(single) == list(parallel),
+            'differing': differing}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=64, help='Počet faktur v dávce')
+    parser.add_argument('--workers', type=int, default=8, help='Počet pracovních procesů')
+    parser.add_argument('--seed', type=int, default=42, help='Seed reprodukovatelné dávky')
+    args = parser.parse_args()
+
+    count_result = check_file_count(args.count, args.workers)
+    identity_result = check_seeded_identity(args.count, args.workers, args.seed)
+    results = [count_result, identity_result]
+
+    violations = []
+    if count_result['files'] != count_result['expected']:
+        violations.append(f"file_count: očekáváno {count_result['expected']} souborů, "
+                          f"vzniklo {count_result['files']}")
+    if identity_result['differing'] or not identity_result['order_matches']:
+        violations.append(f"seeded_identity: 1 a {args.workers} procesů se liší "
+                          f"({len(identity_result['differing'])} souborů, "
+                          f"pořadí {'shodné' if identity_result['order_matches'] else 'rozdílné'})")
+
+    print(json.dumps({'results': results, 'violations': violations}, indent=2, ensure_ascii=False))
+    if violations:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
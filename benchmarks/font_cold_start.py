@@ -0,0 +1,71 @@
+"""
+Měření studeného startu registrace fontů s diskovým cache a bez něj.
+
+Každé měření běží v novém procesu Pythonu, takže zahrnuje vše, co platí
+krátce běžící CLI nebo nový pracovní proces poolu.
+
+Použití:
+    python benchmarks/font_cold_start.py [--runs 15]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+
+from _common import run_probe
+
+# Kód spouštěný v měřeném procesu - vrací čas registrace fontů v ms
+_PROBE = """
+import time
+from pdf_templates.base import _discover_and_register_fonts
+start = time.perf_counter()
+_discover_and_register_fonts()
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def _run_probe(env: dict) -> float:
+    """Spustí měřený proces a vrátí čas registrace fontů v ms."""
+    return float(run_probe(_PROBE, env=env))
+
+
+def measure(runs: int) -> dict:
+    """
+    Změří registraci fontů bez cache, při plnění cache a s teplým cache.
+
+    Args:
+        runs: Počet opakování pro každý režim
+
+    Returns:
+        Slovník s mediány v ms
+    """
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, INVOICE_GENERATOR_CACHE_DIR=cache_dir)
+        env.pop('INVOICE_GENERATOR_NO_FONT_CACHE', None)
+        no_cache_env = dict(env, INVOICE_GENERATOR_NO_FONT_CACHE='1')
+
+        no_cache = [_run_probe(no_cache_env) for _ in range(runs)]
+        cache_fill = _run_probe(env)
+        warm_cache = [_run_probe(env) for _ in range(runs)]
+
+    return {
+        'runs': runs,
+        'no_cache_ms': round(statistics.median(no_cache), 2),
+        'cache_fill_ms': round(cache_fill, 2),
+        'warm_cache_ms': round(statistics.median(warm_cache), 2),
+        'speedup': round(statistics.median(no_cache) / statistics.median(warm_cache), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=15, help='Počet opakování')
+    args = parser.parse_args()
+
+    print(json.dumps(measure(args.runs), indent=2))
+
+
+if __name__ == '__main__':
+    main()
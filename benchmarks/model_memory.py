@@ -0,0 +1,90 @@
+"""
+Měření paměti modelů faktur držených v paměti (bajty na fakturu).
+
+Každé měření běží v novém procesu Pythonu, který sestaví celou dávku
+faktur, drží ji v seznamu a změří nárůst RSS. Zdroj 'generated' odpovídá
+dávce z generátoru se zásobami firem (firmy jsou sdílené), zdroj 'json'
+korpusu načtenému z NDJSON (každá faktura má vlastní firmy a řetězce).
+
+Použití:
+    python benchmarks/model_memory.py [--count 1000000] [--source generated json]
+"""
+
+import argparse
+import json
+
+from _common import run_probe
+
+# Kód spouštěný v měřeném procesu - vypíše JSON s výsledkem
+_PROBE = """
+import gc, json, os, random, sys, time
+import data_utils
+from _common import record
+
+def rss():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+count, source = int(sys.argv[1]), sys.argv[2]
+rng = random.Random(0)
+suppliers = data_utils.CompanyPool(100, rng=rng)
+customers = data_utils.CompanyPool(1000, rng=rng)
+
+if source == 'json':
+    # Záznam projde serializací, takže řetězce nejsou sdílené s konstantami
+    def make():
+        inv = data_utils.generate_invoice(rng=rng, supplier_pool=suppliers, customer_pool=customers)
+        data = json.loads(json.dumps(record(inv)))
+        return data_utils.InvoicePrototype(data).build()
+else:
+    def make():
+        return data_utils.generate_invoice(rng=rng, supplier_pool=suppliers, customer_pool=customers)
+
+make()
+gc.collect()
+before = rss()
+start = time.perf_counter()
+invoices = [make() for _ in range(count)]
+elapsed = time.perf_counter() - start
+gc.collect()
+used = rss() - before
+print(json.dumps({'bytes': used, 'seconds': elapsed,
+                  'items': sum(len(i.items) for i in invoices)}))
+"""
+
+
+def measure(count: int, source: str) -> dict:
+    """
+    Změří paměť dávky faktur v novém procesu.
+
+    Args:
+        count: Počet faktur držených v paměti
+        source: Zdroj faktur ('generated' nebo 'json')
+
+    Returns:
+        Slovník s bajty na fakturu a celkovou spotřebou
+    """
+    result = run_probe(_PROBE, count, source)
+
+    return {
+        'source': source,
+        'count': count,
+        'bytes_per_invoice': round(result['bytes'] / count, 1),
+        'items_per_invoice': round(result['items'] / count, 2),
+        'total_mb': round(result['bytes'] / 2 ** 20, 1),
+        'build_seconds': round(result['seconds'], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=1_000_000, help='Počet faktur v paměti')
+    parser.add_argument('--source', nargs='+', default=['generated', 'json'],
+                        choices=['generated', 'json'], help='Zdroj faktur')
+    args = parser.parse_args()
+
+    print(json.dumps([measure(args.count, source) for source in args.source], indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Měření výstupních profilů PDF (bajty a milisekundy na fakturu).
+
+Každé měření běží v novém procesu Pythonu: po zahřátí (registrace fontů,
+importy) vykreslí --count reprodukovatelných faktur s QR kódem a ISDOC
+přílohou do paměti a změří průměrnou velikost a dobu vykreslení jedné
+faktury. Režim 'single' vykresluje každou fakturu do samostatného PDF
+(BaseTemplate.generate), režim 'document' celou dávku do jednoho PDF
+(BaseTemplate.generate_document, jako --single-pdf), kde se fonty
+a statické části šablony sdílejí. S --qr-backends se profily porovnají
+i pro jednotlivé způsoby vykreslení QR kódu.
+
+Použití:
+    python benchmarks/output_profiles.py [--count 200] [--templates classic modern minimal]
+        [--profiles fast balanced smallest] [--modes single document]
+        [--qr-backends raster vector]
+"""
+
+import argparse
+import json
+
+from _common import run_probe
+
+# Kód spouštěný v měřeném procesu - vypíše JSON s výsledkem
+_PROBE = """
+import io, json, sys, time
+import data_utils
+from pdf_templates import get_template
+
+count, template_name, profile, mode, backend = (int(sys.argv[1]), sys.argv[2], sys.argv[3],
+                                                sys.argv[4], sys.argv[5])
+invoices = [data_utils.generate_seeded_invoice(0, i) for i in range(count)]
+options = dict(with_qr=True, with_isdoc=True, invariant=True, profile=profile, qr_backend=backend)
+
+template = get_template(template_name)()
+template.render_bytes(invoices[0], **options)
+
+start = time.perf_counter()
+if mode == 'document':
+    buffer = io.BytesIO()
+    template.generate_document(invoices, buffer, **options)
+    size = buffer.tell()
+else:
+    size = 0
+    for invoice in invoices:
+        size += len(template.render_bytes(invoice, **options))
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'bytes': size}))
+"""
+
+
+def measure(count: int, template: str, profile: str, mode: str, backend: str) -> dict:
+    """
+    Změří vykreslení dávky faktur jedním profilem v novém procesu.
+
+    Args:
+        count: Počet faktur
+        template: Název šablony
+        profile: Název výstupního profilu
+        mode: 'single' (PDF na fakturu) nebo 'document' (jedno PDF)
+        backend: Způsob vykreslení QR kódu ('raster' nebo 'vector')
+
+    Returns:
+        Slovník s bajty a milisekundami na fakturu
+    """
+    result = run_probe(_PROBE, count, template, profile, mode, backend)
+
+    return {
+        'template': template,
+        'profile': profile,
+        'mode': mode,
+        'qr_backend': backend,
+        'count': count,
+        'bytes_per_invoice': round(result['bytes'] / count),
+        'ms_per_invoice': round(result['seconds'] * 1000 / count, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=200, help='Počet faktur na měření')
+    parser.add_argument('--templates', nargs='+', default=['classic', 'modern', 'minimal'],
+                        help='Měřené šablony')
+    parser.add_argument('--profiles', nargs='+', default=['fast', 'balanced', 'smallest'],
+                        help='Měřené výstupní profily')
+    parser.add_argument('--modes', nargs='+', default=['single', 'document'],
+                        choices=['single', 'document'], help='Režim vykreslení')
+    parser.add_argument('--qr-backends', nargs='+', default=['raster'],
+                        choices=['raster', 'vector'], help='Způsob vykreslení QR kódu')
+    args = parser.parse_args()
+
+    results = [measure(args.count, template, profile, mode, backend)
+               for backend in args.qr_backends
+               for mode in args.modes
+               for template in args.templates
+               for profile in args.profiles]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
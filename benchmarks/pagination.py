@@ -0,0 +1,89 @@
+"""
+Měření stránkování velkých faktur (stránky za sekundu a špička paměti).
+
+Každé měření běží v novém procesu Pythonu: sestaví fakturu s --lines
+položkami (ItemColumns), vykreslí ji šablonou do paměti a změří dobu
+vykreslení, počet stránek a nárůst špičky RSS (VmHWM) během vykreslení.
+Při stejném tvaru řádků má špička paměti růst jen s velikostí výsledného
+(komprimovaného) PDF, ne s nezkomprimovaným obsahem stránek.
+
+Použití:
+    python benchmarks/pagination.py [--lines 100000] [--templates classic modern minimal]
+"""
+
+import argparse
+import json
+
+from _common import run_probe
+
+# Kód spouštěný v měřeném procesu - vypíše JSON s výsledkem
+_PROBE = """
+import io, json, random, sys, time
+import data_utils
+from models import ItemColumns
+from pdf_templates import get_template
+
+def peak_rss():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM'):
+                return int(line.split()[1]) * 1024
+
+lines, template_name = int(sys.argv[1]), sys.argv[2]
+rng = random.Random(0)
+invoice = data_utils.generate_invoice(rng=rng)
+items = ItemColumns()
+for _ in range(lines):
+    items.add(f"Hovor na číslo 7{rng.randint(10000000, 99999999)}", rng.randint(1, 60), 'min',
+              rng.randint(1, 30), rng.choice((21, 21, 10)))
+invoice.items = items
+
+template = get_template(template_name)()
+template.render_bytes(data_utils.generate_invoice(rng=rng))
+before = peak_rss()
+buffer = io.BytesIO()
+start = time.perf_counter()
+template.generate(invoice, buffer, with_qr=True, invariant=True)
+elapsed = time.perf_counter() - start
+pages = buffer.getvalue().count(b'/Type /Page\\n')
+print(json.dumps({'seconds': elapsed, 'pages': pages, 'bytes': buffer.tell(),
+                  'peak_growth': peak_rss() - before}))
+"""
+
+
+def measure(lines: int, template: str) -> dict:
+    """
+    Změří vykreslení velké faktury v novém procesu.
+
+    Args:
+        lines: Počet položek faktury
+        template: Název šablony
+
+    Returns:
+        Slovník se stránkami za sekundu a špičkou paměti
+    """
+    result = run_probe(_PROBE, lines, template)
+
+    return {
+        'template': template,
+        'lines': lines,
+        'pages': result['pages'],
+        'seconds': round(result['seconds'], 2),
+        'pages_per_second': round(result['pages'] / result['seconds'], 1),
+        'pdf_mb': round(result['bytes'] / 2 ** 20, 1),
+        'peak_growth_mb': round(result['peak_growth'] / 2 ** 20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=100_000, help='Počet položek faktury')
+    parser.add_argument('--templates', nargs='+', default=['classic', 'modern', 'minimal'],
+                        help='Měřené šablony')
+    args = parser.parse_args()
+
+    print(json.dumps([measure(args.lines, template) for template in args.templates], indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""
+Mikrobenchmark jednotlivých fází generování faktury s porovnáním proti baseline.
+
+Fáze se měří odděleně, aby bylo po aktualizaci závislostí (reportlab,
+pypdf, qrcode, Pillow) vidět, která část zpomalila: generování dat
+(data_utils.generate_invoice, samostatně i se zásobami firem), načtení konfigurace (load_from_json),
+vykreslení každou šablonou (generate), QR kód (generate_qr_code), ISDOC XML
+(ISDOCGenerator.generate) a přepis hotového PDF (add_qr_to_existing_pdf,
+attach_isdoc_to_pdf).
+
+Data jsou reprodukovatelná: fixtures small, medium a huge se liší jen počtem
+položek a vznikají ze seedu jako JSON konfigurace, ze které se faktura
+načte. Každá fáze se zahřeje (importy, registrace fontů), krátké fáze se
+v jednom běhu opakují, dokud běh netrvá aspoň 20 ms. Pak proběhne --runs
+kol, v každém jeden běh každé fáze - kolísání výkonu stroje tak dopadne na
+všechny fáze stejně. Příprava (např. kopie vstupního PDF) se do času
+nepočítá. Celé měření se opakuje v --repeat nových procesech Pythonu;
+výsledkem je medián mediánů jednotlivých procesů a minimum času jednoho
+volání v ms.
+
+S --baseline se výsledky porovnají s uloženým během (stages_baseline.json
+vedle skriptu). Porovnávají se mediány; fáze je regrese, jen když je
+pomalejší víc než --threshold krát a zároveň o víc než --tolerance-ms -
+zpomalení velmi krátkých fází o setiny ms je šum. Při regresi skript
+skončí kódem 1. Baseline platí jen pro stroj a strom, na kterých vznikla -
+po změně stroje nebo měřených fází se uloží znovu přes --save-baseline.
+
+Použití:
+    python benchmarks/stages.py [--runs 7] [--repeat 3] [--fixtures small medium huge]
+        [--save-baseline] [--baseline [CESTA]] [--threshold 1.5] [--tolerance-ms 0.05]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+from pathlib import Path
+
+from _common import BENCHMARKS_DIR, run_probe
+
+DEFAULT_BASELINE = BENCHMARKS_DIR / 'stages_baseline.json'
+
+# Počet položek jednotlivých fixtures (huge je nad prahem ItemColumns)
+FIXTURES = {'small': 3, 'medium': 40, 'huge': 2000}
+
+# Kód spouštěný v měřeném procesu - vypíše JSON s výsledky
+_PROBE = """
+import io, json, os, random, shutil, statistics, sys, tempfile, time
+from importlib import metadata
+import data_utils
+from _common import record
+from pdf_templates import get_template
+from qr_generator import QRGenerator, add_qr_to_existing_pdf
+from isdoc_generator import ISDOCGenerator, attach_isdoc_to_pdf
+
+runs, fixtures = int(sys.argv[1]), json.loads(sys.argv[2])
+SEED = 2024
+
+def fixture_config(count):
+    rng = random.Random(data_utils.derive_seed(SEED, count))
+    invoice = data_utils.generate_invoice(rng=rng)
+    items = []
+    while len(items) < count:
+        items.extend(data_utils.generate_items(min(count - len(items), 20), rng=rng))
+    invoice.items = items
+    return record(invoice)
+
+def calibrate(func, setup=None):
+    # Jako timeit.autorange - počet volání v jednom běhu, aby běh trval
+    # aspoň 20 ms; vrací funkci, která běh změří (příprava se nepočítá)
+    def run(number):
+        elapsed = 0.0
+        for _ in range(number):
+            if setup: setup()
+            start = time.perf_counter()
+            func()
+            elapsed += time.perf_counter() - start
+        return elapsed * 1000 / number
+    number = 1
+    while run(number) * number < 20:
+        number *= 2
+    return lambda: run(number)
+
+def stages(workdir, fixture, count):
+    config_path = os.path.join(workdir, f'{fixture}.json')
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(fixture_config(count), f, ensure_ascii=False)
+    invoice = data_utils.load_from_json(config_path, rng=random.Random(SEED))
+
+    yield 'load_from_json', lambda: data_utils.load_from_json(config_path, rng=random.Random(SEED)), None
+    for name in ('classic', 'modern', 'minimal'):
+        template = get_template(name)()
+        yield f'{name}.generate', lambda t=template: t.generate(invoice, io.BytesIO(), invariant=True), None
+    yield 'generate_qr_code', lambda: QRGenerator.generate_qr_code(invoice), None
+    xml_path = os.path.join(workdir, f'{fixture}.xml')
+    yield 'isdoc.generate', lambda: ISDOCGenerator.generate(invoice, xml_path), None
+
+    # Přepisované PDF se před každým během obnoví z hotového výstupu šablony
+    source_path = os.path.join(workdir, f'{fixture}_source.pdf')
+    pdf_path = os.path.join(workdir, f'{fixture}.pdf')
+    get_template('classic')().generate(invoice, source_path, invariant=True)
+    restore = lambda: shutil.copyfile(source_path, pdf_path)
+    yield 'add_qr_to_existing_pdf', lambda: add_qr_to_existing_pdf(invoice, pdf_path), restore
+    yield 'attach_isdoc_to_pdf', lambda: attach_isdoc_to_pdf(invoice, pdf_path), restore
+
+# Fáze se měří na střídačku (v každém kole jednou každá), aby se kolísání
+# výkonu stroje rozložilo do všech fází stejně
+measured = []
+seeds = iter(range(10 ** 6))
+measured.append(('generated', None, 'generate_invoice',
+                 calibrate(lambda: data_utils.generate_invoice(rng=random.Random(next(seeds))))))
+# Se zásobami firem jako --suppliers 20 --customers 500
+pool_rng = random.Random(SEED)
+pools = dict(supplier_pool=data_utils.CompanyPool(20, rng=pool_rng),
+             customer_pool=data_utils.CompanyPool(500, rng=pool_rng))
+measured.append(('generated', None, 'generate_invoice_pooled',
+                 calibrate(lambda: data_utils.generate_invoice(rng=pool_rng, **pools))))
+
+with tempfile.TemporaryDirectory() as workdir:
+    for fixture, count in fixtures.items():
+        for stage, func, setup in stages(workdir, fixture, count):
+            measured.append((fixture, count, stage, calibrate(func, setup)))
+
+    timings = [[] for _ in measured]
+    for _ in range(runs):
+        for position, (_, _, _, run) in enumerate(measured):
+            timings[position].append(run())
+
+results = [{'fixture': fixture, 'items': items, 'stage': stage,
+            'median_ms': round(statistics.median(stage_timings), 3),
+            'min_ms': round(min(stage_timings), 3)}
+           for (fixture, items, stage, _), stage_timings in zip(measured, timings)]
+
+environment = {'python': sys.version.split()[0]}
+for package in ('reportlab', 'pypdf', 'qrcode', 'Pillow', 'Faker'):
+    try:
+        environment[package] = metadata.version(package)
+    except metadata.PackageNotFoundError:
+        environment[package] = None
+print(json.dumps({'environment': environment, 'runs': runs, 'results': results}))
+"""
+
+
+def measure(runs: int, repeat: int, fixtures: list) -> dict:
+    """
+    Změří všechny fáze v několika nových procesech.
+
+    Args:
+        runs: Počet měřených běhů každé fáze v jednom procesu
+        repeat: Počet procesů, ve kterých se měření opakuje
+        fixtures: Názvy měřených fixtures
+
+    Returns:
+        Slovník s verzemi závislostí ('environment') a výsledky fází ('results')
+    """
+    sizes = json.dumps({name: FIXTURES[name] for name in fixtures})
+    reports = [run_probe(_PROBE, runs, sizes) for _ in range(repeat)]
+
+    # Fáze jsou ve všech procesech ve stejném pořadí
+    results = []
+    for stage_results in zip(*(report['results'] for report in reports)):
+        result = dict(stage_results[0])
+        result['median_ms'] = round(statistics.median(r['median_ms'] for r in stage_results), 3)
+        result['min_ms'] = min(r['min_ms'] for r in stage_results)
+        results.append(result)
+
+    return {'environment': reports[0]['environment'], 'runs': runs, 'repeat': repeat,
+            'results': results}
+
+
+def compare(report: dict, baseline: dict, threshold: float, tolerance_ms: float) -> list:
+    """
+    Doplní do výsledků srovnání s baseline.
+
+    Args:
+        report: Výsledek measure (výsledky se doplní na místě)
+        baseline: Uložený výsledek measure
+        threshold: Poměr mediánů, od kterého je fáze regrese
+        tolerance_ms: Nejmenší zpomalení v ms, které se počítá jako regrese
+
+    Returns:
+        Seznam popisů regresí
+    """
+    reference = {(r['fixture'], r['stage']): r['median_ms'] for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        baseline_ms = reference.get((result['fixture'], result['stage']))
+        if not baseline_ms:
+            continue
+        ratio = result['median_ms'] / baseline_ms
+        result['baseline_median_ms'] = baseline_ms
+        result['ratio'] = round(ratio, 2)
+        if ratio > threshold and result['median_ms'] - baseline_ms > tolerance_ms:
+            regressions.append(f"{result['fixture']}/{result['stage']}: "
+                               f"{baseline_ms:.3f} -> {result['median_ms']:.3f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=7, help='Počet měřených běhů každé fáze')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Počet procesů, ve kterých se měření opakuje')
+    parser.add_argument('--fixtures', nargs='+', default=list(FIXTURES), choices=list(FIXTURES),
+                        help='Měřené fixtures')
+    parser.add_argument('--baseline', nargs='?', const=str(DEFAULT_BASELINE), default=None,
+                        help='Porovnat s uloženou baseline (výchozí stages_baseline.json)')
+    parser.add_argument('--save-baseline', nargs='?', const=str(DEFAULT_BASELINE), default=None,
+                        help='Uložit výsledek jako baseline')
+    parser.add_argument('--threshold', type=float, default=1.5,
+                        help='Poměr mediánů proti baseline, od kterého jde o regresi')
+    parser.add_argument('--tolerance-ms', type=float, default=0.05,
+                        help='Nejmenší zpomalení v ms, které se počítá jako regrese')
+    args = parser.parse_args()
+
+    report = measure(args.runs, args.repeat, args.fixtures)
+
+    if args.baseline is not None:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        report['baseline_environment'] = baseline['environment']
+        report['regressions'] = compare(report, baseline, args.threshold, args.tolerance_ms)
+
+    if args.save_baseline is not None:
+        Path(args.save_baseline).write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+
+    print(json.dumps(report, indent=2))
+    if report.get('regressions'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
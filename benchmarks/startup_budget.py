@@ -0,0 +1,105 @@
+"""
+Kontrola rozpočtu času startu CLI (python main.py version).
+
+Každé měření běží v novém procesu Pythonu. Kromě mediánu doby běhu se
+přes -X importtime ověřuje, že start nenačítá těžké závislosti (reportlab,
+Faker, qrcode, Pillow, ...) - ty se mají importovat až při generování.
+Při překročení rozpočtu nebo nalezení zakázaného modulu skončí kódem 1,
+takže jde použít jako automatická kontrola.
+
+Použití:
+    python benchmarks/startup_budget.py [--runs 15] [--budget-ms 200]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from _common import SRC_DIR, run_cli
+
+# Příkaz CLI, jehož start se měří
+_COMMAND = ['version']
+
+# Moduly, které se při startu nesmí importovat
+HEAVY_MODULES = ('reportlab', 'faker', 'qrcode', 'PIL', 'pypdf', 'lxml',
+                 'pdf_templates', 'invoice_generator', 'data_utils')
+
+
+def _run_command() -> float:
+    """Spustí měřený příkaz a vrátí dobu běhu v ms."""
+    start = time.perf_counter()
+    run_cli(*_COMMAND)
+    return (time.perf_counter() - start) * 1000
+
+
+def imported_modules() -> dict:
+    """
+    Vrátí moduly importované při startu s kumulativním časem importu.
+
+    Returns:
+        Slovník název modulu -> kumulativní čas v ms
+    """
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', 'main.py', *_COMMAND],
+                            cwd=SRC_DIR, check=True, capture_output=True, text=True).stderr
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        modules[name.strip()] = int(cumulative) / 1000
+    return modules
+
+
+def measure(runs: int, budget_ms: float) -> dict:
+    """
+    Změří start CLI a ověří rozpočet.
+
+    Args:
+        runs: Počet opakování
+        budget_ms: Povolený medián doby běhu v ms
+
+    Returns:
+        Slovník s výsledky a seznamem porušení
+    """
+    timings = [_run_command() for _ in range(runs)]
+    modules = imported_modules()
+
+    heavy = sorted(name for name in modules if name.split('.')[0] in HEAVY_MODULES)
+    slowest = sorted(((name, ms) for name, ms in modules.items() if '.' not in name),
+                     key=lambda item: item[1], reverse=True)[:5]
+    median = statistics.median(timings)
+
+    violations = []
+    if median > budget_ms:
+        violations.append(f"medián {median:.1f} ms překračuje rozpočet {budget_ms:.0f} ms")
+    if heavy:
+        violations.append(f"start importuje těžké moduly: {', '.join(heavy)}")
+
+    return {
+        'command': ' '.join(['python', 'main.py', *_COMMAND]),
+        'runs': runs,
+        'budget_ms': budget_ms,
+        'median_ms': round(median, 2),
+        'min_ms': round(min(timings), 2),
+        'slowest_imports_ms': {name: round(ms, 2) for name, ms in slowest},
+        'heavy_modules': heavy,
+        'violations': violations,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=15, help='Počet opakování')
+    parser.add_argument('--budget-ms', type=float, default=200, help='Rozpočet mediánu v ms')
+    args = parser.parse_args()
+
+    result = measure(args.runs, args.budget_ms)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    sys.exit(1 if result['violations'] else 0)
+
+
+if __name__ == '__main__':
+    main()
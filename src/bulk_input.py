@@ -0,0 +1,190 @@
+"""
+Proudové čtení hromadného vstupu faktur (NDJSON nebo CSV).
+
+Záznamy se čtou líně po jednom, v paměti je vždy jen rozpracovaný záznam,
+takže spotřeba paměti nezávisí na velikosti vstupu. Každý záznam má stejnou
+strukturu jako JSON konfigurace (--config) a navíc může určit vlastní
+šablonu ('template') a přílohy ('qr', 'isdoc').
+
+NDJSON: jeden JSON objekt na řádek, prázdné řádky a řádky začínající '#'
+se přeskakují.
+
+CSV: jeden řádek = jedna položka faktury. Sloupce hlavičky faktury
+(invoice_number, issue_date, supplier_*, customer_*, ...) se u všech položek
+opakují, po sobě jdoucí řádky se stejným invoice_number tvoří jednu fakturu.
+Položky jsou ve sloupcích item_description, item_quantity, item_unit,
+item_unit_price a item_vat_rate.
+"""
+
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+
+# Klíče záznamu, které nepatří do dat faktury, ale určují výstup
+RECORD_OPTIONS = ('template', 'qr', 'isdoc')
+
+# Sloupce CSV převáděné na čísla
+_INT_COLUMNS = {'payment_terms_days', 'item_quantity', 'item_unit_price', 'item_vat_rate'}
+
+# Sloupce CSV převáděné na logické hodnoty
+_BOOL_COLUMNS = {'qr', 'isdoc', 'strict_validation', 'use_assignment_clause'}
+_TRUE_VALUES = {'1', 'true', 'yes', 'ano', 'y', 'a'}
+_FALSE_VALUES = {'0', 'false', 'no', 'ne', 'n', ''}
+
+# Trojice (číslo řádku, záznam, chyba) - při chybě je záznam None
+Record = Tuple[int, Optional[dict], Optional[str]]
+
+
+def iter_records(path: str) -> Iterator[Record]:
+    """
+    Líně čte záznamy faktur ze souboru.
+
+    Formát se určí podle přípony (.csv = CSV, jinak NDJSON), '-' čte
+    NDJSON ze standardního vstupu. Chybný záznam nepřeruší čtení - vrátí
+    se s popisem chyby a čtení pokračuje dalším.
+
+    Args:
+        path: Cesta k souboru nebo '-'
+
+    Yields:
+        Trojice (číslo řádku, záznam, chyba)
+    """
+    if path == '-':
+        yield from _iter_ndjson(sys.stdin)
+        return
+
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if Path(path).suffix.lower() == '.csv':
+            yield from _iter_csv(f)
+        else:
+            yield from _iter_ndjson(f)
+
+
+def split_options(record: dict, template: str, with_qr: bool,
+                  with_isdoc: bool) -> Tuple[dict, str, bool, bool]:
+    """
+    Oddělí volby výstupu od dat faktury.
+
+    Args:
+        record: Záznam ze vstupu
+        template: Výchozí šablona (z příkazové řádky)
+        with_qr: Výchozí přidání QR kódu
+        with_isdoc: Výchozí připojení ISDOC
+
+    Returns:
+        Čtveřice (data faktury, šablona, QR, ISDOC)
+
+    Raises:
+        ValueError: Pokud volba nemá správný typ
+    """
+    data = {key: value for key, value in record.items() if key not in RECORD_OPTIONS}
+
+    template = record.get('template') or template
+    if not isinstance(template, str):
+        raise ValueError(f"Šablona musí být text: {template!r}")
+
+    flags = []
+    for key, default in (('qr', with_qr), ('isdoc', with_isdoc)):
+        value = record.get(key, default)
+        if not isinstance(value, bool):
+            raise ValueError(f"Volba '{key}' musí být true nebo false: {value!r}")
+        flags.append(value)
+
+    return data, template, flags[0], flags[1]
+
+
+def _iter_ndjson(lines) -> Iterator[Record]:
+    """Čte záznamy z NDJSON (jeden objekt na řádek)."""
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"Neplatný JSON: {e.msg} (sloupec {e.colno})"
+            continue
+
+        if not isinstance(record, dict):
+            yield line_number, None, "Záznam musí být JSON objekt"
+            continue
+
+        yield line_number, record, None
+
+
+def _iter_csv(f) -> Iterator[Record]:
+    """Čte záznamy z CSV, po sobě jdoucí řádky se stejným číslem faktury spojí."""
+    reader = csv.DictReader(f)
+    started = False
+    record, record_line, record_number, error = None, 0, None, None
+
+    for row in reader:
+        # Číslo řádku v souboru (hlavička je řádek 1)
+        line_number = reader.line_num
+        number = row.get('invoice_number') or None
+
+        # Nová faktura začíná změnou čísla faktury nebo řádkem bez čísla
+        if not started or number is None or number != record_number:
+            if started:
+                yield record_line, record, error
+            started = True
+            record, record_line, record_number, error = {'items': []}, line_number, number, None
+
+        if error is not None:
+            continue
+        try:
+            _merge_csv_row(record, row)
+        except ValueError as e:
+            error = str(e) if line_number == record_line else f"{e} (řádek {line_number})"
+            record = None
+
+    if started:
+        yield record_line, record, error
+
+
+def _merge_csv_row(record: dict, row: dict):
+    """Přidá řádek CSV (hlavičku faktury a jednu položku) do záznamu."""
+    item = {}
+    for column, raw in row.items():
+        if column is None:
+            raise ValueError("Řádek má více hodnot než hlavička")
+        value = _convert_csv_value(column, (raw or '').strip())
+        if value is None:
+            continue
+
+        if column.startswith('item_'):
+            item[column[len('item_'):]] = value
+        elif column.startswith(('supplier_', 'customer_')):
+            party, _, field = column.partition('_')
+            record.setdefault(party, {}).setdefault(field, value)
+        else:
+            record.setdefault(column, value)
+
+    if item:
+        record['items'].append(item)
+
+
+def _convert_csv_value(column: str, value: str):
+    """Převede hodnotu buňky CSV na typ, který očekává konfigurace."""
+    if column in _BOOL_COLUMNS:
+        lowered = value.lower()
+        if lowered in _TRUE_VALUES:
+            return True
+        if lowered in _FALSE_VALUES:
+            return None if not value else False
+        raise ValueError(f"Sloupec {column}: neplatná logická hodnota '{value}'")
+
+    if not value:
+        return None
+
+    if column in _INT_COLUMNS:
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"Sloupec {column}: '{value}' není celé číslo")
+
+    return value
@@ -1,17 +1,27 @@
 """Generátor realistických náhodných dat pro české faktury."""
 
+import hashlib
 import random
+from copy import copy
 from datetime import date, timedelta
-from faker import Faker
+from typing import TYPE_CHECKING, Optional, Union
 
+import identifiers
 from models.company import Company
 from models.item import Item
+from models.item_columns import ItemColumns
 from models.invoice import Invoice
 
+if TYPE_CHECKING:
+    from faker import Faker
 
-# Inicializace Faker s českou lokalizací
-fake = Faker('cs_CZ')
-Faker.seed()
+
+# Sdílená instance Faker s českou lokalizací (data_utils.fake) se vytváří
+# až při prvním přístupu - import Fakeru a načtení lokalizace je drahé
+_fake = None
+
+# Sdílená zásoba entit pro generování firem (vytvoří se při prvním použití)
+_entity_pool = None
 
 ASSIGNMENT_CLAUSE_4TRANS = """Dodavatel tímto neodvolatelně oznamuje odběrateli, že pohledávku, vyúčtovanou tímto 
 daňovým dokladem včetně jejího příslušenství a souvisejících práv, postoupil obchodní 
@@ -60,15 +70,235 @@ SERVICE_ITEMS = [
 
 UNITS = ['ks', 'hod', 'den', 'měsíc', 'balení', 'm²', 'služba']
 
+# Předpočítané výběry pro generate_items (seznamy se nesestavují při každém volání)
+ALL_ITEMS = PRODUCT_ITEMS + SERVICE_ITEMS
+SERVICE_ITEMS_SET = frozenset(SERVICE_ITEMS)
+
 
-def generate_ico() -> str:
+def _item_variants(units: dict, prices: range) -> tuple:
     """
-    Generuje náhodné IČO (8 číslic).
+    Sestaví tabulku variant (jednotka, množství, cena) pro generate_items.
     
+    Jednotka se volí rovnoměrně a množství rovnoměrně z rozsahu jednotky -
+    každá jednotka má proto v tabulce stejný počet řádků (kratší rozsahy se
+    zopakují) a jeden rovnoměrný výběr z tabulky dává stejné rozdělení jako
+    postupné losování jednotky, množství a ceny.
+    
+    Args:
+        units: Jednotka -> rozsah množství
+        prices: Rozsah jednotkových cen
+        
+    Returns:
+        N-tice trojic (jednotka, množství, cena)
+    """
+    rows = max(len(quantities) for quantities in units.values())
+    return tuple((unit, quantity, price)
+                 for unit, quantities in units.items()
+                 for quantity in list(quantities) * (rows // len(quantities))
+                 for price in prices)
+
+
+# Služby: hod/den 1-10, měsíc/služba 1; cena 100-500 Kč po desetikorunách
+SERVICE_VARIANTS = _item_variants(
+    {'hod': range(1, 11), 'den': range(1, 11), 'měsíc': range(1, 2), 'služba': range(1, 2)},
+    range(100, 501, 10))
+# Zboží: 1-5 kusů, balení i m²; cena 50-300 Kč po desetikorunách
+PRODUCT_VARIANTS = _item_variants(
+    {'ks': range(1, 6), 'balení': range(1, 6), 'm²': range(1, 6)},
+    range(50, 301, 10))
+# Sazby DPH 21 / 15 / 10 % s četností podle vah 80 / 15 / 5 (rovnoměrný výběr)
+VAT_RATE_CHOICES = (21,) * 16 + (15,) * 3 + (10,)
+
+# Pořadová čísla faktur v rámci dne a splatnosti v dnech
+INVOICE_SEQUENCES = range(1, 1000)
+PAYMENT_TERMS = (timedelta(days=14), timedelta(days=21), timedelta(days=30))
+
+# Od tohoto počtu položek se položky z konfigurace drží po sloupcích (ItemColumns),
+# pokud mají celočíselné množství a ceny
+COLUMN_ITEMS_THRESHOLD = 1000
+
+INVOICE_NOTES = [
+    "Děkujeme za Vaši důvěru.",
+    "Faktura vystavena elektronicky a je platná bez podpisu.",
+    "V případě dotazů nás neváhejte kontaktovat.",
+    "Platba bankovním převodem na uvedený účet.",
+    "",  # Žádná poznámka
+]
+
+BANKS = [
+    'Česká spořitelna, a.s.',
+    'Komerční banka, a.s.',
+    'ČSOB, a.s.',
+    'Raiffeisenbank a.s.',
+    'UniCredit Bank Czech Republic',
+    'Fio banka, a.s.',
+    'Air Bank a.s.'
+]
+
+
+def _numerify(pattern: str, rng: random.Random) -> str:
+    """Nahradí '#' náhodnou číslicí a '%' nenulovou číslicí (jako Faker)."""
+    return ''.join(
+        str(rng.randrange(10)) if ch == '#' else str(rng.randrange(1, 10)) if ch == '%' else ch
+        for ch in pattern
+    )
+
+
+class EntityPool:
+    """
+    Předpočítané zásoby adres, PSČ, telefonů a e-mailů pro generování firem.
+    
+    Zásoby se vytvoří jednou a hromadně z dat lokalizace cs_CZ knihovny Faker
+    (stejné seznamy ulic a měst, stejné formáty čísel popisných, PSČ
+    a telefonů), takže rozdělení hodnot zůstává stejné. Při generování firem
+    se pak jen vybírá předaným generátorem náhodných čísel, bez volání Fakeru.
+    
+    Zásoba se sestavuje s pevným seedem, je tedy shodná ve všech procesech.
+    """
+    
+    DEFAULT_SIZE = 4096
+    
+    def __init__(self, size: int = DEFAULT_SIZE, seed: int = 0):
+        """
+        Sestaví zásoby.
+        
+        Args:
+            size: Počet předpočítaných ulic, PSČ a telefonů
+                (uživatelských jmen e-mailů je size/4, domén size/16)
+            seed: Seed pro sestavení zásob
+        """
+        from faker.providers.address.cs_CZ import Provider as AddressProvider
+        from faker.providers.phone_number.cs_CZ import Provider as PhoneProvider
+        
+        rng = random.Random(seed)
+        street_names = AddressProvider.streets
+        building_formats = AddressProvider.building_number_formats
+        postcode_formats = AddressProvider.postcode_formats
+        phone_formats = PhoneProvider.formats
+        
+        self.streets = [f"{rng.choice(street_names)} {_numerify(rng.choice(building_formats), rng)}"
+                        for _ in range(size)]
+        self.cities = list(AddressProvider.cities)
+        self.postcodes = [_numerify(rng.choice(postcode_formats), rng) for _ in range(size)]
+        self.phones = [_numerify(rng.choice(phone_formats), rng) for _ in range(size)]
+        
+        # E-maily skládá Faker ze jména a domény nezávisle na sobě - obě části
+        # se vygenerují hromadně jednou a při výběru se jen spojí
+        from faker import Faker
+        faker = Faker('cs_CZ')
+        faker.seed_instance(seed)
+        self.email_users = [faker.user_name().lower() for _ in range(max(1, size // 4))]
+        self.email_domains = [faker.domain_name() for _ in range(max(1, size // 16))]
+    
+    def sample_email(self, rng: random.Random) -> str:
+        """
+        Vybere firemní e-mail.
+        
+        Args:
+            rng: Generátor náhodných čísel
+            
+        Returns:
+            E-mailová adresa
+        """
+        return f"{rng.choice(self.email_users)}@{rng.choice(self.email_domains)}"
+
+
+def get_entity_pool() -> EntityPool:
+    """
+    Vrací sdílenou zásobu entit, při prvním volání ji sestaví.
+    
+    Returns:
+        Instance EntityPool
+    """
+    global _entity_pool
+    
+    if _entity_pool is None:
+        _entity_pool = EntityPool()
+    return _entity_pool
+
+
+def __getattr__(name: str):
+    """Líné vytvoření sdílené instance Faker (atribut modulu fake)."""
+    global _fake
+
+    if name == 'fake':
+        if _fake is None:
+            from faker import Faker
+            _fake = Faker('cs_CZ')
+            Faker.seed()
+        return _fake
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Referenční "dnešek" faktur generovaných ze seedu - data vystavení,
+# splatnosti i čísla faktur tak nezávisí na dni, kdy se dávka generuje
+SEED_EPOCH = date(2025, 1, 1)
+
+
+def derive_seed(seed: int, index: Union[int, str]) -> int:
+    """
+    Odvodí seed jedné faktury z hlavního seedu a jejího pořadí v dávce.
+    
+    Odvozené seedy jsou na sobě nezávislé, faktura i tedy vyjde stejně
+    bez ohledu na to, zda se generuje samostatně, sekvenčně nebo v libovolném
+    pracovním procesu.
+    
+    Args:
+        seed: Hlavní seed dávky
+        index: Pořadí faktury v dávce (od 0), případně název jiné
+            náhodné součásti dávky (např. 'suppliers')
+        
+    Returns:
+        64bitový seed faktury
+    """
+    digest = hashlib.sha256(f"{seed}:{index}".encode('ascii')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def generate_seeded_invoice(seed: int, index: int,
+                            config: Union[str, 'InvoicePrototype', None] = None,
+                            supplier_pool: 'CompanyPool' = None,
+                            customer_pool: 'CompanyPool' = None) -> Invoice:
+    """
+    Deterministicky vygeneruje fakturu s daným pořadím v dávce.
+    
+    Relativní data (vystavení, splatnost, "today" v konfiguraci) se počítají
+    od SEED_EPOCH místo od dnešního data.
+    
+    Args:
+        seed: Hlavní seed dávky
+        index: Pořadí faktury v dávce (od 0)
+        config: Cesta k JSON konfiguraci nebo zkompilovaný InvoicePrototype
+            (chybějící údaje se doplní ze seedu)
+        supplier_pool: Zásoba dodavatelů (s konfigurací jen pro chybějícího dodavatele)
+        customer_pool: Zásoba odběratelů (s konfigurací jen pro chybějícího odběratele)
+        
+    Returns:
+        Instance Invoice
+    """
+    # Adresy a kontakty se berou ze sdílené zásoby, která je ve všech
+    # procesech stejná - stačí tedy vlastní generátor náhodných čísel
+    rng = random.Random(derive_seed(seed, index))
+    if config:
+        if isinstance(config, str):
+            config = InvoicePrototype.from_json(config)
+        return config.build(rng=rng, supplier_pool=supplier_pool, customer_pool=customer_pool,
+                            today=SEED_EPOCH)
+    return generate_invoice(rng=rng, supplier_pool=supplier_pool, customer_pool=customer_pool,
+                            today=SEED_EPOCH)
+
+
+def generate_ico(rng: random.Random = None) -> str:
+    """
+    Generuje náhodné IČO (8 číslic) s platným kontrolním součtem modulo 11.
+    
+    Args:
+        rng: Generátor náhodných čísel (None = globální random)
+        
     Returns:
         Validní IČO jako string
     """
-    return str(random.randint(10000000, 99999999))
+    return identifiers.generate_ico(rng)
 
 
 def generate_dic(ico: str) -> str:
@@ -81,183 +311,262 @@ def generate_dic(ico: str) -> str:
     Returns:
         DIČ ve formátu CZ + IČO
     """
-    return f"CZ{ico}"
+    return identifiers.generate_dic(ico)
 
 
-def _letters_to_digits(s: str) -> str:
-    """Převede písmena na číslice (A -> 10, B -> 11, ..., Z -> 35)."""
-    return ''.join(str(ord(ch) - 55) if ch.isalpha() else ch for ch in s)
-
 def compute_iban_check_digits(country_code: str, bban: str) -> str:
     """Vrátí dvouciferné kontrolní číslice pro IBAN (řetězec)."""
-    # Sestavíme řetězec pro výpočet: BBAN + country_code + "00"
-    rearranged = bban + country_code + "00"
-    # Převedeme písmena na čísla (A->10 ...)
-    numeric = _letters_to_digits(rearranged)
-    # Spočítáme zbytek po dělení 97
-    remainder = int(numeric) % 97
-    check_digits = 98 - remainder
-    return f"{check_digits:02d}"
+    return identifiers.iban_check_digits(country_code, bban)
+
 
-def generate_iban() -> str:
+def generate_iban(rng: random.Random = None) -> str:
     """
     Vygeneruje náhodný syntakticky platný CZ IBAN (24 znaků).
     
+    Args:
+        rng: Generátor náhodných čísel (None = globální random)
+        
     Returns:
         Validní český IBAN
     """
-    country = "CZ"
-    # BBAN v ČR - 20 číslic (pro účely syntaktické validity můžeme použít libovolných 20 číslic)
-    bban = ''.join(str(random.randint(0, 9)) for _ in range(20))
-    check = compute_iban_check_digits(country, bban)
-    iban = f"{country}{check}{bban}"
-    return iban
+    return identifiers.generate_cz_iban(rng)
 
 
-def generate_czech_company() -> Company:
+def generate_czech_company(rng: random.Random = None, faker: 'Faker' = None,
+                           pool: EntityPool = None) -> Company:
     """
     Generuje náhodnou českou firmu s realistickými údaji.
     
+    Adresa a kontakty se vybírají z předpočítané zásoby entit; Faker se volá
+    přímo jen tehdy, když je jeho instance výslovně předána.
+    
+    Args:
+        rng: Generátor náhodných čísel (None = globální random)
+        faker: Instance Faker pro adresu a kontakty (None = zásoba entit)
+        pool: Zásoba entit (None = sdílená zásoba modulu)
+        
     Returns:
         Instance třídy Company s náhodnými daty
     """
-    ico = generate_ico()
+    rng = rng or random
+    ico = generate_ico(rng)
     
     # Generování názvu firmy
-    if random.random() > 0.3:
+    if rng.random() > 0.3:
         # Složený název
-        company_name = f"{random.choice(COMPANY_PREFIXES)} {random.choice(COMPANY_NAMES)}"
+        company_name = f"{rng.choice(COMPANY_PREFIXES)} {rng.choice(COMPANY_NAMES)}"
     else:
         # Jednoduchý název
-        company_name = random.choice(COMPANY_NAMES)
+        company_name = rng.choice(COMPANY_NAMES)
+    
+    company_name += f" {rng.choice(COMPANY_TYPES)}"
     
-    company_name += f" {random.choice(COMPANY_TYPES)}"
+    if faker is not None:
+        street, city, zip_code = faker.street_address(), faker.city(), faker.postcode()
+    else:
+        pool = pool or get_entity_pool()
+        street, city, zip_code = rng.choice(pool.streets), rng.choice(pool.cities), rng.choice(pool.postcodes)
     
-    # Banky v ČR
-    banks = [
-        'Česká spořitelna, a.s.',
-        'Komerční banka, a.s.',
-        'ČSOB, a.s.',
-        'Raiffeisenbank a.s.',
-        'UniCredit Bank Czech Republic',
-        'Fio banka, a.s.',
-        'Air Bank a.s.'
-    ]
+    iban = generate_iban(rng)
+    bank_name = rng.choice(BANKS)
+    
+    if faker is not None:
+        email, phone = faker.company_email(), faker.phone_number()
+    else:
+        email, phone = pool.sample_email(rng), rng.choice(pool.phones)
     
     return Company(
         name=company_name,
         ico=ico,
         dic=generate_dic(ico),
-        street=fake.street_address(),
-        city=fake.city(),
-        zip_code=fake.postcode(),
+        street=street,
+        city=city,
+        zip_code=zip_code,
         country="Česká republika",
-        iban=generate_iban(),
-        bank_name=random.choice(banks),
-        email=fake.company_email(),
-        phone=fake.phone_number()
+        iban=iban,
+        bank_name=bank_name,
+        email=email,
+        phone=phone
     )
 
 
-def generate_invoice_number() -> str:
+class CompanyPool:
+    """
+    Pevná zásoba firem, ze které se vybírají dodavatelé nebo odběratelé.
+    
+    Odpovídá skutečnému účetnictví, kde několik dodavatelů vystavuje mnoho
+    faktur. Výběr může být rovnoměrný, nebo zešikmený podle Zipfova zákona
+    (firma na pořadí k má váhu 1 / k^skew), kdy pár firem pokrývá většinu
+    faktur.
+    
+    Firmy jsou sdílené mezi fakturami a nesmí se měnit.
+    """
+    
+    def __init__(self, size: int, skew: float = 0.0, rng: random.Random = None):
+        """
+        Vygeneruje firmy zásoby.
+        
+        Args:
+            size: Počet firem
+            skew: Exponent Zipfova rozdělení (0 = rovnoměrný výběr)
+            rng: Generátor náhodných čísel pro tvorbu firem (None = globální random)
+        """
+        if size < 1:
+            raise ValueError(f"Zásoba firem musí mít alespoň 1 firmu: {size}")
+        if skew < 0:
+            raise ValueError(f"Exponent rozdělení nesmí být záporný: {skew}")
+        
+        self.companies = [generate_czech_company(rng) for _ in range(size)]
+        self.skew = skew
+        
+        # Kumulativní váhy se spočítají jednou, výběr je pak binární hledání
+        self._cum_weights = None
+        if skew:
+            total = 0.0
+            self._cum_weights = []
+            for rank in range(1, size + 1):
+                total += 1.0 / rank ** skew
+                self._cum_weights.append(total)
+    
+    def __len__(self):
+        return len(self.companies)
+    
+    def sample(self, rng: random.Random = None) -> Company:
+        """
+        Vybere firmu ze zásoby.
+        
+        Args:
+            rng: Generátor náhodných čísel (None = globální random)
+            
+        Returns:
+            Sdílená instance Company
+        """
+        rng = rng or random
+        if self._cum_weights is None:
+            return rng.choice(self.companies)
+        return rng.choices(self.companies, cum_weights=self._cum_weights)[0]
+
+
+# Údaje odvozené od data generování: datum -> (prefix čísla faktury,
+# data vystavení za posledních 30 dní); viz _date_table
+_date_tables = {}
+
+
+def _date_table(today: date) -> tuple:
+    """
+    Vrací údaje odvozené od data generování, při prvním použití je spočítá.
+    
+    Formátování data a výpočet dat vystavení tak neproběhne pro každou
+    fakturu znovu.
+    
+    Args:
+        today: Datum, od kterého se počítá
+        
+    Returns:
+        Dvojice (prefix čísla faktury YYYYMMDD, n-tice dat today až today-30)
+    """
+    table = _date_tables.get(today)
+    if table is None:
+        table = _date_tables[today] = (today.strftime('%Y%m%d'),
+                                       tuple(today - timedelta(days=days) for days in range(31)))
+    return table
+
+
+def generate_invoice_number(rng: random.Random = None, today: date = None) -> str:
     """
     Generuje číslo faktury ve formátu YYYYMMDD001.
     
+    Args:
+        rng: Generátor náhodných čísel (None = globální random)
+        today: Datum v čísle faktury (None = dnešní datum)
+        
     Returns:
         Číslo faktury
     """
-    today = date.today()
-    sequence = random.randint(1, 999)
-    return f"{today.strftime('%Y%m%d')}{sequence:03d}"
+    rng = rng or random
+    prefix = _date_table(today or date.today())[0]
+    return f"{prefix}{rng.choice(INVOICE_SEQUENCES):03d}"
 
 
-def generate_items(count: int = None) -> list[Item]:
+def generate_items(count: int = None, rng: random.Random = None) -> list[Item]:
     """
     Generuje náhodné položky faktury.
     
     Args:
         count: Počet položek (pokud None, vybere se náhodně 1-8)
+        rng: Generátor náhodných čísel (None = globální random)
         
     Returns:
         Seznam položek
     """
+    rng = rng or random
     if count is None:
-        count = random.randint(1, 8)
+        count = rng.randint(1, 8)
     
     items = []
+    choice = rng.choice
     
     # Mix produktů a služeb
-    all_items = PRODUCT_ITEMS + SERVICE_ITEMS
-    selected_items = random.sample(all_items, min(count, len(all_items)))
+    selected_items = rng.sample(ALL_ITEMS, min(count, len(ALL_ITEMS)))
     
     for item_name in selected_items:
-        # Určení jednotky podle typu položky
-        if item_name in SERVICE_ITEMS:
-            unit = random.choice(['hod', 'den', 'měsíc', 'služba'])
-        else:
-            unit = random.choice(['ks', 'balení', 'm²'])
-        
-        # Množství závisí na jednotce
-        if unit in ['měsíc', 'služba']:
-            quantity = 1
-        elif unit in ['den', 'hod']:
-            quantity = random.randint(1, 10)  # Sníženo z 40
-        else:
-            quantity = random.randint(1, 5)  # Sníženo z 10
-        
-        # Cena v celých číslech 50-500 Kč
-        # Pro služby obvykle vyšší ceny
-        if item_name in SERVICE_ITEMS:
-            unit_price = random.randint(10, 50) * 10  # 100-500
-        else:
-            unit_price = random.randint(5, 30) * 10   # 50-300
-        
-        # Sazba DPH
-        vat_rate = random.choices([21, 15, 10], weights=[80, 15, 5])[0]
+        # Jednotka, množství podle jednotky a cena (služby dražší) jedním
+        # výběrem z předpočítané tabulky variant
+        unit, quantity, unit_price = choice(
+            SERVICE_VARIANTS if item_name in SERVICE_ITEMS_SET else PRODUCT_VARIANTS)
         
         items.append(Item(
             description=item_name,
             quantity=quantity,
             unit=unit,
             unit_price=unit_price,
-            vat_rate=vat_rate
+            vat_rate=choice(VAT_RATE_CHOICES)
         ))
     
     return items
 
 
-def generate_invoice(supplier: Company = None, customer: Company = None) -> Invoice:
+def generate_invoice(supplier: Company = None, customer: Company = None,
+                     rng: random.Random = None, faker: 'Faker' = None,
+                     supplier_pool: CompanyPool = None,
+                     customer_pool: CompanyPool = None, today: date = None) -> Invoice:
     """
     Generuje kompletní fakturu s náhodnými údaji.
     
     Args:
-        supplier: Dodavatel (pokud None, vygeneruje se náhodný)
-        customer: Odběratel (pokud None, vygeneruje se náhodný)
+        supplier: Dodavatel (pokud None, vybere se ze zásoby nebo vygeneruje nový)
+        customer: Odběratel (pokud None, vybere se ze zásoby nebo vygeneruje nový)
+        rng: Generátor náhodných čísel (None = globální random)
+        faker: Instance Faker pro adresy a kontakty (None = zásoba entit)
+        supplier_pool: Zásoba dodavatelů (None = pro každou fakturu nový)
+        customer_pool: Zásoba odběratelů (None = pro každou fakturu nový)
+        today: Datum, od kterého se počítá datum vystavení (None = dnešní datum)
         
     Returns:
         Instance třídy Invoice
     """
+    rng = rng or random
+    prefix, recent_dates = _date_table(today or date.today())
+    
     if supplier is None:
-        supplier = generate_czech_company()
+        if supplier_pool is not None:
+            supplier = supplier_pool.sample(rng)
+        else:
+            supplier = generate_czech_company(rng, faker)
     
     if customer is None:
-        customer = generate_czech_company()
-    
-    issue_date = date.today() - timedelta(days=random.randint(0, 30))
-    due_date = issue_date + timedelta(days=random.choice([14, 21, 30]))
+        if customer_pool is not None:
+            customer = customer_pool.sample(rng)
+        else:
+            customer = generate_czech_company(rng, faker)
     
-    invoice_number = generate_invoice_number()
-    variable_symbol = invoice_number.replace("/", "")
+    issue_date = rng.choice(recent_dates)
+    due_date = issue_date + rng.choice(PAYMENT_TERMS)
     
-    items = generate_items()
+    invoice_number = f"{prefix}{rng.choice(INVOICE_SEQUENCES):03d}"
+    variable_symbol = invoice_number
     
-    notes = [
-        "Děkujeme za Vaši důvěru.",
-        "Faktura vystavena elektronicky a je platná bez podpisu.",
-        "V případě dotazů nás neváhejte kontaktovat.",
-        "Platba bankovním převodem na uvedený účet.",
-        "",  # Žádná poznámka
-    ]
+    items = generate_items(rng=rng)
     
     return Invoice(
         invoice_number=invoice_number,
@@ -268,7 +577,7 @@ def generate_invoice(supplier: Company = None, customer: Company = None) -> Invo
         due_date=due_date,
         variable_symbol=variable_symbol,
         payment_method="bankovní převod",
-        note=random.choice(notes)
+        note=rng.choice(INVOICE_NOTES)
     )
 
 
@@ -285,113 +594,187 @@ def generate_invoices(count: int) -> list[Invoice]:
     return [generate_invoice() for _ in range(count)]
 
 
-def load_from_json(path: str) -> Invoice:
+def load_from_json(path: str, rng: random.Random = None, faker: 'Faker' = None) -> Invoice:
     """
     Načte fakturu z JSON souboru.
     
+    Pro více faktur ze stejné konfigurace je levnější jednou sestavit
+    InvoicePrototype a volat jeho metodu build().
+    
     Args:
         path: Cesta k JSON souboru
+        rng: Generátor náhodných čísel pro chybějící údaje (None = globální random)
+        faker: Instance Faker pro chybějící údaje (None = zásoba entit)
         
     Returns:
         Instance Invoice
     """
-    import json
-    from datetime import datetime
-
-    with open(path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Helper pro parsování data
-    def parse_date(d_str):
-        if not d_str: return date.today()
-        try:
-            return datetime.strptime(d_str, "%Y-%m-%d").date()
-        except ValueError:
-            return date.today()
+    return InvoicePrototype.from_json(path).build(rng=rng, faker=faker)
 
-    # Validace strict_mode (pokud není definováno, default je True)
-    strict_validation = data.get('strict_validation', True)
 
-    # Načtení firem
-    supplier_data = data.get('supplier', {})
-    customer_data = data.get('customer', {})
+class InvoicePrototype:
+    """
+    Jednou zparsovaná a zvalidovaná konfigurace faktury.
     
-    # Fallback pro chybějící data firmy - generuj náhodně, ale použij co je k dispozici
-    # Zde předpokládáme, že pokud je JSON zadán, uživatel chce specifikovat konkrétní data
-    # Ale pro zjednodušení, pokud chybí celá sekce, vygenerujeme náhodnou
+    Čtení souboru, parsování JSON i dat a validace firem a položek proběhne
+    jen při sestavení prototypu. Metoda build() z něj pak levně vytváří
+    nezávislé kopie faktury; údaje, které konfigurace nezadává (dodavatel,
+    odběratel, položky, číslo faktury), se pro každou kopii losují znovu.
+    """
     
-    if not supplier_data:
-        supplier = generate_czech_company()
-        supplier.strict_validation = strict_validation
-    else:
-        supplier = Company(**supplier_data, strict_validation=strict_validation)
-        
-    if not customer_data:
-        customer = generate_czech_company()
-        customer.strict_validation = strict_validation
-    else:
-        customer = Company(**customer_data, strict_validation=strict_validation)
+    def __init__(self, data: dict):
+        """
+        Sestaví prototyp z načtené konfigurace.
         
-    # Načtení položek
-    items_data = data.get('items', [])
-    items = []
-    if items_data:
-        for item_d in items_data:
-            items.append(Item(**item_d))
-    else:
-        items = generate_items()
-
-    # Zpracování data vystavení
-    issue_date_raw = data.get('issue_date')
-    if isinstance(issue_date_raw, str):
-        if issue_date_raw.lower() == "today":
-            issue_date = date.today()
-        elif issue_date_raw.lower().startswith("today-"):
+        Args:
+            data: Obsah JSON konfigurace
+            
+        Raises:
+            ValueError: Při neplatných údajích firem nebo položek
+        """
+        from datetime import datetime
+
+        # Helper pro parsování data (None = relativně k datu sestavení faktury)
+        def parse_date(d_str):
+            if not d_str: return None
             try:
-                days = int(issue_date_raw.split("-")[1])
-                issue_date = date.today() - timedelta(days=days)
+                return datetime.strptime(d_str, "%Y-%m-%d").date()
             except ValueError:
-                issue_date = parse_date(issue_date_raw)
+                return None
+
+        # Validace strict_mode (pokud není definováno, default je True)
+        self.strict_validation = data.get('strict_validation', True)
+
+        # Firmy - chybějící sekce se vygeneruje náhodně pro každou kopii (None)
+        supplier_data = data.get('supplier', {})
+        customer_data = data.get('customer', {})
+        self.supplier = (Company(**supplier_data, strict_validation=self.strict_validation)
+                         if supplier_data else None)
+        self.customer = (Company(**customer_data, strict_validation=self.strict_validation)
+                         if customer_data else None)
+            
+        # Položky - bez položek v konfiguraci se losují pro každou kopii (None),
+        # velmi velké faktury se drží po sloupcích (jen s celočíselnými hodnotami)
+        items_data = data.get('items', [])
+        if not items_data:
+            self.items = None
+        elif len(items_data) >= COLUMN_ITEMS_THRESHOLD and ItemColumns.fits(items_data):
+            self.items = ItemColumns.from_records(items_data)
         else:
-             issue_date = parse_date(issue_date_raw)
-    else:
-        issue_date = parse_date(issue_date_raw)
-
-    # Zpracování data splatnosti
-    due_date_raw = data.get('due_date')
-    if due_date_raw:
-        due_date = parse_date(due_date_raw)
-    else:
-        # Pokud není due_date, zkusíme payment_terms_days
-        payment_terms = data.get('payment_terms_days')
-        if payment_terms is not None:
-             due_date = issue_date + timedelta(days=int(payment_terms))
+            self.items = [Item(**item_d) for item_d in items_data]
+
+        # Zpracování data vystavení - "today", "today-N" i chybějící datum
+        # se vyhodnocují až v build() vůči zadanému dni (issue_offset dní zpět)
+        issue_date_raw = data.get('issue_date')
+        self.issue_offset = 0
+        if isinstance(issue_date_raw, str):
+            if issue_date_raw.lower() == "today":
+                issue_date = None
+            elif issue_date_raw.lower().startswith("today-"):
+                try:
+                    self.issue_offset = int(issue_date_raw.split("-")[1])
+                    issue_date = None
+                except ValueError:
+                    issue_date = parse_date(issue_date_raw)
+            else:
+                 issue_date = parse_date(issue_date_raw)
         else:
-             # Default 14 dní
-             due_date = issue_date + timedelta(days=14)
+            issue_date = parse_date(issue_date_raw)
+        self.issue_date = issue_date
 
-    # Ostatní pole
-
-    # Cestní doložka
-    assignment_clause = data.get('assignment_clause', "")
-    if data.get('use_assignment_clause', False):
-        custom_text = data.get('assignment_clause_text')
-        if custom_text:
-             assignment_clause = custom_text
+        # Zpracování data splatnosti
+        due_date_raw = data.get('due_date')
+        self.due_date = parse_date(due_date_raw) if due_date_raw else None
+        # Bez due_date se splatnost počítá z payment_terms_days (default 14 dní)
+        payment_terms = data.get('payment_terms_days')
+        self.payment_terms_days = int(payment_terms) if payment_terms is not None else 14
+
+        # Cestní doložka
+        assignment_clause = data.get('assignment_clause', "")
+        if data.get('use_assignment_clause', False):
+            custom_text = data.get('assignment_clause_text')
+            if custom_text:
+                 assignment_clause = custom_text
+            else:
+                 assignment_clause = ASSIGNMENT_CLAUSE_4TRANS
+
+        # Ostatní pole
+        self.invoice_number = data.get('invoice_number')
+        self.fields = dict(
+            variable_symbol=data.get('variable_symbol', ""),
+            payment_method=data.get('payment_method', "bankovní převod"),
+            note=data.get('note', ""),
+            assignment_clause=assignment_clause,
+            currency=data.get('currency', "CZK")
+        )
+
+    @classmethod
+    def from_json(cls, path: str) -> 'InvoicePrototype':
+        """
+        Načte a zkompiluje konfiguraci z JSON souboru.
+        
+        Args:
+            path: Cesta k JSON souboru
+            
+        Returns:
+            Instance InvoicePrototype
+        """
+        import json
+
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def build(self, rng: random.Random = None, faker: 'Faker' = None,
+              supplier_pool: CompanyPool = None,
+              customer_pool: CompanyPool = None, today: date = None) -> Invoice:
+        """
+        Vytvoří novou fakturu z prototypu.
+        
+        Zadané firmy se mělce kopírují (bez opakované validace), položky se
+        kopírují, aby změna položky jedné faktury neovlivnila ostatní;
+        chybějící údaje se losují stejně jako v load_from_json.
+        
+        Args:
+            rng: Generátor náhodných čísel pro chybějící údaje (None = globální random)
+            faker: Instance Faker pro chybějící údaje (None = zásoba entit)
+            supplier_pool: Zásoba, ze které se vybírá chybějící dodavatel
+            customer_pool: Zásoba, ze které se vybírá chybějící odběratel
+            today: Datum pro relativní data a čísla faktur (None = dnešní datum)
+            
+        Returns:
+            Nezávislá instance Invoice
+        """
+        today = today or date.today()
+        supplier = (copy(self.supplier) if self.supplier is not None
+                    else self._sample_company(supplier_pool, rng, faker))
+        customer = (copy(self.customer) if self.customer is not None
+                    else self._sample_company(customer_pool, rng, faker))
+        if self.items is None:
+            items = generate_items(rng=rng)
+        elif type(self.items) is ItemColumns:
+            items = self.items.copy()
         else:
-             assignment_clause = ASSIGNMENT_CLAUSE_4TRANS
-
-    return Invoice(
-        invoice_number=data.get('invoice_number', generate_invoice_number()),
-        supplier=supplier,
-        customer=customer,
-        items=items,
-        issue_date=issue_date,
-        due_date=due_date,
-        variable_symbol=data.get('variable_symbol', ""),
-        payment_method=data.get('payment_method', "bankovní převod"),
-        note=data.get('note', ""),
-        assignment_clause=assignment_clause,
-        currency=data.get('currency', "CZK")
-    )
-
+            items = [copy(item) for item in self.items]
+        invoice_number = (self.invoice_number if self.invoice_number is not None
+                          else generate_invoice_number(rng, today))
+        issue_date = self.issue_date or today - timedelta(days=self.issue_offset)
+        due_date = self.due_date or issue_date + timedelta(days=self.payment_terms_days)
+
+        return Invoice(
+            invoice_number=invoice_number,
+            supplier=supplier,
+            customer=customer,
+            items=items,
+            issue_date=issue_date,
+            due_date=due_date,
+            **self.fields
+        )
+
+    def _sample_company(self, pool: Optional[CompanyPool], rng: random.Random,
+                        faker: 'Faker') -> Company:
+        """Vylosuje firmu chybějící v konfiguraci."""
+        if pool is not None:
+            return pool.sample(rng)
+        company = generate_czech_company(rng, faker)
+        company.strict_validation = self.strict_validation
+        return company
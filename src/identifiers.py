@@ -0,0 +1,286 @@
+"""
+Generování a validace českých identifikátorů (IČO, DIČ, IBAN) po dávkách.
+
+Kontrolní součty se počítají celočíselně nad poli (modul array) pomocí
+předpočítaných tabulek, bez převodů na řetězce číslic a bez smyček přes
+jednotlivé číslice. Jednotlivé hodnoty i dávky o milionech prvků používají
+stejné tabulky.
+"""
+
+import random
+from array import array
+from itertools import product
+from operator import mul
+from typing import Iterable, List
+
+
+# Váhy číslic IČO pro kontrolu modulo 11
+ICO_WEIGHTS = (8, 7, 6, 5, 4, 3, 2)
+
+# Kontrolní číslice IČO podle zbytku váženého součtu po dělení 11
+_ICO_CHECK_DIGITS = array('b', [(11 - r) % 10 for r in range(11)])
+
+
+def _weighted_sum_table(weights: tuple) -> array:
+    """Tabulka vážených součtů číslic pro všechna čísla s daným počtem číslic."""
+    # product() prochází číslice ve stejném pořadí, v jakém rostou hodnoty
+    return array('h', [sum(map(mul, weights, digits))
+                       for digits in product(range(10), repeat=len(weights))])
+
+
+# Základ IČO (prvních 7 číslic) se dělí na 3 + 2 + 2 číslice
+_ICO_HIGH_SUMS = _weighted_sum_table(ICO_WEIGHTS[:3])
+_ICO_MID_SUMS = _weighted_sum_table(ICO_WEIGHTS[3:5])
+_ICO_LOW_SUMS = _weighted_sum_table(ICO_WEIGHTS[5:])
+
+# "CZ00" převedené na číslice (C=12, Z=35) a přesunuté za BBAN
+_CZ_SUFFIX = 123500
+_POW10_6 = 10 ** 6
+
+
+def ico_check_digit(base: int) -> int:
+    """
+    Vrátí kontrolní číslici IČO.
+
+    Args:
+        base: Prvních 7 číslic IČO jako číslo
+
+    Returns:
+        Kontrolní (8.) číslice
+    """
+    high, rest = divmod(base, 10000)
+    mid, low = divmod(rest, 100)
+    return _ICO_CHECK_DIGITS[(_ICO_HIGH_SUMS[high] + _ICO_MID_SUMS[mid] + _ICO_LOW_SUMS[low]) % 11]
+
+
+def ico_check_digits(bases: array) -> array:
+    """
+    Vrátí kontrolní číslice pro pole základů IČO.
+
+    Args:
+        bases: Pole prvních 7 číslic IČO (array('l') nebo seznam čísel)
+
+    Returns:
+        array('b') kontrolních číslic
+    """
+    high_sums, mid_sums, low_sums = _ICO_HIGH_SUMS, _ICO_MID_SUMS, _ICO_LOW_SUMS
+    checks = _ICO_CHECK_DIGITS
+    return array('b', [checks[(high_sums[b // 10000] + mid_sums[b // 100 % 100] + low_sums[b % 100]) % 11]
+                       for b in bases])
+
+
+def generate_ico(rng: random.Random = None) -> str:
+    """
+    Vygeneruje IČO s platným kontrolním součtem (bez úvodní nuly).
+
+    Args:
+        rng: Generátor náhodných čísel (None = globální random)
+
+    Returns:
+        Osmimístné IČO
+    """
+    base = (rng or random).randrange(1000000, 10000000)
+    return f"{base}{ico_check_digit(base)}"
+
+
+def generate_icos(count: int, rng: random.Random = None) -> List[str]:
+    """
+    Vygeneruje dávku IČO s platným kontrolním součtem.
+
+    Args:
+        count: Počet IČO
+        rng: Generátor náhodných čísel (None = globální random)
+
+    Returns:
+        Seznam osmimístných IČO
+    """
+    randrange = (rng or random).randrange
+    bases = array('l', [randrange(1000000, 10000000) for _ in range(count)])
+    return [f"{base}{check}" for base, check in zip(bases, ico_check_digits(bases))]
+
+
+def validate_ico(ico: str) -> bool:
+    """
+    Ověří formát a kontrolní součet IČO.
+
+    Args:
+        ico: IČO jako řetězec
+
+    Returns:
+        True, pokud jde o 8 číslic s platnou kontrolní číslicí
+    """
+    if len(ico) != 8 or not ico.isdigit():
+        return False
+    base, check = divmod(int(ico), 10)
+    return ico_check_digit(base) == check
+
+
+def validate_icos(icos: Iterable[str]) -> array:
+    """
+    Ověří dávku IČO.
+
+    Args:
+        icos: Řetězce IČO
+
+    Returns:
+        array('b') s hodnotou 1 pro platné a 0 pro neplatné IČO
+    """
+    return array('b', [validate_ico(ico) for ico in icos])
+
+
+def generate_dic(ico: str) -> str:
+    """
+    Sestaví DIČ právnické osoby z IČO.
+
+    Args:
+        ico: IČO firmy
+
+    Returns:
+        DIČ ve formátu CZ + IČO
+    """
+    return f"CZ{ico}"
+
+
+def validate_dic(dic: str) -> bool:
+    """
+    Ověří formát DIČ (CZ + 8 až 10 číslic).
+
+    Osmimístná část je IČO právnické osoby a musí mít platný kontrolní
+    součet; delší DIČ fyzických osob se kontrolují jen formálně.
+
+    Args:
+        dic: DIČ jako řetězec
+
+    Returns:
+        True, pokud DIČ odpovídá formátu
+    """
+    body = dic[2:]
+    if not dic.startswith("CZ") or not 8 <= len(body) <= 10 or not body.isdigit():
+        return False
+    return len(body) != 8 or validate_ico(body)
+
+
+def cz_iban_check_digits(bban: int) -> int:
+    """
+    Vrátí kontrolní číslice CZ IBAN (ISO 13616, modulo 97).
+
+    Args:
+        bban: Dvacetimístný BBAN jako číslo
+
+    Returns:
+        Kontrolní číslice (2-98)
+    """
+    return 98 - (bban * _POW10_6 + _CZ_SUFFIX) % 97
+
+
+def iban_check_digits(country_code: str, bban: str) -> str:
+    """
+    Vrátí kontrolní číslice IBAN pro libovolnou zemi.
+
+    Args:
+        country_code: Dvoupísmenný kód země
+        bban: BBAN (číslice a velká písmena)
+
+    Returns:
+        Dvouciferné kontrolní číslice
+    """
+    if bban.isdigit():
+        suffix = int(_letters_to_digits(country_code + "00"))
+        remainder = (int(bban) * _POW10_6 + suffix) % 97
+    else:
+        remainder = mod97(_letters_to_digits(bban + country_code + "00"))
+    return f"{98 - remainder:02d}"
+
+
+def mod97(digits: str) -> int:
+    """
+    Vrátí zbytek čísla zapsaného číslicemi po dělení 97.
+
+    Args:
+        digits: Řetězec číslic (libovolně dlouhý)
+
+    Returns:
+        Zbytek po dělení 97
+    """
+    return int(digits) % 97
+
+
+def _letters_to_digits(s: str) -> str:
+    """Převede písmena na číslice (A -> 10, B -> 11, ..., Z -> 35)."""
+    return ''.join(str(ord(ch) - 55) if ch.isalpha() else ch for ch in s)
+
+
+def generate_cz_iban(rng: random.Random = None) -> str:
+    """
+    Vygeneruje syntakticky platný CZ IBAN (24 znaků).
+
+    Args:
+        rng: Generátor náhodných čísel (None = globální random)
+
+    Returns:
+        IBAN ve tvaru CZkk + 20 číslic
+    """
+    bban = (rng or random).randrange(10 ** 20)
+    return f"CZ{cz_iban_check_digits(bban):02d}{bban:020d}"
+
+
+def generate_cz_ibans(count: int, rng: random.Random = None) -> List[str]:
+    """
+    Vygeneruje dávku syntakticky platných CZ IBAN.
+
+    BBAN se drží jako dvě pole desetimístných polovin (array('q')),
+    kontrolní součet se skládá z jejich zbytků po dělení 97.
+
+    Args:
+        count: Počet IBAN
+        rng: Generátor náhodných čísel (None = globální random)
+
+    Returns:
+        Seznam IBAN
+    """
+    randrange = (rng or random).randrange
+    highs = array('q', [randrange(10 ** 10) for _ in range(count)])
+    lows = array('q', [randrange(10 ** 10) for _ in range(count)])
+
+    # BBAN * 10^6 + CZ00 = high * 10^16 + low * 10^6 + 123500 (modulo 97)
+    high_factor = 10 ** 16 % 97
+    low_factor = _POW10_6 % 97
+    suffix = _CZ_SUFFIX % 97
+    return [
+        f"CZ{98 - (high * high_factor + low * low_factor + suffix) % 97:02d}{high:010d}{low:010d}"
+        for high, low in zip(highs, lows)
+    ]
+
+
+def validate_iban(iban: str) -> bool:
+    """
+    Ověří kontrolní součet IBAN; u CZ IBAN i délku a číselný BBAN.
+
+    Args:
+        iban: IBAN bez mezer
+
+    Returns:
+        True, pokud je IBAN platný
+    """
+    if len(iban) < 5 or not iban[:2].isalpha() or not iban[2:4].isdigit():
+        return False
+    if iban.startswith("CZ"):
+        if len(iban) != 24 or not iban[4:].isdigit():
+            return False
+        return (int(iban[4:]) * _POW10_6 + _CZ_SUFFIX + int(iban[2:4])) % 97 == 1
+    if not iban[4:].isalnum():
+        return False
+    return mod97(_letters_to_digits(iban[4:] + iban[:4])) == 1
+
+
+def validate_ibans(ibans: Iterable[str]) -> array:
+    """
+    Ověří dávku IBAN.
+
+    Args:
+        ibans: Řetězce IBAN
+
+    Returns:
+        array('b') s hodnotou 1 pro platné a 0 pro neplatné IBAN
+    """
+    return array('b', [validate_iban(iban) for iban in ibans])
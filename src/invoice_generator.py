@@ -1,13 +1,19 @@
 """Hlavní modul pro generování faktur."""
 
+import json
+import multiprocessing
+import random
+import sys
+from collections import deque
+from io import BytesIO
+from itertools import islice
 from pathlib import Path
-from typing import List
+from typing import BinaryIO, List, NamedTuple, Optional, Tuple, Union
 
 from models.invoice import Invoice
 from pdf_templates import get_template
-from qr_generator import generate_invoice_with_qr
-from isdoc_generator import generate_invoice_with_isdoc
-from utils.file_utils import ensure_output_dir, generate_filename
+from utils.file_utils import create_unique_file, ensure_output_dir, generate_filename
+from utils.sinks import OutputSink
 import data_utils
 
 
@@ -16,19 +22,23 @@ class InvoiceGenerator:
     Hlavní třída pro generování faktur v různých režimech.
     """
     
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: Optional[str] = "output"):
         """
         Inicializace generátoru.
         
         Args:
-            output_dir: Cesta k výstupnímu adresáři
+            output_dir: Cesta k výstupnímu adresáři (None = pouze generování
+                do paměti přes render_invoice/write_invoice)
         """
-        self.output_dir = ensure_output_dir(output_dir)
+        self.output_dir = ensure_output_dir(output_dir) if output_dir is not None else None
     
     def generate_invoice(self, invoice: Invoice = None, 
                         template: str = 'classic',
                         with_qr: bool = False,
-                        with_isdoc: bool = False) -> dict:
+                        with_isdoc: bool = False,
+                        qr_backend: Optional[str] = None,
+                        invariant: bool = False,
+                        profile: Optional[str] = None) -> dict:
         """
         Vygeneruje jednu fakturu.
         
@@ -37,10 +47,16 @@ class InvoiceGenerator:
             template: Název šablony ('classic', 'modern', 'minimal')
             with_qr: Zda přidat QR kód
             with_isdoc: Zda připojit ISDOC XML
+            qr_backend: Způsob vykreslení QR kódu ('vector' nebo 'raster')
+            invariant: Zda vynechat časové údaje, aby výstup byl reprodukovatelný
+            profile: Výstupní profil PDF ('fast', 'balanced', 'smallest')
             
         Returns:
             Slovník s cestami k vygenerovaným souborům
         """
+        if self.output_dir is None:
+            raise ValueError("Generátor nemá výstupní adresář, použijte render_invoice nebo write_invoice")
+        
         # Pokud není faktura zadána, vygeneruj náhodnou
         if invoice is None:
             invoice = data_utils.generate_invoice()
@@ -48,64 +64,616 @@ class InvoiceGenerator:
         # Získání třídy šablony
         template_class = get_template(template)
         
-        # Základní název souboru
-        suffix = ""
-        if with_qr: suffix += "_qr"
-        if with_isdoc: suffix += "_isdoc"
-        
-        pdf_filename = generate_filename('invoice' + suffix, 'pdf', invoice.invoice_number, self.output_dir)
-        pdf_path = self.output_dir / pdf_filename
+        # Název se rezervuje atomicky - paralelní procesy se stejným číslem
+        # faktury si soubory nepřepíšou
+        pdf_filename = generate_filename(self._pdf_prefix(with_qr, with_isdoc), 'pdf',
+                                         invoice.invoice_number)
+        pdf_path = create_unique_file(self.output_dir, pdf_filename)
         pdf_path_str = str(pdf_path)
         
-        # 1. Generování základního PDF
+        # Generování PDF - QR kód i ISDOC příloha vzniknou ve stejném průchodu
         template_instance = template_class()
-        template_instance.generate(invoice, pdf_path_str)
+        try:
+            template_instance.generate(invoice, pdf_path_str, with_qr=with_qr, with_isdoc=with_isdoc,
+                                       qr_backend=qr_backend, invariant=invariant, profile=profile)
+        except Exception:
+            pdf_path.unlink(missing_ok=True)
+            raise
         
         result = {'pdf': pdf_path_str}
         
-        # 2. Přidání QR kódu
-        if with_qr:
-            from qr_generator import add_qr_to_existing_pdf
-            add_qr_to_existing_pdf(invoice, pdf_path_str)
-            
-        # 3. Přidání ISDOC
         if with_isdoc:
-            from isdoc_generator import attach_isdoc_to_pdf
-            attach_isdoc_to_pdf(invoice, pdf_path_str)
             result['note'] = 'ISDOC XML embedováno v PDF'
             
         return result
     
+    @staticmethod
+    def _pdf_prefix(with_qr: bool, with_isdoc: bool, base: str = 'invoice') -> str:
+        """Prefix názvu PDF podle zapnutých příloh."""
+        suffix = ""
+        if with_qr: suffix += "_qr"
+        if with_isdoc: suffix += "_isdoc"
+        return base + suffix
+    
+    def write_invoice(self, stream: BinaryIO, invoice: Invoice = None,
+                      template: str = 'classic',
+                      with_qr: bool = False,
+                      with_isdoc: bool = False,
+                      qr_backend: Optional[str] = None,
+                      isdoc_stream: Optional[BinaryIO] = None,
+                      invariant: bool = False,
+                      profile: Optional[str] = None) -> Invoice:
+        """
+        Vygeneruje jednu fakturu do binárního proudu, bez zápisu na disk.
+        
+        Args:
+            stream: Cílový proud pro PDF (soubor otevřený pro zápis, BytesIO, ...)
+            invoice: Instance faktury (pokud None, vygeneruje se náhodná)
+            template: Název šablony ('classic', 'modern', 'minimal')
+            with_qr: Zda přidat QR kód
+            with_isdoc: Zda připojit ISDOC XML jako přílohu PDF
+            qr_backend: Způsob vykreslení QR kódu ('vector' nebo 'raster')
+            isdoc_stream: Proud, do kterého se zapíše i samostatné ISDOC XML
+            invariant: Zda vynechat časové údaje, aby výstup byl reprodukovatelný
+            profile: Výstupní profil PDF ('fast', 'balanced', 'smallest')
+            
+        Returns:
+            Vykreslená faktura (užitečné, pokud byla vygenerována náhodně)
+        """
+        if invoice is None:
+            invoice = data_utils.generate_invoice()
+        
+        # ISDOC se serializuje jen jednou - pro přílohu i samostatný výstup
+        isdoc_xml = None
+        if with_isdoc or isdoc_stream is not None:
+            from isdoc_generator import ISDOCGenerator
+            isdoc_xml = ISDOCGenerator.to_bytes(invoice, invariant=invariant)
+            if isdoc_stream is not None:
+                isdoc_stream.write(isdoc_xml)
+        
+        template_instance = get_template(template)()
+        template_instance.generate(invoice, stream, with_qr=with_qr,
+                                   isdoc_xml=isdoc_xml if with_isdoc else None,
+                                   qr_backend=qr_backend, invariant=invariant, profile=profile)
+        return invoice
+    
+    def render_invoice(self, invoice: Invoice = None,
+                       template: str = 'classic',
+                       with_qr: bool = False,
+                       with_isdoc: bool = False,
+                       qr_backend: Optional[str] = None,
+                       include_xml: bool = False,
+                       invariant: bool = False,
+                       profile: Optional[str] = None) -> dict:
+        """
+        Vygeneruje jednu fakturu celou v paměti.
+        
+        Args:
+            invoice: Instance faktury (pokud None, vygeneruje se náhodná)
+            template: Název šablony ('classic', 'modern', 'minimal')
+            with_qr: Zda přidat QR kód
+            with_isdoc: Zda připojit ISDOC XML jako přílohu PDF
+            qr_backend: Způsob vykreslení QR kódu ('vector' nebo 'raster')
+            include_xml: Zda vrátit i samostatné ISDOC XML
+            invariant: Zda vynechat časové údaje, aby výstup byl reprodukovatelný
+            profile: Výstupní profil PDF ('fast', 'balanced', 'smallest')
+            
+        Returns:
+            Slovník s klíči 'invoice_number', 'pdf' (bytes) a případně 'isdoc' (bytes)
+        """
+        pdf_buffer = BytesIO()
+        xml_buffer = BytesIO() if include_xml else None
+        
+        invoice = self.write_invoice(pdf_buffer, invoice=invoice, template=template,
+                                     with_qr=with_qr, with_isdoc=with_isdoc,
+                                     qr_backend=qr_backend, isdoc_stream=xml_buffer,
+                                     invariant=invariant, profile=profile)
+        
+        result = {'invoice_number': invoice.invoice_number, 'pdf': pdf_buffer.getvalue()}
+        if xml_buffer is not None:
+            result['isdoc'] = xml_buffer.getvalue()
+        
+        return result
+    
+    def prepare_invoice(self, index: int = 0,
+                        config: Union[str, 'data_utils.InvoicePrototype', None] = None,
+                        seed: Optional[int] = None,
+                        suppliers: Optional[int] = None,
+                        customers: Optional[int] = None,
+                        skew: float = 0.0) -> Invoice:
+        """
+        Připraví data faktury stejně jako pro fakturu s daným pořadím v dávce.
+        
+        Zásoby firem se sestaví stejně jako v generate_batch, takže faktura
+        vygenerovaná samostatně vyjde se seedem stejně jako faktura i dávky.
+        
+        Args:
+            index: Pořadí faktury v dávce (od 0)
+            config: Cesta k JSON konfiguraci dat nebo zkompilovaný InvoicePrototype
+            seed: Seed pro deterministické generování (None = náhodná data)
+            suppliers: Velikost zásoby dodavatelů (None = nový dodavatel)
+            customers: Velikost zásoby odběratelů (None = nový odběratel)
+            skew: Exponent Zipfova rozdělení při výběru ze zásob (0 = rovnoměrně)
+            
+        Returns:
+            Instance Invoice
+        """
+        pools = _build_company_pools(suppliers, customers, skew, seed, sys.stdout)
+        return _load_invoice(_compile_config(config), seed, index, pools)
+    
     def generate_batch(self, count: int, template: str = 'classic',
-                      with_qr: bool = False, with_isdoc: bool = False) -> List[dict]:
+                      with_qr: bool = False, with_isdoc: bool = False,
+                      workers: int = 1, config: Union[str, 'data_utils.InvoicePrototype', None] = None,
+                      qr_backend: Optional[str] = None,
+                      sink: Optional[OutputSink] = None,
+                      seed: Optional[int] = None,
+                      suppliers: Optional[int] = None,
+                      customers: Optional[int] = None,
+                      skew: float = 0.0,
+                      profile: Optional[str] = None) -> List[dict]:
         """
         Vygeneruje více faktur najednou.
         
+        Při workers > 1 se faktury renderují v poolu procesů. Každý proces je
+        jednou zahřátý (importy, registrace fontů) a dostává pouze lehké popisy
+        úloh, nikoli serializované instance Invoice. Výsledky i chyby se
+        vypisují ve stejném pořadí jako při sekvenčním běhu.
+        
+        Se zadaným sinkem se faktury renderují do paměti a každá se do sinku
+        zapíše hned, jak je hotová - v paměti je vždy jen rozpracovaná část dávky.
+        
+        Se zadaným seedem je dávka reprodukovatelná: faktura i se generuje
+        z vlastních generátorů odvozených z (seed, i), takže vyjde bajtově
+        stejně při libovolném počtu procesů.
+        
+        Se zadaným počtem dodavatelů/odběratelů se firmy vygenerují jednou
+        (v hlavním procesu) a faktury je vybírají ze zásoby.
+        
+        Konfigurace se načte a zvaliduje jednou do prototypu (InvoicePrototype),
+        z něhož se pro každou fakturu vytvoří levná nezávislá kopie.
+        
         Args:
             count: Počet faktur k vygenerování
             template: Název šablony
             with_qr: Zda přidat QR kód
             with_isdoc: Zda připojit ISDOC XML
+            workers: Počet pracovních procesů (1 = sekvenčně v tomto procesu)
+            config: Cesta k JSON konfiguraci dat (zparsuje se jednou pro celou dávku)
+                nebo již zkompilovaný InvoicePrototype
+            qr_backend: Způsob vykreslení QR kódu ('vector' nebo 'raster')
+            sink: Cílový sink (None = soubory ve výstupním adresáři generátoru)
+            seed: Seed pro deterministické generování (None = náhodná data)
+            suppliers: Velikost zásoby dodavatelů (None = nový pro každou fakturu)
+            customers: Velikost zásoby odběratelů (None = nový pro každou fakturu)
+            skew: Exponent Zipfova rozdělení při výběru ze zásob (0 = rovnoměrně)
+            profile: Výstupní profil PDF ('fast', 'balanced', 'smallest')
             
         Returns:
             Seznam slovníků s cestami k vygenerovaným souborům
         """
+        if workers < 1:
+            raise ValueError(f"Počet procesů musí být alespoň 1: {workers}")
+        if sink is None and self.output_dir is None:
+            raise ValueError("Generátor nemá výstupní adresář, zadejte sink")
+        
+        # Při výstupu na stdout nesmí výpisy rozbít data
+        log = sys.stderr if sink is not None and sink.uses_stdout else sys.stdout
         results = []
         
-        print(f"Generuji {count} faktur (QR={with_qr}, ISDOC={with_isdoc}) se šablonou '{template}'...")
+        print(f"Generuji {count} faktur (QR={with_qr}, ISDOC={with_isdoc}) se šablonou '{template}'...",
+              file=log)
+        
+        pools = _build_company_pools(suppliers, customers, skew, seed, log)
+        prototype = _compile_config(config)
         
-        for i in range(count):
-            try:
-                result = self.generate_invoice(template=template, with_qr=with_qr, with_isdoc=with_isdoc)
+        tasks = (_BatchTask(i, template, with_qr, with_isdoc, qr_backend,
+                            sink is not None, seed, profile=profile)
+                 for i in range(count))
+        
+        for index, result, error in self._run_tasks(tasks, count, workers, pools, prototype):
+            if error is None and sink is not None:
+                try:
+                    filename = generate_filename(self._pdf_prefix(with_qr, with_isdoc), 'pdf',
+                                                 result['invoice_number'])
+                    result = {'pdf': sink.add(filename, result['pdf'])}
+                except Exception as e:
+                    error = str(e)
+            
+            if error is None:
                 results.append(result)
-                print(f"  [{i+1}/{count}] Vygenerováno: {result.get('pdf', 'N/A')}")
-            except Exception as e:
-                print(f"  [{i+1}/{count}] Chyba: {e}")
+                print(f"  [{index+1}/{count}] Vygenerováno: {result.get('pdf', 'N/A')}", file=log)
+            else:
+                print(f"  [{index+1}/{count}] Chyba: {error}", file=log)
         
-        print(f"\nCelkem vygenerováno: {len(results)}/{count} faktur")
-        print(f"Umístění: {self.output_dir}")
+        print(f"\nCelkem vygenerováno: {len(results)}/{count} faktur", file=log)
+        print(f"Umístění: {sink if sink is not None else self.output_dir}", file=log)
         
         return results
     
+    def generate_single_pdf(self, count: int, template: str = 'classic',
+                            with_qr: bool = False, with_isdoc: bool = False,
+                            config: Union[str, 'data_utils.InvoicePrototype', None] = None,
+                            qr_backend: Optional[str] = None,
+                            sink: Optional[OutputSink] = None,
+                            write_index: bool = False,
+                            seed: Optional[int] = None,
+                            suppliers: Optional[int] = None,
+                            customers: Optional[int] = None,
+                            skew: float = 0.0,
+                            profile: Optional[str] = None) -> dict:
+        """
+        Vygeneruje dávku faktur do jednoho PDF dokumentu.
+        
+        Fonty a společné zdroje se vloží jen jednou, každá faktura začíná
+        na nové stránce. Dokument se vykresluje v jednom procesu.
+        
+        Args:
+            count: Počet faktur v dokumentu
+            template: Název šablony
+            with_qr: Zda přidat QR kód na první stránku každé faktury
+            with_isdoc: Zda připojit ISDOC XML každé faktury jako přílohu
+            config: Cesta k JSON konfiguraci dat (zparsuje se jednou pro celou dávku)
+                nebo již zkompilovaný InvoicePrototype
+            qr_backend: Způsob vykreslení QR kódu ('vector' nebo 'raster')
+            sink: Cílový sink (None = soubor ve výstupním adresáři generátoru)
+            write_index: Zda zapsat i JSON index stránek jednotlivých faktur
+            seed: Seed pro deterministické generování (None = náhodná data)
+            suppliers: Velikost zásoby dodavatelů (None = nový pro každou fakturu)
+            customers: Velikost zásoby odběratelů (None = nový pro každou fakturu)
+            skew: Exponent Zipfova rozdělení při výběru ze zásob (0 = rovnoměrně)
+            profile: Výstupní profil PDF ('fast', 'balanced', 'smallest')
+            
+        Returns:
+            Slovník s umístěním PDF ('pdf'), případně indexu ('index'),
+            a počty faktur ('invoices') a stránek ('pages')
+        """
+        if sink is None and self.output_dir is None:
+            raise ValueError("Generátor nemá výstupní adresář, zadejte sink")
+        
+        log = sys.stderr if sink is not None and sink.uses_stdout else sys.stdout
+        
+        print(f"Generuji {count} faktur do jednoho PDF (QR={with_qr}, ISDOC={with_isdoc}) "
+              f"se šablonou '{template}'...", file=log)
+        
+        pools = _build_company_pools(suppliers, customers, skew, seed, log)
+        prototype = _compile_config(config)
+        
+        def invoices():
+            for index in range(count):
+                try:
+                    invoice = _load_invoice(prototype, seed, index, pools)
+                except Exception as e:
+                    print(f"  [{index+1}/{count}] Chyba: {e}", file=log)
+                    continue
+                print(f"  [{index+1}/{count}] Vykresleno: {invoice.invoice_number}", file=log)
+                yield invoice
+        
+        template_instance = get_template(template)()
+        filename = generate_filename(self._pdf_prefix(with_qr, with_isdoc, base='invoices'), 'pdf')
+        
+        if sink is None:
+            pdf_location = str(self.output_dir / filename)
+            page_index = template_instance.generate_document(invoices(), pdf_location, with_qr=with_qr,
+                                                             with_isdoc=with_isdoc, qr_backend=qr_backend,
+                                                             invariant=seed is not None, profile=profile)
+        else:
+            buffer = BytesIO()
+            page_index = template_instance.generate_document(invoices(), buffer, with_qr=with_qr,
+                                                             with_isdoc=with_isdoc, qr_backend=qr_backend,
+                                                             invariant=seed is not None, profile=profile)
+            pdf_location = sink.add(filename, buffer.getvalue())
+            buffer.close()
+        
+        result = {
+            'pdf': pdf_location,
+            'invoices': len(page_index),
+            'pages': page_index[-1]['last_page'] if page_index else 0,
+        }
+        
+        if write_index:
+            index_name = filename[:-len('.pdf')] + '_index.json'
+            index_data = json.dumps({'pdf': filename, 'invoices': page_index},
+                                    ensure_ascii=False, indent=2).encode('utf-8')
+            if sink is None:
+                index_path = self.output_dir / index_name
+                index_path.write_bytes(index_data)
+                result['index'] = str(index_path)
+            else:
+                result['index'] = sink.add(index_name, index_data)
+        
+        print(f"\nCelkem vykresleno: {result['invoices']}/{count} faktur na {result['pages']} stránkách",
+              file=log)
+        print(f"Umístění: {pdf_location}", file=log)
+        
+        return result
+    
+    def generate_from_input(self, input_path: str, template: str = 'classic',
+                            with_qr: bool = False, with_isdoc: bool = False,
+                            workers: int = 1, qr_backend: Optional[str] = None,
+                            sink: Optional[OutputSink] = None,
+                            seed: Optional[int] = None,
+                            suppliers: Optional[int] = None,
+                            customers: Optional[int] = None,
+                            skew: float = 0.0,
+                            profile: Optional[str] = None) -> dict:
+        """
+        Vygeneruje faktury z hromadného vstupu (NDJSON nebo CSV).
+        
+        Záznamy se čtou proudově a do zpracování jich je vždy jen omezené
+        množství, takže paměť nezávisí na velikosti vstupu. Každý záznam může
+        určit vlastní šablonu a přílohy ('template', 'qr', 'isdoc'), jinak
+        platí hodnoty argumentů. Chybný záznam se vypíše s číslem řádku
+        a zpracování pokračuje dalším.
+        
+        Args:
+            input_path: Cesta ke vstupu (.csv = CSV, jinak NDJSON; '-' = stdin)
+            template: Výchozí šablona
+            with_qr: Výchozí přidání QR kódu
+            with_isdoc: Výchozí připojení ISDOC XML
+            workers: Počet pracovních procesů (1 = sekvenčně v tomto procesu)
+            qr_backend: Způsob vykreslení QR kódu ('vector' nebo 'raster')
+            sink: Cílový sink (None = soubory ve výstupním adresáři generátoru)
+            seed: Seed pro údaje, které záznam nezadává (None = náhodná data)
+            suppliers: Velikost zásoby pro chybějící dodavatele
+            customers: Velikost zásoby pro chybějící odběratele
+            skew: Exponent Zipfova rozdělení při výběru ze zásob (0 = rovnoměrně)
+            profile: Výstupní profil PDF ('fast', 'balanced', 'smallest')
+            
+        Returns:
+            Slovník s počty záznamů ('records'), vygenerovaných faktur
+            ('generated') a chyb ('errors')
+        """
+        import bulk_input
+        
+        if workers < 1:
+            raise ValueError(f"Počet procesů musí být alespoň 1: {workers}")
+        if sink is None and self.output_dir is None:
+            raise ValueError("Generátor nemá výstupní adresář, zadejte sink")
+        
+        log = sys.stderr if sink is not None and sink.uses_stdout else sys.stdout
+        print(f"Generuji faktury ze vstupu '{input_path}'...", file=log)
+        
+        pools = _build_company_pools(suppliers, customers, skew, seed, log)
+        stats = {'records': 0, 'generated': 0, 'errors': 0}
+        
+        # Rozpracované záznamy: index -> (řádek, QR, ISDOC). Chybné záznamy
+        # procházejí okny _run_tasks jako úlohy s chybou, takže se vypíší
+        # ve správném pořadí hned s okolními záznamy a počet rozpracovaných
+        # záznamů (a velikost slovníku) omezují okna i při samých chybách.
+        pending = {}
+        
+        def report(line: int, result: Optional[dict], error: Optional[str]):
+            if error is None:
+                stats['generated'] += 1
+                print(f"  [řádek {line}] Vygenerováno: {result.get('pdf', 'N/A')}", file=log)
+            else:
+                stats['errors'] += 1
+                print(f"  [řádek {line}] Chyba: {error}", file=log)
+        
+        def tasks():
+            for line, record, error in bulk_input.iter_records(input_path):
+                index = stats['records']
+                stats['records'] += 1
+                if error is None:
+                    try:
+                        data, record_template, record_qr, record_isdoc = bulk_input.split_options(
+                            record, template, with_qr, with_isdoc)
+                    except ValueError as e:
+                        error = str(e)
+                if error is not None:
+                    pending[index] = (line, None, None)
+                    yield _BatchTask(index, template, with_qr, with_isdoc, error=error)
+                    continue
+                
+                pending[index] = (line, record_qr, record_isdoc)
+                yield _BatchTask(index, record_template, record_qr, record_isdoc, qr_backend,
+                                 sink is not None, seed, data, profile)
+        
+        # Počet záznamů není předem znám - velikost dávek se volí pro velký vstup
+        for index, result, error in self._run_tasks(tasks(), None, workers, pools):
+            line, record_qr, record_isdoc = pending.pop(index)
+            if error is None and sink is not None:
+                try:
+                    filename = generate_filename(self._pdf_prefix(record_qr, record_isdoc), 'pdf',
+                                                 result['invoice_number'])
+                    result = {'pdf': sink.add(filename, result['pdf'])}
+                except Exception as e:
+                    error = str(e)
+            report(line, result, error)
+        
+        print(f"\nCelkem vygenerováno: {stats['generated']}/{stats['records']} faktur "
+              f"({stats['errors']} chyb)", file=log)
+        print(f"Umístění: {sink if sink is not None else self.output_dir}", file=log)
+        
+        return stats
+    
+    def _run_tasks(self, tasks, count: Optional[int], workers: int, pools: Optional[tuple] = None,
+                   prototype: Optional['data_utils.InvoicePrototype'] = None):
+        """
+        Zpracuje úlohy sekvenčně nebo v poolu procesů.
+        
+        Args:
+            tasks: Iterátor popisů úloh (_BatchTask)
+            count: Celkový počet úloh (pro volbu velikosti dávek; None = neznámý)
+            workers: Počet pracovních procesů
+            pools: Zásoby firem (dodavatelé, odběratelé) - do procesů se
+                předají jednou při inicializaci
+            prototype: Zkompilovaná konfigurace dat (předá se stejně jako zásoby)
+            
+        Yields:
+            Trojice (index, výsledek, chyba) v pořadí úloh
+        """
+        if workers == 1 or count == 1:
+            for task in tasks:
+                yield _execute_task(self, task, pools, prototype)
+            return
+        
+        # Menší dávky udrží pořadí výpisu plynulé, větší šetří režii IPC
+        chunksize = max(1, min(16, (count or 16 * workers * 8) // (workers * 8)))
+        # Pool.imap by načetl celý iterátor úloh najednou - úlohy se proto
+        # předávají po oknech, aby paměť (včetně hotových PDF čekajících na
+        # vyzvednutí) nezávisela na velikosti dávky. Rozpracovaná jsou vždy
+        # dvě okna, takže procesy mezi okny nečekají.
+        window = chunksize * workers * 2
+        output_dir = str(self.output_dir) if self.output_dir is not None else None
+        with multiprocessing.Pool(processes=workers, initializer=_init_worker,
+                                  initargs=(output_dir, pools, prototype)) as pool:
+            tasks = iter(tasks)
+            in_flight = deque()
+            while True:
+                batch = list(islice(tasks, window))
+                if batch:
+                    in_flight.append(pool.imap(_run_worker_task, batch, chunksize=chunksize))
+                if not in_flight:
+                    break
+                if not batch or len(in_flight) > 1:
+                    yield from in_flight.popleft()
+
+
+class _BatchTask(NamedTuple):
+    """Lehký popis jedné úlohy dávky předávaný pracovním procesům."""
+    index: int
+    template: str
+    with_qr: bool
+    with_isdoc: bool
+    qr_backend: Optional[str] = None
+    in_memory: bool = False
+    seed: Optional[int] = None
+    # Data faktury z hromadného vstupu (None = konfigurace dávky nebo náhodná data)
+    record: Optional[dict] = None
+    profile: Optional[str] = None
+    # Chyba záznamu zjištěná už při čtení vstupu (úloha se jen ohlásí)
+    error: Optional[str] = None
+
 
+# Generátor, zásoby firem a prototyp konfigurace pracovního procesu
+# (nastaveny v _init_worker)
+_worker_generator: Optional[InvoiceGenerator] = None
+_worker_pools: Optional[tuple] = None
+_worker_prototype: Optional['data_utils.InvoicePrototype'] = None
 
+
+def _init_worker(output_dir: Optional[str], pools: Optional[tuple] = None,
+                 prototype: Optional['data_utils.InvoicePrototype'] = None):
+    """
+    Jednorázově připraví pracovní proces poolu.
+    
+    Args:
+        output_dir: Cesta k výstupnímu adresáři (None = renderování do paměti)
+        pools: Zásoby firem (dodavatelé, odběratelé) z hlavního procesu
+        prototype: Zkompilovaná konfigurace dat z hlavního procesu
+    """
+    global _worker_generator, _worker_pools, _worker_prototype
+    _worker_generator = InvoiceGenerator(output_dir=output_dir)
+    _worker_pools = pools
+    _worker_prototype = prototype
+    
+    # Zahřátí - registrace fontů a import modulů šablon proběhne jen jednou
+    for template_name in ('classic', 'modern', 'minimal'):
+        get_template(template_name)()
+
+
+def _run_worker_task(task: _BatchTask):
+    """Zpracuje úlohu v pracovním procesu."""
+    return _execute_task(_worker_generator, task, _worker_pools, _worker_prototype)
+
+
+def _execute_task(generator: InvoiceGenerator, task: _BatchTask, pools: Optional[tuple] = None,
+                  prototype: Optional['data_utils.InvoicePrototype'] = None):
+    """
+    Vygeneruje jednu fakturu podle popisu úlohy.
+    
+    Args:
+        generator: Instance generátoru, která fakturu vykreslí
+        task: Popis úlohy
+        pools: Zásoby firem (dodavatelé, odběratelé)
+        prototype: Zkompilovaná konfigurace dat (None = náhodná faktura)
+        
+    Returns:
+        Trojice (index, výsledek, chyba) - chyba je None při úspěchu
+    """
+    if task.error is not None:
+        return task.index, None, task.error
+    try:
+        if task.record is not None:
+            prototype = data_utils.InvoicePrototype(task.record)
+        invoice = _load_invoice(prototype, task.seed, task.index, pools)
+        render = generator.render_invoice if task.in_memory else generator.generate_invoice
+        result = render(invoice=invoice, template=task.template,
+                        with_qr=task.with_qr, with_isdoc=task.with_isdoc,
+                        qr_backend=task.qr_backend, invariant=task.seed is not None,
+                        profile=task.profile)
+        return task.index, result, None
+    except Exception as e:
+        return task.index, None, str(e)
+
+
+def _load_invoice(prototype: Optional['data_utils.InvoicePrototype'], seed: Optional[int],
+                  index: int, pools: Optional[tuple] = None) -> Invoice:
+    """
+    Připraví data faktury s daným pořadím v dávce.
+    
+    Args:
+        prototype: Zkompilovaná konfigurace dat (None = náhodná faktura)
+        seed: Seed dávky (None = nedeterministická data)
+        index: Pořadí faktury v dávce (od 0)
+        pools: Zásoby firem (dodavatelé, odběratelé); s konfigurací se
+            použijí jen pro firmy, které konfigurace nezadává
+        
+    Returns:
+        Instance Invoice
+    """
+    supplier_pool, customer_pool = pools or (None, None)
+    if seed is not None:
+        return data_utils.generate_seeded_invoice(seed, index, prototype,
+                                                  supplier_pool=supplier_pool,
+                                                  customer_pool=customer_pool)
+    if prototype is not None:
+        return prototype.build(supplier_pool=supplier_pool, customer_pool=customer_pool)
+    return data_utils.generate_invoice(supplier_pool=supplier_pool, customer_pool=customer_pool)
+
+
+def _compile_config(config: Union[str, 'data_utils.InvoicePrototype', None]
+                    ) -> Optional['data_utils.InvoicePrototype']:
+    """
+    Zkompiluje konfiguraci dat do prototypu (jednou pro celou dávku).
+    
+    Args:
+        config: Cesta k JSON konfiguraci, hotový prototyp nebo None
+        
+    Returns:
+        InvoicePrototype nebo None bez konfigurace
+    """
+    if isinstance(config, str):
+        return data_utils.InvoicePrototype.from_json(config)
+    return config
+
+
+def _build_company_pools(suppliers: Optional[int], customers: Optional[int],
+                         skew: float, seed: Optional[int], log) -> Optional[Tuple]:
+    """
+    Vygeneruje zásoby dodavatelů a odběratelů pro dávku.
+    
+    Args:
+        suppliers: Velikost zásoby dodavatelů (None = bez zásoby)
+        customers: Velikost zásoby odběratelů (None = bez zásoby)
+        skew: Exponent Zipfova rozdělení při výběru
+        seed: Seed dávky (zásoby pak vyjdou vždy stejně)
+        log: Proud pro výpis
+        
+    Returns:
+        Dvojice (dodavatelé, odběratelé) nebo None, pokud se zásoby nepoužijí
+    """
+    if not suppliers and not customers:
+        return None
+    
+    def build(size, name):
+        if not size:
+            return None
+        rng = random.Random(data_utils.derive_seed(seed, name)) if seed is not None else None
+        return data_utils.CompanyPool(size, skew=skew, rng=rng)
+    
+    pools = (build(suppliers, 'suppliers'), build(customers, 'customers'))
+    print(f"Zásoba firem: dodavatelé {suppliers or '-'}, odběratelé {customers or '-'}"
+          f"{f', Zipf {skew}' if skew else ''}", file=log)
+    return pools
@@ -1,10 +1,11 @@
 """Generátor ISDOC XML souborů pro české faktury."""
 
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from io import BytesIO
 from datetime import datetime
+from typing import BinaryIO
 
 from models.invoice import Invoice
+from isdoc_writer import XMLStreamWriter
 
 
 class ISDOCGenerator:
@@ -13,6 +14,9 @@ class ISDOCGenerator:
     
     ISDOC je český standard pro elektronickou výměnu faktur.
     Verze: ISDOC 6.0.1
+    
+    XML se zapisuje proudově v jednom průchodu (XMLStreamWriter), bez
+    mezilehlého stromu elementů a bez opětovného parsování.
     """
     
     # Namespace definice
@@ -21,291 +25,305 @@ class ISDOCGenerator:
     }
     
     @staticmethod
-    def _prettify_xml(elem: ET.Element) -> str:
+    def _format_date(date_obj) -> str:
+        """Formátuje datum do ISO formátu."""
+        return date_obj.strftime("%Y-%m-%d")
+    
+    @staticmethod
+    def generate(invoice: Invoice, output_path: str, pretty: bool = True):
         """
-        Naformátuje XML s odsazením.
+        Generuje ISDOC XML soubor.
         
         Args:
-            elem: Element k naformátování
-            
-        Returns:
-            Formátovaný XML string
+            invoice: Instance faktury
+            output_path: Cesta k výstupnímu XML souboru
+            pretty: Zda XML odsadit (False = kompaktní výstup)
         """
-        rough_string = ET.tostring(elem, encoding='utf-8')
-        reparsed = minidom.parseString(rough_string)
-        return reparsed.toprettyxml(indent="  ", encoding='utf-8').decode('utf-8')
+        with open(output_path, 'wb') as f:
+            ISDOCGenerator.write(invoice, f, pretty=pretty)
     
     @staticmethod
-    def _format_date(date_obj) -> str:
-        """Formátuje datum do ISO formátu."""
-        return date_obj.strftime("%Y-%m-%d")
+    def to_bytes(invoice: Invoice, pretty: bool = True, invariant: bool = False) -> bytes:
+        """
+        Vygeneruje ISDOC XML v paměti.
+        
+        Args:
+            invoice: Instance faktury
+            pretty: Zda XML odsadit (False = kompaktní výstup)
+            invariant: Zda UUID odvodit z data vystavení místo aktuálního času
+            
+        Returns:
+            ISDOC XML kódované v UTF-8
+        """
+        buffer = BytesIO()
+        ISDOCGenerator.write(invoice, buffer, pretty=pretty, invariant=invariant)
+        return buffer.getvalue()
     
     @staticmethod
-    def generate(invoice: Invoice, output_path: str):
+    def write(invoice: Invoice, stream: BinaryIO, pretty: bool = True, invariant: bool = False):
         """
-        Generuje ISDOC XML soubor.
+        Zapíše ISDOC XML do bajtového proudu.
         
         Args:
             invoice: Instance faktury
-            output_path: Cesta k výstupnímu XML souboru
+            stream: Cílový proud (soubor otevřený v binárním režimu, BytesIO, ...)
+            pretty: Zda XML odsadit (False = kompaktní výstup)
+            invariant: Zda UUID odvodit z data vystavení místo aktuálního času
+                (stejná faktura pak dává bajtově shodné XML)
         """
+        w = XMLStreamWriter(stream, indent="  " if pretty else None)
+        w.start_document()
+        
         # Hlavní element
-        root = ET.Element('Invoice')
-        root.set('xmlns', ISDOCGenerator.NAMESPACES['isdoc'])
-        root.set('version', '6.0.1')
+        w.start('Invoice', {'xmlns': ISDOCGenerator.NAMESPACES['isdoc'], 'version': '6.0.1'})
         
         # Metadata dokumentu
-        doc_details = ET.SubElement(root, 'DocumentType')
-        doc_details.text = '1'  # 1 = faktura
+        w.element('DocumentType', '1')  # 1 = faktura
         
         # Číslo dokladu
-        doc_number = ET.SubElement(root, 'ID')
-        doc_number.text = invoice.invoice_number
+        w.element('ID', invoice.invoice_number)
         
         # UUID (pro reálné použití by mělo být unikátní)
-        uuid_elem = ET.SubElement(root, 'UUID')
-        uuid_elem.text = f"INV-{invoice.invoice_number}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        created = (datetime.combine(invoice.issue_date, datetime.min.time()) if invariant
+                   else datetime.now())
+        w.element('UUID', f"INV-{invoice.invoice_number}-{created.strftime('%Y%m%d%H%M%S')}")
         
         # Datum vystavení
-        issue_date = ET.SubElement(root, 'IssueDate')
-        issue_date.text = ISDOCGenerator._format_date(invoice.issue_date)
+        w.element('IssueDate', ISDOCGenerator._format_date(invoice.issue_date))
         
         # Datum splatnosti
-        due_date = ET.SubElement(root, 'DueDate')
-        due_date.text = ISDOCGenerator._format_date(invoice.due_date)
+        w.element('DueDate', ISDOCGenerator._format_date(invoice.due_date))
         
         # Měna
-        currency = ET.SubElement(root, 'LocalCurrencyCode')
-        currency.text = invoice.currency
+        w.element('LocalCurrencyCode', invoice.currency)
         
         # Dodavatel (AccountingSupplierParty)
-        ISDOCGenerator._add_party(root, 'AccountingSupplierParty', invoice.supplier)
+        ISDOCGenerator._add_party(w, 'AccountingSupplierParty', invoice.supplier)
         
         # Odběratel (AccountingCustomerParty)
-        ISDOCGenerator._add_party(root, 'AccountingCustomerParty', invoice.customer)
+        ISDOCGenerator._add_party(w, 'AccountingCustomerParty', invoice.customer)
         
         # Položky faktury
-        ISDOCGenerator._add_invoice_lines(root, invoice)
+        ISDOCGenerator._add_invoice_lines(w, invoice)
         
         # Souhrn DPH
-        ISDOCGenerator._add_tax_total(root, invoice)
+        ISDOCGenerator._add_tax_total(w, invoice)
         
         # Celkové částky
-        ISDOCGenerator._add_totals(root, invoice)
+        ISDOCGenerator._add_totals(w, invoice)
         
         # Platební údaje
-        ISDOCGenerator._add_payment_means(root, invoice)
+        ISDOCGenerator._add_payment_means(w, invoice)
         
-        # Uložení do souboru
-        xml_string = ISDOCGenerator._prettify_xml(root)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(xml_string)
+        w.end('Invoice')
+        w.end_document()
     
     @staticmethod
-    def _add_party(parent: ET.Element, party_type: str, company):
+    def _add_party(w: XMLStreamWriter, party_type: str, company):
         """
         Přidá informace o subjektu (dodavatel/odběratel).
         
         Args:
-            parent: Rodičovský element
+            w: Zapisovač XML
             party_type: Typ subjektu (AccountingSupplierParty/AccountingCustomerParty)
             company: Instance Company
         """
-        party = ET.SubElement(parent, party_type)
+        w.start(party_type)
         
         # Strana (Party)
-        party_elem = ET.SubElement(party, 'Party')
+        w.start('Party')
         
         # Název
-        party_name = ET.SubElement(party_elem, 'PartyName')
-        name = ET.SubElement(party_name, 'Name')
-        name.text = company.name
+        w.start('PartyName')
+        w.element('Name', company.name)
+        w.end('PartyName')
         
         # Adresa
-        postal_address = ET.SubElement(party_elem, 'PostalAddress')
-        
-        street = ET.SubElement(postal_address, 'StreetName')
-        street.text = company.street
-        
-        city = ET.SubElement(postal_address, 'CityName')
-        city.text = company.city
+        w.start('PostalAddress')
+        w.element('StreetName', company.street)
+        w.element('CityName', company.city)
+        w.element('PostalZone', company.zip_code)
         
-        zip_code = ET.SubElement(postal_address, 'PostalZone')
-        zip_code.text = company.zip_code
-        
-        country = ET.SubElement(postal_address, 'Country')
-        country_code = ET.SubElement(country, 'IdentificationCode')
-        country_code.text = 'CZ'
-        country_name = ET.SubElement(country, 'Name')
-        country_name.text = company.country
+        w.start('Country')
+        w.element('IdentificationCode', 'CZ')
+        w.element('Name', company.country)
+        w.end('Country')
+        w.end('PostalAddress')
         
         # Identifikace
-        party_identification = ET.SubElement(party_elem, 'PartyIdentification')
-        id_elem = ET.SubElement(party_identification, 'ID')
-        id_elem.text = company.ico
+        w.start('PartyIdentification')
+        w.element('ID', company.ico)
+        w.end('PartyIdentification')
         
         # DIČ
-        party_tax_scheme = ET.SubElement(party_elem, 'PartyTaxScheme')
-        tax_id = ET.SubElement(party_tax_scheme, 'CompanyID')
-        tax_id.text = company.dic
+        w.start('PartyTaxScheme')
+        w.element('CompanyID', company.dic)
+        
+        w.start('TaxScheme')
+        w.element('ID', 'VAT')
+        w.end('TaxScheme')
+        w.end('PartyTaxScheme')
         
-        tax_scheme = ET.SubElement(party_tax_scheme, 'TaxScheme')
-        tax_scheme_id = ET.SubElement(tax_scheme, 'ID')
-        tax_scheme_id.text = 'VAT'
+        w.end('Party')
+        w.end(party_type)
     
     @staticmethod
-    def _add_invoice_lines(parent: ET.Element, invoice: Invoice):
+    def _add_invoice_lines(w: XMLStreamWriter, invoice: Invoice):
         """
         Přidá položky faktury.
         
         Args:
-            parent: Rodičovský element
+            w: Zapisovač XML
             invoice: Instance faktury
         """
-        lines_container = ET.SubElement(parent, 'InvoiceLines')
+        w.start('InvoiceLines')
         
-        for idx, item in enumerate(invoice.items, start=1):
-            line = ET.SubElement(lines_container, 'InvoiceLine')
+        # Řádky se čtou jako n-tice (u ItemColumns bez vytváření položek)
+        for idx, row in enumerate(invoice.item_rows(), start=1):
+            description, quantity, unit, unit_price, vat_rate, base, vat, total = row
+            w.start('InvoiceLine')
             
             # ID řádku
-            line_id = ET.SubElement(line, 'ID')
-            line_id.text = str(idx)
+            w.element('ID', str(idx))
             
             # Množství
-            quantity = ET.SubElement(line, 'InvoicedQuantity')
-            quantity.set('unitCode', item.unit)
-            quantity.text = str(item.quantity)
+            w.element('InvoicedQuantity', str(quantity), {'unitCode': unit})
             
             # Celková cena řádku
-            line_extension = ET.SubElement(line, 'LineExtensionAmount')
-            line_extension.text = str(item.total_price_without_vat)
+            w.element('LineExtensionAmount', str(base))
             
             # Celková cena s DPH
-            line_extension_tax = ET.SubElement(line, 'LineExtensionAmountTaxInclusive')
-            line_extension_tax.text = str(item.total_price_with_vat)
+            w.element('LineExtensionAmountTaxInclusive', str(total))
             
             # DPH částka
-            line_tax = ET.SubElement(line, 'LineExtensionTaxAmount')
-            line_tax.text = str(item.vat_amount)
+            w.element('LineExtensionTaxAmount', str(vat))
             
             # Jednotková cena
-            unit_price = ET.SubElement(line, 'UnitPrice')
-            unit_price.text = str(item.unit_price)
+            w.element('UnitPrice', str(unit_price))
             
             # Sazba DPH
-            class_tax = ET.SubElement(line, 'ClassifiedTaxCategory')
-            percent = ET.SubElement(class_tax, 'Percent')
-            percent.text = str(item.vat_rate)
-            
-            vat_calc = ET.SubElement(class_tax, 'VATCalculationMethod')
-            vat_calc.text = '0'  # 0 = standardní výpočet
+            w.start('ClassifiedTaxCategory')
+            w.element('Percent', str(vat_rate))
+            w.element('VATCalculationMethod', '0')  # 0 = standardní výpočet
+            w.end('ClassifiedTaxCategory')
             
             # Popis položky
-            item_elem = ET.SubElement(line, 'Item')
-            description = ET.SubElement(item_elem, 'Description')
-            description.text = item.description
+            w.start('Item')
+            w.element('Description', description)
+            w.end('Item')
+            
+            w.end('InvoiceLine')
+        
+        w.end('InvoiceLines')
     
     @staticmethod
-    def _add_tax_total(parent: ET.Element, invoice: Invoice):
+    def _add_tax_total(w: XMLStreamWriter, invoice: Invoice):
         """
         Přidá souhrn DPH.
         
         Args:
-            parent: Rodičovský element
+            w: Zapisovač XML
             invoice: Instance faktury
         """
-        tax_total = ET.SubElement(parent, 'TaxTotal')
+        w.start('TaxTotal')
         
         # Celková DPH
-        tax_amount = ET.SubElement(tax_total, 'TaxAmount')
-        tax_amount.text = str(invoice.total_vat)
+        w.element('TaxAmount', str(invoice.total_vat))
         
         # Rozpis podle sazeb
         vat_summary = invoice.get_vat_summary()
         
         for vat_rate, amounts in vat_summary.items():
-            tax_subtotal = ET.SubElement(tax_total, 'TaxSubTotal')
+            w.start('TaxSubTotal')
             
             # Základ daně
-            taxable_amount = ET.SubElement(tax_subtotal, 'TaxableAmount')
-            taxable_amount.text = str(amounts['base'])
+            w.element('TaxableAmount', str(amounts['base']))
             
             # Částka daně
-            tax_amount_sub = ET.SubElement(tax_subtotal, 'TaxAmount')
-            tax_amount_sub.text = str(amounts['vat'])
+            w.element('TaxAmount', str(amounts['vat']))
             
             # Celkem s daní
-            tax_inclusive = ET.SubElement(tax_subtotal, 'TaxInclusiveAmount')
-            tax_inclusive.text = str(amounts['total'])
+            w.element('TaxInclusiveAmount', str(amounts['total']))
             
             # Kategorie
-            tax_category = ET.SubElement(tax_subtotal, 'TaxCategory')
-            percent = ET.SubElement(tax_category, 'Percent')
-            percent.text = str(vat_rate)
+            w.start('TaxCategory')
+            w.element('Percent', str(vat_rate))
+            w.end('TaxCategory')
+            
+            w.end('TaxSubTotal')
+        
+        w.end('TaxTotal')
     
     @staticmethod
-    def _add_totals(parent: ET.Element, invoice: Invoice):
+    def _add_totals(w: XMLStreamWriter, invoice: Invoice):
         """
         Přidá celkové částky.
         
         Args:
-            parent: Rodičovský element
+            w: Zapisovač XML
             invoice: Instance faktury
         """
         # Celkem bez DPH
-        tax_exclusive = ET.SubElement(parent, 'TaxExclusiveAmount')
-        tax_exclusive.text = str(invoice.total_without_vat)
+        w.element('TaxExclusiveAmount', str(invoice.total_without_vat))
         
         # Celkem s DPH
-        tax_inclusive = ET.SubElement(parent, 'TaxInclusiveAmount')
-        tax_inclusive.text = str(invoice.total_with_vat)
+        w.element('TaxInclusiveAmount', str(invoice.total_with_vat))
         
         # Částka k úhradě
-        payable_amount = ET.SubElement(parent, 'PayableAmount')
-        payable_amount.text = str(invoice.total_with_vat)
+        w.element('PayableAmount', str(invoice.total_with_vat))
     
     @staticmethod
-    def _add_payment_means(parent: ET.Element, invoice: Invoice):
+    def _add_payment_means(w: XMLStreamWriter, invoice: Invoice):
         """
         Přidá platební údaje.
         
         Args:
-            parent: Rodičovský element
+            w: Zapisovač XML
             invoice: Instance faktury
         """
-        payment_means = ET.SubElement(parent, 'PaymentMeans')
+        w.start('PaymentMeans')
         
         # Platební instrukce
-        payment_means_code = ET.SubElement(payment_means, 'PaymentMeansCode')
-        payment_means_code.text = '42'  # 42 = bankovní převod
+        w.element('PaymentMeansCode', '42')  # 42 = bankovní převod
         
         # Detaily platby
-        payment = ET.SubElement(payment_means, 'Payment')
+        w.start('Payment')
         
         # Bankovní účet
-        account = ET.SubElement(payment, 'PaidBy')
-        iban = ET.SubElement(account, 'IBAN')
-        iban.text = invoice.supplier.iban
+        w.start('PaidBy')
+        w.element('IBAN', invoice.supplier.iban)
+        w.end('PaidBy')
         
         # Variabilní symbol
-        details = ET.SubElement(payment, 'Details')
-        id_elem = ET.SubElement(details, 'ID')
-        id_elem.text = invoice.variable_symbol
+        w.start('Details')
+        w.element('ID', invoice.variable_symbol)
+        w.end('Details')
+        
+        w.end('Payment')
+        w.end('PaymentMeans')
 
 
-def attach_isdoc_to_pdf(invoice: Invoice, pdf_path: str, output_xml: str = None):
+def attach_isdoc_to_pdf(invoice: Invoice, pdf_path: str, output_xml: str = None,
+                        profile: str = None):
     """
     Připojí ISDOC XML k existujícímu PDF souboru.
     
+    Původní PDF se znovu načte a přepíše. Pro nové faktury je levnější vložit
+    ISDOC rovnou při generování (BaseTemplate.generate s with_isdoc=True).
+    
     Args:
         invoice: Instance faktury
         pdf_path: Cesta k existujícímu PDF (bude přepsáno)
         output_xml: Cesta k výstupnímu XML (volitelné, pro samostatný soubor)
+        profile: Výstupní profil přepsaného PDF ('fast', 'balanced', 'smallest';
+            None = výchozí)
     """
     import tempfile
     import os
     import pypdf
+    from pdf_templates.profiles import get_output_profile, compress_pdf_writer, write_pdf_writer
+    
+    output_profile = get_output_profile(profile)
     
     # Vytvoření dočasného XML souboru
     temp_xml = tempfile.NamedTemporaryFile(mode='w', suffix='.xml', delete=False, encoding='utf-8')
@@ -339,11 +357,12 @@ def attach_isdoc_to_pdf(invoice: Invoice, pdf_path: str, output_xml: str = None)
             
             # Přidání XML jako attachment
             pdf_writer.add_attachment('isdoc.xml', xml_content.encode('utf-8'))
+            compress_pdf_writer(pdf_writer, output_profile)
             
             # Uložení do dočasného souboru
             temp_pdf = tempfile.NamedTemporaryFile(mode='wb', suffix='.pdf', delete=False)
             temp_pdf_path = temp_pdf.name
-            pdf_writer.write(temp_pdf)
+            write_pdf_writer(pdf_writer, temp_pdf, output_profile)
             temp_pdf.close()
             
         # Přepsání původního souboru
@@ -367,12 +386,16 @@ def generate_invoice_with_isdoc(invoice: Invoice, template_class,
         output_pdf: Cesta k výstupnímu PDF
         output_xml: Cesta k výstupnímu XML (volitelné, pro samostatný soubor)
     """
-    # Standardní vygenerování PDF
+    xml_content = ISDOCGenerator.to_bytes(invoice)
+    
+    # Vygenerování PDF s ISDOC přílohou v jednom průchodu
     template = template_class()
-    template.generate(invoice, output_pdf)
+    template.generate(invoice, output_pdf, isdoc_xml=xml_content)
     
-    # Připojení ISDOC
-    attach_isdoc_to_pdf(invoice, output_pdf, output_xml)
+    # Samostatný XML soubor se stejným obsahem
+    if output_xml:
+        with open(output_xml, 'wb') as f:
+            f.write(xml_content)
     
     print(f"[OK] ISDOC XML vloženo do PDF: {output_pdf}")
 
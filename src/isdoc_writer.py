@@ -0,0 +1,120 @@
+"""Proudový zapisovač XML pro ISDOC bez mezilehlého stromu."""
+
+from typing import BinaryIO, Optional
+
+
+def _escape(text: str) -> str:
+    """
+    Escapuje text stejně jako minidom při serializaci.
+
+    Konce řádků se normalizují na LF, jak by to udělal XML parser.
+    """
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return (text.replace('&', '&amp;').replace('<', '&lt;')
+            .replace('"', '&quot;').replace('>', '&gt;'))
+
+
+class XMLStreamWriter:
+    """
+    Zapisuje well-formed XML přímo do bajtového proudu v jednom průchodu.
+
+    Formátování odpovídá minidom.toprettyxml (odsazení, prázdné elementy
+    jako <Tag/>, escapování), takže výstup je bajtově shodný s dřívějším
+    převodem ElementTree -> minidom. Při indent=None se zapisuje kompaktně
+    bez odsazení a nových řádků.
+    """
+
+    def __init__(self, stream: BinaryIO, indent: Optional[str] = "  ",
+                 encoding: str = 'utf-8'):
+        """
+        Inicializace zapisovače.
+
+        Args:
+            stream: Cílový proud (musí přijímat bytes)
+            indent: Odsazení jedné úrovně (None = kompaktní výstup)
+            encoding: Kódování výstupu
+        """
+        self.stream = stream
+        self.encoding = encoding
+        self.indent = indent or ""
+        self.newline = "\n" if indent is not None else ""
+        self._depth = 0
+        self._open_tags = []
+        self._pending_start = None
+
+    def _write(self, text: str):
+        self.stream.write(text.encode(self.encoding))
+
+    def _prefix(self) -> str:
+        return self.indent * self._depth
+
+    @staticmethod
+    def _format_attrs(attrs: Optional[dict]) -> str:
+        if not attrs:
+            return ""
+        return "".join(f' {name}="{_escape(str(value))}"' for name, value in attrs.items())
+
+    def _flush_pending(self):
+        """Dokončí otevírací tag rodiče, který už má potomky."""
+        if self._pending_start is not None:
+            self._write(self._pending_start + ">" + self.newline)
+            self._pending_start = None
+            self._depth += 1
+
+    def start_document(self):
+        """Zapíše XML deklaraci."""
+        self._write(f'<?xml version="1.0" encoding="{self.encoding}"?>{self.newline}')
+
+    def start(self, tag: str, attrs: Optional[dict] = None):
+        """
+        Otevře element s potomky.
+
+        Args:
+            tag: Název elementu
+            attrs: Atributy elementu
+        """
+        self._flush_pending()
+        self._pending_start = f"{self._prefix()}<{tag}{self._format_attrs(attrs)}"
+        self._open_tags.append(tag)
+
+    def end(self, tag: str):
+        """
+        Uzavře element otevřený metodou start.
+
+        Args:
+            tag: Název elementu (kontroluje se párování)
+        """
+        open_tag = self._open_tags.pop()
+        if open_tag != tag:
+            raise ValueError(f"Neočekávaný konec elementu {tag}, otevřen je {open_tag}")
+
+        if self._pending_start is not None:
+            # Element bez potomků
+            self._write(self._pending_start + "/>" + self.newline)
+            self._pending_start = None
+            return
+
+        self._depth -= 1
+        self._write(f"{self._prefix()}</{tag}>{self.newline}")
+
+    def element(self, tag: str, text: Optional[str] = None, attrs: Optional[dict] = None):
+        """
+        Zapíše listový element s textovým obsahem.
+
+        Args:
+            tag: Název elementu
+            text: Textový obsah (None nebo "" = prázdný element)
+            attrs: Atributy elementu
+        """
+        self._flush_pending()
+        opening = f"{self._prefix()}<{tag}{self._format_attrs(attrs)}"
+        if text:
+            self._write(f"{opening}>{_escape(text)}</{tag}>{self.newline}")
+        else:
+            self._write(f"{opening}/>{self.newline}")
+
+    def end_document(self):
+        """Ověří, že jsou všechny elementy uzavřené."""
+        if self._open_tags:
+            raise ValueError(f"Neuzavřené elementy: {', '.join(self._open_tags)}")
@@ -4,8 +4,6 @@ import typer
 from pathlib import Path
 from typing import Optional
 
-from invoice_generator import InvoiceGenerator
-
 
 # Inicializace Typer aplikace
 app = typer.Typer(
@@ -23,7 +21,28 @@ def generate(
                                 help="Šablona: classic, modern, minimal"),
     output_dir: str = typer.Option("output", "--output", "-o", 
                                   help="Výstupní adresář"),
-    config: str = typer.Option(None, "--config", "-C", help="Cesta k JSON konfiguraci dat")
+    config: str = typer.Option(None, "--config", "-C", help="Cesta k JSON konfiguraci dat"),
+    input_path: str = typer.Option(None, "--input", "-I",
+                                   help="Hromadný vstup: NDJSON (jedna faktura na řádek) nebo CSV, - = stdin"),
+    workers: int = typer.Option(1, "--workers", "-w", help="Počet paralelních procesů pro dávku"),
+    qr_backend: str = typer.Option("raster", "--qr-backend",
+                                   help="Vykreslení QR kódu: raster, vector"),
+    profile: str = typer.Option(None, "--profile", "-p",
+                                help="Výstupní profil PDF: fast (bez komprese), balanced, smallest "
+                                     "(výchozí fast, od 1000 položek balanced)"),
+    sink: str = typer.Option(None, "--sink", "-s",
+                             help="Výstup dávky: dir:CESTA, zip:SOUBOR.zip, tar:SOUBOR.tar, - (tar na stdout)"),
+    single_pdf: bool = typer.Option(False, "--single-pdf", help="Vykreslit celou dávku do jednoho PDF"),
+    page_index: bool = typer.Option(False, "--page-index",
+                                    help="S --single-pdf zapsat i JSON index stránek faktur"),
+    seed: int = typer.Option(None, "--seed",
+                             help="Seed pro reprodukovatelná data (stejný seed = stejné faktury)"),
+    suppliers: int = typer.Option(None, "--suppliers",
+                                  help="Počet dodavatelů, mezi které se dávka rozdělí"),
+    customers: int = typer.Option(None, "--customers",
+                                  help="Počet odběratelů, mezi které se dávka rozdělí"),
+    skew: float = typer.Option(0.0, "--skew",
+                               help="Zešikmení výběru firem (Zipf exponent, 0 = rovnoměrně, typicky 1.0)")
 ):
     """
     Generuje české faktury s náhodnými nebo konfigurovatelnými daty.
@@ -39,24 +58,49 @@ def generate(
     # Vygenerovat faktury s ISDOC i QR kódem
     python main.py --count 3 --isdoc --qr
     
+    # Vygenerovat 1000 faktur na 8 jádrech
+    python main.py --count 1000 --workers 8
+    
+    # Vygenerovat 10000 faktur rovnou do ZIP archivu
+    python main.py --count 10000 --sink zip:faktury.zip
+    
+    # Vygenerovat 2000 faktur do jednoho PDF s indexem stránek
+    python main.py --count 2000 --single-pdf --page-index
+    
+    # Reprodukovatelná dávka (stejný výstup při libovolném počtu procesů)
+    python main.py --count 500 --seed 42 --workers 4
+    
+    # 20 dodavatelů vystavuje faktury 500 odběratelům, pár z nich převažuje
+    python main.py --count 5000 --suppliers 20 --customers 500 --skew 1.0
+    
+    # Konkrétní faktury z NDJSON souboru (záznam může určit template, qr, isdoc)
+    python main.py --input faktury.ndjson --workers 4 --sink zip:faktury.zip
+    
+    # Komprimované PDF (zhruba poloviční velikost) pro archivaci
+    python main.py --count 1000 --profile balanced --sink zip:faktury.zip
+    
     """
+    # Při tar proudu na stdout musí veškeré výpisy jít na stderr
+    to_stderr = sink in ('-', 'tar:', 'tar:-')
+    
     try:
-        # Vytvoření generátoru
-        generator = InvoiceGenerator(output_dir=output_dir)
+        # Import až zde - generátor táhne reportlab a další těžké moduly,
+        # které příkazy jako version nebo info nepotřebují
+        from invoice_generator import InvoiceGenerator
+
+        # Vytvoření generátoru - se sinkem se výstupní adresář nevytváří
+        generator = InvoiceGenerator(output_dir=output_dir if sink is None else None)
         
         # Příprava faktury
         import data_utils
+        prototype = None
         if config:
             if not Path(config).exists():
                 typer.echo(f"[!] Chyba: Konfiguracni soubor '{config}' neexistuje", err=True)
                 raise typer.Exit(1)
-            invoice = data_utils.load_from_json(config)
-            typer.echo(f"Nactena data z: {config}")
-        else:
-            invoice = None 
-            
-
-
+            # Konfigurace se zparsuje jednou, dávka z ní jen vytváří kopie
+            prototype = data_utils.InvoicePrototype.from_json(config)
+            typer.echo(f"Nactena data z: {config}", err=to_stderr)
         
         # Validace parametrů
         valid_templates = ['classic', 'modern', 'minimal']
@@ -69,15 +113,119 @@ def generate(
             typer.echo("[!] Chyba: Pocet faktur musi byt alespon 1", err=True)
             raise typer.Exit(1)
         
+        if qr_backend not in ('vector', 'raster'):
+            typer.echo(f"[!] Chyba: Neplatny QR backend '{qr_backend}'", err=True)
+            typer.echo("    Podporovane backendy: vector, raster", err=True)
+            raise typer.Exit(1)
+        
+        from pdf_templates.profiles import OUTPUT_PROFILES
+        if profile is not None and profile not in OUTPUT_PROFILES:
+            typer.echo(f"[!] Chyba: Neplatny vystupni profil '{profile}'", err=True)
+            typer.echo(f"    Podporovane profily: {', '.join(OUTPUT_PROFILES)}", err=True)
+            raise typer.Exit(1)
+        
+        if workers < 1:
+            typer.echo("[!] Chyba: Pocet procesu musi byt alespon 1", err=True)
+            raise typer.Exit(1)
+        
+        if (suppliers is not None and suppliers < 1) or (customers is not None and customers < 1):
+            typer.echo("[!] Chyba: Pocet dodavatelu i odberatelu musi byt alespon 1", err=True)
+            raise typer.Exit(1)
+        
+        if skew < 0:
+            typer.echo("[!] Chyba: Zesikmeni (--skew) nesmi byt zaporne", err=True)
+            raise typer.Exit(1)
+        
+        if input_path is not None:
+            if config or single_pdf:
+                typer.echo("[!] Chyba: --input nelze kombinovat s --config ani --single-pdf", err=True)
+                raise typer.Exit(1)
+            if input_path != '-' and not Path(input_path).exists():
+                typer.echo(f"[!] Chyba: Vstupni soubor '{input_path}' neexistuje", err=True)
+                raise typer.Exit(1)
+        
+        pool_options = dict(suppliers=suppliers, customers=customers, skew=skew)
+        
+        output_sink = None
+        if sink is not None:
+            from utils.sinks import open_sink
+            try:
+                output_sink = open_sink(sink)
+            except ValueError as e:
+                typer.echo(f"[!] Chyba: {e}", err=True)
+                raise typer.Exit(1)
+        
         # Generování
-        typer.echo(f"QR kod: {'ANO' if qr else 'NE'}")
-        typer.echo(f"ISDOC: {'ANO' if isdoc else 'NE'}")
-        typer.echo(f"Sablona: {template}")
-        typer.echo(f"Pocet: {count}")
-        typer.echo(f"Vystup: {output_dir}\n")
-        
-        if count == 1:
-            result = generator.generate_invoice(invoice=invoice, template=template, with_qr=qr, with_isdoc=isdoc)
+        typer.echo(f"QR kod: {'ANO' if qr else 'NE'}", err=to_stderr)
+        typer.echo(f"ISDOC: {'ANO' if isdoc else 'NE'}", err=to_stderr)
+        typer.echo(f"Sablona: {template}", err=to_stderr)
+        typer.echo(f"Profil: {profile or 'auto'}", err=to_stderr)
+        if input_path is not None:
+            typer.echo(f"Vstup: {input_path}", err=to_stderr)
+        else:
+            typer.echo(f"Pocet: {count}", err=to_stderr)
+        if seed is not None:
+            typer.echo(f"Seed: {seed}", err=to_stderr)
+        if workers > 1:
+            typer.echo(f"Procesy: {workers}", err=to_stderr)
+        typer.echo(f"Vystup: {output_sink if output_sink is not None else output_dir}\n", err=to_stderr)
+        
+        if page_index and not single_pdf:
+            typer.echo("[WARN] --page-index ma vyznam jen s --single-pdf", err=True)
+        
+        if input_path is not None:
+            def render_input(target_sink):
+                return generator.generate_from_input(input_path, template=template, with_qr=qr,
+                                                     with_isdoc=isdoc, workers=workers,
+                                                     qr_backend=qr_backend, sink=target_sink,
+                                                     seed=seed, profile=profile, **pool_options)
+            
+            if output_sink is not None:
+                with output_sink:
+                    stats = render_input(output_sink)
+            else:
+                stats = render_input(None)
+            
+            typer.echo(f"\n[OK] Vygenerovano {stats['generated']}/{stats['records']} faktur "
+                       f"({stats['errors']} chyb)!", err=to_stderr)
+        elif single_pdf:
+            if workers > 1:
+                typer.echo("[WARN] Jedno PDF se vykresluje v jednom procesu, --workers se ignoruje",
+                           err=True)
+            
+            def render_single(target_sink):
+                return generator.generate_single_pdf(count, template=template, with_qr=qr,
+                                                     with_isdoc=isdoc, config=prototype,
+                                                     qr_backend=qr_backend, sink=target_sink,
+                                                     write_index=page_index, seed=seed,
+                                                     profile=profile, **pool_options)
+            
+            if output_sink is not None:
+                with output_sink:
+                    result = render_single(output_sink)
+            else:
+                result = render_single(None)
+            
+            typer.echo(f"\n[OK] Vygenerovano {result['invoices']}/{count} faktur "
+                       f"do jednoho PDF ({result['pages']} stran)!", err=to_stderr)
+            typer.echo(f"     PDF: {result['pdf']}", err=to_stderr)
+            if 'index' in result:
+                typer.echo(f"     INDEX: {result['index']}", err=to_stderr)
+        elif output_sink is not None:
+            # Sink zpracuje i jedinou fakturu - vše jde přes dávku
+            with output_sink:
+                results = generator.generate_batch(count, template=template, with_qr=qr,
+                                                   with_isdoc=isdoc, workers=workers,
+                                                   config=prototype, qr_backend=qr_backend,
+                                                   sink=output_sink, seed=seed,
+                                                   profile=profile, **pool_options)
+            typer.echo(f"\n[OK] Vygenerovano {len(results)}/{count} faktur!", err=to_stderr)
+        elif count == 1:
+            # Jediná faktura se připraví stejně jako faktura #0 dávky (seed, zásoby firem)
+            invoice = generator.prepare_invoice(0, config=prototype, seed=seed, **pool_options)
+            result = generator.generate_invoice(invoice=invoice, template=template, with_qr=qr,
+                                                with_isdoc=isdoc, qr_backend=qr_backend,
+                                                invariant=seed is not None, profile=profile)
             typer.echo("\n[OK] Faktura vygenerovana!")
             for file_type, file_path in result.items():
                 typer.echo(f"     {file_type.upper()}: {file_path}")
@@ -85,23 +233,14 @@ def generate(
             
             
             if config:
-                 typer.echo("[WARN] Batch generovani s configem pouzije stejna data pro vsechny faktury.")
+                 typer.echo("[WARN] Batch generovani s configem pouzije stejna data pro vsechny faktury "
+                            "(chybejici udaje se losuji pro kazdou fakturu).")
                  
-            results = []
-            print(f"Generuji {count} faktur (QR={qr}, ISDOC={isdoc}) se šablonou '{template}'...")
-            
-            for i in range(count):
-                try:
-                    current_invoice = None
-                    if config:
-                         # Pokaždé načteme znovu, abychom neměli sdílené reference
-                         current_invoice = data_utils.load_from_json(config)
-
-                    result = generator.generate_invoice(invoice=current_invoice, template=template, with_qr=qr, with_isdoc=isdoc)
-                    results.append(result)
-                    print(f"  [{i+1}/{count}] Vygenerováno: {result.get('pdf', 'N/A')}")
-                except Exception as e:
-                    print(f"  [{i+1}/{count}] Chyba: {e}")
+            # Každá faktura dostane vlastní kopii dat z prototypu konfigurace
+            results = generator.generate_batch(count, template=template, with_qr=qr,
+                                               with_isdoc=isdoc, workers=workers,
+                                               config=prototype, qr_backend=qr_backend,
+                                               seed=seed, profile=profile, **pool_options)
             
             typer.echo(f"\n[OK] Vygenerovano {len(results)}/{count} faktur!")
         
@@ -2,7 +2,8 @@
 
 from .company import Company
 from .item import Item
+from .item_columns import ItemColumns
 from .invoice import Invoice
 
-__all__ = ['Company', 'Item', 'Invoice']
+__all__ = ['Company', 'Item', 'ItemColumns', 'Invoice']
 
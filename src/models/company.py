@@ -1,10 +1,13 @@
 """Model pro reprezentaci firmy."""
 
+import sys
 from dataclasses import dataclass
 from typing import Optional
 
+import identifiers
 
-@dataclass
+
+@dataclass(slots=True)
 class Company:
     """
     Reprezentuje firmu (dodavatele nebo odběratele).
@@ -21,6 +24,9 @@ class Company:
         bank_name: Název banky
         email: Kontaktní email
         phone: Kontaktní telefon
+    
+    Instance nemají __dict__ (__slots__); země, město, PSČ a banka se
+    internují, protože se napříč firmami opakují.
     """
     name: str
     ico: str
@@ -42,24 +48,30 @@ class Company:
             self._validate_dic()
             if self.iban:
                 self._validate_iban()
+        
+        self.country = sys.intern(self.country)
+        self.city = sys.intern(self.city)
+        self.zip_code = sys.intern(self.zip_code)
+        if self.bank_name:
+            self.bank_name = sys.intern(self.bank_name)
 
     def _validate_ico(self) -> None:
-        """Validuje formát IČO (8 číslic)."""
-        if not self.ico.isdigit() or len(self.ico) != 8:
+        """Validuje IČO (8 číslic s kontrolním součtem modulo 11)."""
+        if not identifiers.validate_ico(self.ico):
             if self.strict_validation:
-                raise ValueError(f"IČO musí být 8místné číslo: {self.ico}")
+                raise ValueError(f"IČO musí být 8místné číslo s platným kontrolním součtem: {self.ico}")
 
     def _validate_dic(self) -> None:
-        """Validuje formát DIČ (CZ + 8-10 číslic)."""
-        if not self.dic.startswith("CZ") or len(self.dic) < 10:
+        """Validuje formát DIČ (CZ + 8-10 číslic, 8místné jako IČO)."""
+        if not identifiers.validate_dic(self.dic):
             if self.strict_validation:
                 raise ValueError(f"DIČ musí začínat CZ a obsahovat 8-10 číslic: {self.dic}")
 
     def _validate_iban(self) -> None:
-        """Validuje formát českého IBAN."""
-        if not self.iban.startswith("CZ") or len(self.iban) != 24:
+        """Validuje český IBAN (24 znaků, kontrolní součet modulo 97)."""
+        if not self.iban.startswith("CZ") or not identifiers.validate_iban(self.iban):
             if self.strict_validation:
-                raise ValueError(f"Český IBAN musí začínat CZ a mít 24 znaků: {self.iban}")
+                raise ValueError(f"Český IBAN musí začínat CZ, mít 24 znaků a platný kontrolní součet: {self.iban}")
 
     def format_address(self) -> str:
         """Vrátí formátovanou adresu na více řádků."""
@@ -1,14 +1,16 @@
 """Model pro fakturu."""
 
+import sys
 from dataclasses import dataclass, field
 from datetime import date, timedelta
-from typing import List
+from typing import Iterator, List, Optional, Union
 
 from .company import Company
 from .item import Item
+from .item_columns import ItemColumns, ItemRow
 
 
-@dataclass
+@dataclass(slots=True)
 class Invoice:
     """
     Reprezentuje fakturu.
@@ -17,17 +19,20 @@ class Invoice:
         invoice_number: Číslo faktury (formát: YYYYMMDD001)
         supplier: Dodavatel (firma vystavující fakturu)
         customer: Odběratel (firma přijímající fakturu)
-        items: Seznam položek na faktuře
+        items: Seznam položek na faktuře (nebo ItemColumns u velmi velkých faktur)
         issue_date: Datum vystavení
         due_date: Datum splatnosti
         variable_symbol: Variabilní symbol pro platbu
         payment_method: Způsob platby (bankovní převod, hotově, atd.)
         note: Poznámka k faktuře
+    
+    Instance nemají __dict__ (__slots__) a texty z malých opakujících se
+    slovníků (způsob platby, měna, poznámka, doložka) se internují.
     """
     invoice_number: str
     supplier: Company
     customer: Company
-    items: List[Item] = field(default_factory=list)
+    items: Union[List[Item], ItemColumns] = field(default_factory=list)
     issue_date: date = field(default_factory=date.today)
     due_date: date = field(default_factory=lambda: date.today() + timedelta(days=14))
     variable_symbol: str = ""
@@ -35,6 +40,8 @@ class Invoice:
     note: str = ""
     assignment_clause: str = ""
     currency: str = "CZK"
+    # Uložené součty (viz _get_totals), nejsou součástí dat faktury
+    _totals: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Inicializace a validace dat."""
@@ -45,23 +52,79 @@ class Invoice:
         if not self.items:
             raise ValueError("Faktura musí obsahovat alespoň jednu položku")
         
+        self.payment_method = sys.intern(self.payment_method)
+        self.currency = sys.intern(self.currency)
+        self.note = sys.intern(self.note)
+        self.assignment_clause = sys.intern(self.assignment_clause)
+        
         if self.due_date < self.issue_date:
             raise ValueError("Datum splatnosti nemůže být před datem vystavení")
 
+    def _get_totals(self) -> tuple:
+        """
+        Vrátí součty faktury, při první potřebě je spočítá jedním průchodem.
+        
+        Uložené součty platí, dokud je seznam položek tentýž objekt se stejnými
+        položkami (porovnává se se snímkem odkazů na položky, takže faktura
+        sdílí seznam s volajícím a pozná i jeho pozdější úpravy) a dokud se
+        nezmění cenové údaje žádné položky (viz Item.revision). Sloupcové
+        položky (ItemColumns) změny počítají samy (ItemColumns.revision)
+        a sčítají celé sloupce najednou.
+        
+        Returns:
+            Trojice (základ, DPH, souhrn DPH podle sazeb)
+        """
+        items = self.items
+        columns = type(items) is ItemColumns
+        
+        # Snímek se se seznamem porovná po prvcích nejdřív podle identity -
+        # u nezměněného seznamu bez volání __eq__ položek
+        cached = self._totals
+        if (cached is not None and cached[0] is items and cached[2] == Item.revision
+                and cached[1] == (items.revision if columns else items)):
+            return cached[3]
+        
+        if columns:
+            totals = items.totals()
+            self._totals = (items, items.revision, Item.revision, totals)
+            return totals
+        
+        total_base = 0
+        total_vat = 0
+        vat_summary = {}
+        for item in items:
+            base = item.quantity * item.unit_price
+            vat = int(base * item.vat_rate / 100)
+            total_base += base
+            total_vat += vat
+            
+            rate_summary = vat_summary.get(item.vat_rate)
+            if rate_summary is None:
+                vat_summary[item.vat_rate] = {'base': base, 'vat': vat, 'total': base + vat}
+            else:
+                rate_summary['base'] += base
+                rate_summary['vat'] += vat
+                rate_summary['total'] += base + vat
+        
+        totals = (total_base, total_vat, vat_summary)
+        self._totals = (items, list(items), Item.revision, totals)
+        return totals
+
     @property
     def total_without_vat(self) -> int:
         """Celková cena bez DPH."""
-        return sum(item.total_price_without_vat for item in self.items)
+        return self._get_totals()[0]
 
     @property
     def total_vat(self) -> int:
         """Celková částka DPH."""
-        return sum(item.vat_amount for item in self.items)
+        return self._get_totals()[1]
 
     @property
     def total_with_vat(self) -> int:
         """Celková cena včetně DPH."""
-        return self.total_without_vat + self.total_vat
+        total_base, total_vat, _ = self._get_totals()
+        return total_base + total_vat
 
     def get_vat_summary(self) -> dict:
         """
@@ -70,22 +133,25 @@ class Invoice:
         Returns:
             Dict s klíči jako sazbami DPH a hodnotami jako tuple (základ, DPH, celkem)
         """
-        vat_summary = {}
+        # Kopie, aby úprava výsledku nepoškodila uložený souhrn
+        return {rate: dict(summary) for rate, summary in self._get_totals()[2].items()}
+
+    def item_rows(self) -> Iterator[ItemRow]:
+        """
+        Vrátí řádky položek pro šablony a ISDOC.
         
-        for item in self.items:
-            rate = item.vat_rate
-            if rate not in vat_summary:
-                vat_summary[rate] = {
-                    'base': 0,
-                    'vat': 0,
-                    'total': 0
-                }
-            
-            vat_summary[rate]['base'] += item.total_price_without_vat
-            vat_summary[rate]['vat'] += item.vat_amount
-            vat_summary[rate]['total'] += item.total_price_with_vat
+        U sloupcových položek se řádky čtou přímo ze sloupců bez vytváření
+        instancí Item.
         
-        return vat_summary
+        Returns:
+            Iterátor n-tic (popis, množství, jednotka, jednotková cena,
+            sazba DPH, základ, DPH, celkem)
+        """
+        if type(self.items) is ItemColumns:
+            return self.items.rows()
+        return ((item.description, item.quantity, item.unit, item.unit_price, item.vat_rate,
+                 item.total_price_without_vat, item.vat_amount, item.total_price_with_vat)
+                for item in self.items)
 
     CURRENCY_SYMBOLS = {
         'CZK': 'Kč',
@@ -1,9 +1,17 @@
 """Model pro položku faktury."""
 
+import sys
 from dataclasses import dataclass
 
 
-@dataclass
+# Atributy, jejichž změna mění součty faktury
+_PRICE_FIELDS = frozenset(('quantity', 'unit_price', 'vat_rate'))
+
+# Textové atributy, které se internují
+_TEXT_FIELDS = frozenset(('description', 'unit'))
+
+
+@dataclass(slots=True, init=False)
 class Item:
     """
     Reprezentuje položku na faktuře (zboží nebo služba).
@@ -14,6 +22,12 @@ class Item:
         unit: Jednotka (ks, hod, m², atd.)
         unit_price: Jednotková cena bez DPH v Kč
         vat_rate: Sazba DPH v procentech (např. 21)
+    
+    Instance nemají __dict__ (__slots__) a popis i jednotka se internují
+    (i při pozdější změně), takže se opakující se texty ve velkých dávkách
+    drží v paměti jen jednou. Změna množství, ceny nebo sazby existující
+    položky zvýší Item.revision, podle kterého faktura zneplatní uložené
+    součty.
     """
     description: str
     quantity: int
@@ -21,6 +35,46 @@ class Item:
     unit_price: int
     vat_rate: int = 21  # Výchozí sazba DPH 21%
 
+    # Počítadlo změn cenových údajů všech položek - podle něj faktura
+    # pozná, že její uložené součty už neplatí (není to pole dataclass)
+    revision = 0
+
+    def __init__(self, description: str, quantity: int, unit: str, unit_price: int,
+                 vat_rate: int = 21):
+        """
+        Validuje a uloží údaje položky.
+        
+        Hodnoty se ukládají přímo (object.__setattr__), takže sestavení
+        položky neprochází __setattr__ a nezvyšuje Item.revision.
+        
+        Raises:
+            ValueError: Při nekladném množství nebo ceně a neplatné sazbě DPH
+        """
+        if quantity <= 0:
+            raise ValueError("Množství musí být kladné číslo")
+        if unit_price <= 0:
+            raise ValueError("Jednotková cena musí být kladné číslo")
+        if vat_rate not in [0, 10, 15, 21]:
+            raise ValueError(f"Neplatná sazba DPH: {vat_rate}%")
+        
+        set_field = object.__setattr__
+        set_field(self, 'description', sys.intern(description))
+        set_field(self, 'quantity', quantity)
+        set_field(self, 'unit', sys.intern(unit))
+        set_field(self, 'unit_price', unit_price)
+        set_field(self, 'vat_rate', vat_rate)
+
+    def __setattr__(self, name, value):
+        if name in _PRICE_FIELDS:
+            Item.revision += 1
+        elif name in _TEXT_FIELDS:
+            value = sys.intern(value)
+        object.__setattr__(self, name, value)
+
+    def __copy__(self) -> 'Item':
+        """Samostatná kopie položky (změny se nepromítnou do originálu)."""
+        return Item(self.description, self.quantity, self.unit, self.unit_price, self.vat_rate)
+
     @property
     def total_price_without_vat(self) -> int:
         """Celková cena bez DPH."""
@@ -35,13 +89,3 @@ class Item:
     def total_price_with_vat(self) -> int:
         """Celková cena včetně DPH."""
         return self.total_price_without_vat + self.vat_amount
-
-    def __post_init__(self):
-        """Validace dat po inicializaci."""
-        if self.quantity <= 0:
-            raise ValueError("Množství musí být kladné číslo")
-        if self.unit_price <= 0:
-            raise ValueError("Jednotková cena musí být kladné číslo")
-        if self.vat_rate not in [0, 10, 15, 21]:
-            raise ValueError(f"Neplatná sazba DPH: {self.vat_rate}%")
-
@@ -0,0 +1,229 @@
+"""Sloupcové úložiště položek faktury pro velmi velké faktury."""
+
+import sys
+from array import array
+from itertools import compress, repeat, tee
+from operator import add, mul, truediv
+from typing import Iterable, Iterator, Tuple
+
+from .item import Item
+
+
+# Řádek položky předávaný šablonám a ISDOC:
+# (popis, množství, jednotka, jednotková cena, sazba DPH, základ, DPH, celkem)
+ItemRow = Tuple[str, int, str, int, int, int, int, int]
+
+
+class ItemColumns:
+    """
+    Položky faktury uložené po sloupcích.
+
+    Náhrada seznamu Item pro faktury s desítkami až stovkami tisíc řádků
+    (vyúčtování služeb, logistika). Množství, ceny a sazby DPH jsou v typových
+    polích (array), popisy a jednotky ve slovníku textů, na který řádky
+    odkazují indexem - opakující se text je v paměti jen jednou a řádek
+    nezabírá žádný objekt Pythonu. Sloupce jsou celočíselné, takže položky
+    s neceločíselným množstvím nebo cenou se drží v seznamu Item (viz fits).
+
+    Součty i souhrn DPH se počítají po celých sloupcích (map/sum), šablony
+    a ISDOC čtou řádky přes rows() jako n-tice, takže se pro jednotlivé
+    řádky nevytvářejí instance Item. Iterace a indexování vrací Item kvůli
+    kompatibilitě, ale položky se přitom sestavují za běhu - jsou to kopie,
+    takže se jejich změny do sloupců nepromítnou.
+
+    Attributes:
+        quantities: Množství (array 'q')
+        unit_prices: Jednotkové ceny bez DPH (array 'q')
+        vat_rates: Sazby DPH v procentech (array 'b')
+        description_ids: Indexy popisů do slovníku textů (array 'I')
+        unit_ids: Indexy jednotek do slovníku textů (array 'I')
+        revision: Počítadlo změn (viz Invoice._get_totals)
+    """
+
+    __slots__ = ('quantities', 'unit_prices', 'vat_rates', 'description_ids', 'unit_ids',
+                 '_texts', '_text_ids', 'revision')
+
+    def __init__(self, items: Iterable[Item] = ()):
+        """
+        Args:
+            items: Počáteční položky
+        """
+        self.quantities = array('q')
+        self.unit_prices = array('q')
+        self.vat_rates = array('b')
+        self.description_ids = array('I')
+        self.unit_ids = array('I')
+        self._texts = []
+        self._text_ids = {}
+        self.revision = 0
+        self.extend(items)
+
+    @staticmethod
+    def fits(records: Iterable[dict]) -> bool:
+        """
+        Zjistí, zda lze položky uložit po sloupcích.
+
+        Args:
+            records: Slovníky položek (formát JSON konfigurace)
+
+        Returns:
+            True, pokud mají všechny položky celočíselné množství, cenu
+            i sazbu DPH
+        """
+        return all(type(record.get('quantity')) is int
+                   and type(record.get('unit_price')) is int
+                   and type(record.get('vat_rate', 21)) is int
+                   for record in records)
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> 'ItemColumns':
+        """
+        Sestaví sloupce ze slovníků položek (formát JSON konfigurace).
+
+        Args:
+            records: Slovníky s klíči description, quantity, unit, unit_price
+                a volitelně vat_rate
+
+        Returns:
+            Nová instance ItemColumns
+
+        Raises:
+            ValueError: Pokud položka nemá platné hodnoty
+        """
+        columns = cls()
+        for record in records:
+            columns.add(**record)
+        return columns
+
+    def add(self, description: str, quantity: int, unit: str, unit_price: int,
+            vat_rate: int = 21):
+        """
+        Přidá řádek se stejnou validací jako Item.
+
+        Raises:
+            ValueError: Pokud řádek nemá platné hodnoty nebo množství, cena
+                či sazba DPH nejsou celá čísla
+        """
+        if type(quantity) is not int or type(unit_price) is not int or type(vat_rate) is not int:
+            raise ValueError("Sloupcové položky vyžadují celočíselné množství, cenu i sazbu DPH")
+        if quantity <= 0:
+            raise ValueError("Množství musí být kladné číslo")
+        if unit_price <= 0:
+            raise ValueError("Jednotková cena musí být kladné číslo")
+        if vat_rate not in [0, 10, 15, 21]:
+            raise ValueError(f"Neplatná sazba DPH: {vat_rate}%")
+
+        self._append(description, quantity, unit, unit_price, vat_rate)
+
+    def append(self, item: Item):
+        """Přidá položku (Item je validovaná už při vytvoření)."""
+        self._append(item.description, item.quantity, item.unit, item.unit_price, item.vat_rate)
+
+    def extend(self, items: Iterable[Item]):
+        """Přidá položky."""
+        for item in items:
+            self._append(item.description, item.quantity, item.unit, item.unit_price,
+                         item.vat_rate)
+
+    def _append(self, description: str, quantity: int, unit: str, unit_price: int,
+                vat_rate: int):
+        self.quantities.append(quantity)
+        self.unit_prices.append(unit_price)
+        self.vat_rates.append(vat_rate)
+        self.description_ids.append(self._text_id(description))
+        self.unit_ids.append(self._text_id(unit))
+        self.revision += 1
+
+    def _text_id(self, text: str) -> int:
+        """Vrátí index textu ve slovníku textů, nový text přidá."""
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            text_id = self._text_ids[text] = len(self._texts)
+            self._texts.append(sys.intern(text))
+        return text_id
+
+    def copy(self) -> 'ItemColumns':
+        """Vrátí nezávislou kopii (pole se kopírují vcelku)."""
+        columns = ItemColumns.__new__(ItemColumns)
+        columns.quantities = array('q', self.quantities)
+        columns.unit_prices = array('q', self.unit_prices)
+        columns.vat_rates = array('b', self.vat_rates)
+        columns.description_ids = array('I', self.description_ids)
+        columns.unit_ids = array('I', self.unit_ids)
+        columns._texts = list(self._texts)
+        columns._text_ids = dict(self._text_ids)
+        columns.revision = 0
+        return columns
+
+    def bases(self) -> list:
+        """Základy DPH všech řádků (množství * jednotková cena)."""
+        return list(map(mul, self.quantities, self.unit_prices))
+
+    def totals(self) -> tuple:
+        """
+        Spočítá součty po celých sloupcích.
+
+        Returns:
+            Trojice (základ, DPH, souhrn DPH podle sazeb) ve stejném tvaru
+            jako Invoice._get_totals
+        """
+        bases = self.bases()
+        rates = self.vat_rates.tobytes()
+
+        total_vat = 0
+        vat_summary = {}
+        # Sazeb je jen několik (souhrn je v pořadí prvního výskytu) - řádky
+        # každé sazby se vyberou maskou z bytes.translate
+        for rate in sorted(set(rates), key=lambda rate: rates.find(rate)):
+            table = bytearray(256)
+            table[rate] = 1
+            rate_bases = list(compress(bases, rates.translate(table)))
+            base = sum(rate_bases)
+            vat = sum(map(int, map(truediv, map(mul, rate_bases, repeat(rate)), repeat(100))))
+            total_vat += vat
+            vat_summary[rate] = {'base': base, 'vat': vat, 'total': base + vat}
+
+        return sum(bases), total_vat, vat_summary
+
+    def rows(self) -> Iterator[ItemRow]:
+        """
+        Vrátí řádky jako n-tice bez vytváření instancí Item.
+
+        Řádky se počítají líně, takže procházení nezabere paměť úměrnou
+        počtu řádků.
+
+        Returns:
+            Iterátor n-tic (popis, množství, jednotka, jednotková cena,
+            sazba DPH, základ, DPH, celkem)
+        """
+        bases, vat_bases, total_bases = tee(map(mul, self.quantities, self.unit_prices), 3)
+        vats, total_vats = tee(map(int, map(truediv, map(mul, vat_bases, self.vat_rates),
+                                            repeat(100))))
+        texts = self._texts.__getitem__
+        return zip(map(texts, self.description_ids), self.quantities,
+                   map(texts, self.unit_ids), self.unit_prices, self.vat_rates,
+                   bases, vats, map(add, total_bases, total_vats))
+
+    def __len__(self) -> int:
+        return len(self.quantities)
+
+    def __getitem__(self, index: int) -> Item:
+        return Item(self._texts[self.description_ids[index]], self.quantities[index],
+                    self._texts[self.unit_ids[index]], self.unit_prices[index],
+                    self.vat_rates[index])
+
+    def __iter__(self) -> Iterator[Item]:
+        texts = self._texts
+        for description_id, quantity, unit_id, unit_price, vat_rate in zip(
+                self.description_ids, self.quantities, self.unit_ids, self.unit_prices,
+                self.vat_rates):
+            yield Item(texts[description_id], quantity, texts[unit_id], unit_price, vat_rate)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ItemColumns):
+            return NotImplemented
+        return (len(self) == len(other)
+                and all(a == b for a, b in zip(self.rows(), other.rows())))
+
+    def __repr__(self) -> str:
+        return f"ItemColumns({len(self)} položek)"
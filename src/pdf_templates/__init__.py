@@ -1,11 +1,28 @@
-"""PDF šablony pro generování faktur."""
+"""PDF šablony pro generování faktur.
 
-from .classic import ClassicTemplate
-from .modern import ModernTemplate
-from .minimal import MinimalTemplate
+Moduly šablon (a s nimi reportlab) se importují až při prvním použití,
+aby import balíčku nezdržoval start CLI.
+"""
+
+from importlib import import_module
 
 __all__ = ['ClassicTemplate', 'ModernTemplate', 'MinimalTemplate']
 
+# Název šablony -> (modul, třída)
+_TEMPLATES = {
+    'classic': ('.classic', 'ClassicTemplate'),
+    'modern': ('.modern', 'ModernTemplate'),
+    'minimal': ('.minimal', 'MinimalTemplate'),
+}
+
+
+def __getattr__(name: str):
+    """Líný přístup k třídám šablon (from pdf_templates import ClassicTemplate)."""
+    for module_name, class_name in _TEMPLATES.values():
+        if class_name == name:
+            return getattr(import_module(module_name, __name__), class_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def get_template(template_name: str):
     """
@@ -20,14 +37,8 @@ def get_template(template_name: str):
     Raises:
         ValueError: Pokud šablona neexistuje
     """
-    templates = {
-        'classic': ClassicTemplate,
-        'modern': ModernTemplate,
-        'minimal': MinimalTemplate
-    }
-    
-    if template_name not in templates:
-        raise ValueError(f"Neznámá šablona: {template_name}. Dostupné: {', '.join(templates.keys())}")
+    if template_name not in _TEMPLATES:
+        raise ValueError(f"Neznámá šablona: {template_name}. Dostupné: {', '.join(_TEMPLATES.keys())}")
     
-    return templates[template_name]
-
+    module_name, class_name = _TEMPLATES[template_name]
+    return getattr(import_module(module_name, __name__), class_name)
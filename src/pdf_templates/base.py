@@ -1,14 +1,202 @@
 """Základní třída pro PDF šablony."""
 
+import zlib
 from abc import ABC, abstractmethod
+from io import BytesIO
+from typing import BinaryIO, Iterable, List, Optional, Union
+
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase import pdfdoc, pdfmetrics
 from reportlab.lib import colors
 
 from models.invoice import Invoice
+from models.item_columns import ItemRow
+from .font_cache import load_ttfont
+from .profiles import OutputProfile, get_output_profile, pack_object_streams
+
+
+# Názvy fontů (regular, bold) zaregistrovaných v tomto procesu
+_registered_fonts = None
+
+# Od tohoto počtu položek se faktura bez zvoleného profilu komprimuje
+# profilem 'balanced' (viz BaseTemplate.generate)
+COMPRESS_FROM_ITEMS = 1000
+
+# Horní okraj bloku s QR kódem (viz QRGenerator.draw_payment_block), řádky
+# položek na stránce s QR kódem končí nad ním
+QR_BLOCK_TOP = 80 * mm
+
+
+def _discover_and_register_fonts() -> tuple:
+    """
+    Najde a zaregistruje fonty DejaVu Sans v reportlabu.
+    
+    Returns:
+        Dvojice názvů fontů (regular, bold); při chybě Helvetica
+    """
+    import os
+    
+    # Určení cesty k fontům
+    # Pokud je spuštěno z src/, použij fonts/
+    # Pokud z root, použij src/fonts/
+    possible_paths = [
+        'fonts/DejaVuSans.ttf',  # Spuštěno z src/
+        'src/fonts/DejaVuSans.ttf',  # Spuštěno z root
+        os.path.join(os.path.dirname(__file__), '..', 'fonts', 'DejaVuSans.ttf'),  # Relativní k tomuto souboru
+    ]
+    
+    font_path_regular = None
+    font_path_bold = None
+    
+    # Najdi existující cestu
+    for path in possible_paths:
+        if os.path.exists(path):
+            font_path_regular = path
+            font_path_bold = path.replace('DejaVuSans.ttf', 'DejaVuSans-Bold.ttf')
+            break
+    
+    if font_path_regular and os.path.exists(font_path_regular):
+        try:
+            # Registrace DejaVu Sans s českou diakritikou
+            # Zparsované tabulky fontů se berou z diskového cache, pokud existuje
+            pdfmetrics.registerFont(load_ttfont('DejaVuSans', font_path_regular))
+            if os.path.exists(font_path_bold):
+                pdfmetrics.registerFont(load_ttfont('DejaVuSans-Bold', font_path_bold))
+            
+            return 'DejaVuSans', 'DejaVuSans-Bold'
+        except Exception as e:
+            print(f"[WARN] Chyba při registraci fontu: {e}")
+            print("[WARN] Používám výchozí font Helvetica (bez české diakritiky)")
+    else:
+        print("[WARN] DejaVu Sans font nebyl nalezen!")
+        print("[WARN] Hledáno v:")
+        for path in possible_paths:
+            print(f"        - {path}")
+        print("[WARN] Používám výchozí font Helvetica (bez české diakritiky)")
+    
+    return 'Helvetica', 'Helvetica-Bold'
+
+
+class InvoiceCanvas(canvas.Canvas):
+    """
+    Canvas, který umí dokreslit obsah těsně před uzavřením stránky.
+    
+    Překryvy (např. QR kód) se tak vykreslí nad obsahem šablony ve stejném
+    průchodu, bez dodatečného slučování PDF.
+    
+    Komprese proudů se řídí výstupním profilem (viz profiles.OutputProfile):
+    filtry profilu se nastaví dokumentu jako výchozí, takže platí pro
+    stránky, fonty i formuláře a nezávisí na globálním rl_config.
+    """
+    
+    def __init__(self, filename: Union[str, BinaryIO], *args,
+                 profile: Optional[OutputProfile] = None, **kwargs):
+        """
+        Args:
+            filename: Cesta k výstupnímu souboru nebo binární proud
+            profile: Výstupní profil (None = výchozí profil)
+            *args, **kwargs: Argumenty canvas.Canvas (pageCompression se nepoužívá)
+        """
+        kwargs['pageCompression'] = 0
+        super().__init__(filename, *args, **kwargs)
+        self.output = filename
+        self.profile = profile or get_output_profile()
+        self._doc.defaultStreamFilters = self.profile.stream_filters
+        self.page_overlays = {}
+        self.attachments = {}
+        # Statické části šablony už vykreslené v dokumentu (viz BaseTemplate.draw_static)
+        self.static_parts = set()
+    
+    def add_page_overlay(self, page_number: int, draw_func):
+        """
+        Zaregistruje funkci, která se zavolá před uzavřením dané stránky.
+        
+        Args:
+            page_number: Číslo stránky (od 1)
+            draw_func: Funkce přijímající canvas
+        """
+        self.page_overlays.setdefault(page_number, []).append(draw_func)
+    
+    def attach_file(self, filename: str, data: bytes, subtype: str = 'text#2Fxml'):
+        """
+        Vloží soubor do PDF jako přílohu (embedded file), komprimovaně.
+        
+        Přílohy se komprimují ve všech profilech (XML se komprimuje levně),
+        úroveň komprese určuje profil.
+        
+        Args:
+            filename: Název přílohy v PDF
+            data: Obsah souboru
+            subtype: MIME typ jako PDF jméno (lomítko zapsané jako #2F)
+        """
+        level = self.profile.compression_level
+        stream = pdfdoc.PDFStream(
+            pdfdoc.PDFDictionary({
+                'Type': pdfdoc.PDFName('EmbeddedFile'),
+                'Subtype': '/' + subtype,
+                'Params': pdfdoc.PDFDictionary({'Size': len(data)}),
+                'Filter': pdfdoc.PDFName('FlateDecode'),
+            }),
+            zlib.compress(data, zlib.Z_DEFAULT_COMPRESSION if level is None else level),
+        )
+        filespec = pdfdoc.PDFDictionary({
+            'Type': pdfdoc.PDFName('Filespec'),
+            'F': pdfdoc.PDFString(filename),
+            'UF': pdfdoc.PDFString(filename),
+            'EF': pdfdoc.PDFDictionary({'F': self._doc.Reference(stream)}),
+        })
+        self.attachments[filename] = self._doc.Reference(filespec)
+    
+    def showPage(self):
+        for draw_func in self.page_overlays.pop(self.getPageNumber(), ()):
+            draw_func(self)
+        super().showPage()
+        
+        if self._doc.defaultStreamFilters:
+            self._encode_last_page()
+    
+    def _encode_last_page(self):
+        """
+        Zakóduje obsah právě uzavřené stránky hned, ne až při uložení.
+        
+        Reportlab drží do uložení dokumentu obsah všech stránek jako text.
+        U faktur s tisíci stránkami tak dokument v paměti zabírá jen
+        komprimované stránky; výsledné PDF je bajtově stejné.
+        """
+        page = self._doc.Pages.pages[-1]
+        filters = self._doc.defaultStreamFilters
+        
+        content = page.stream
+        for stream_filter in reversed(filters):
+            content = stream_filter.encode(content)
+        
+        page.Contents = pdfdoc.PDFStream(pdfdoc.PDFDictionary({
+            'Filter': pdfdoc.PDFArray([pdfdoc.PDFName(f.pdfname) for f in filters]),
+        }), content)
+        page.stream = None
+    
+    def save(self):
+        if self.attachments:
+            # Strom jmen musí být seřazený podle klíčů
+            names = []
+            for filename in sorted(self.attachments):
+                names.extend([pdfdoc.PDFString(filename), self.attachments[filename]])
+            self._doc.Catalog.Names = pdfdoc.PDFDictionary({
+                'EmbeddedFiles': pdfdoc.PDFDictionary({'Names': pdfdoc.PDFArray(names)})
+            })
+        if not self.profile.object_streams:
+            super().save()
+            return
+        
+        # Reportlab proudy objektů nezapisuje - hotový dokument se přebalí
+        data = pack_object_streams(self.getpdfdata(), self.profile.compression_level)
+        if hasattr(self.output, 'write'):
+            self.output.write(data)
+        else:
+            with open(self.output, 'wb') as f:
+                f.write(data)
 
 
 class BaseTemplate(ABC):
@@ -16,64 +204,48 @@ class BaseTemplate(ABC):
     Abstraktní základní třída pro všechny PDF šablony.
     
     Definuje společné metody a rozhraní pro generování PDF faktur.
+    
+    Tabulku položek stránkuje společně draw_items: šablona dodá jen
+    hlavičku tabulky (draw_table_header) a vykreslení řádku (draw_item_row).
+    Části šablony, které nezávisí na datech faktury, kreslí přes draw_static.
     """
     
+    # Výška řádku položky
+    row_height = 5 * mm
+    # Řádky položek se kreslí jen nad touto hranicí, pod ní je průběžný součet
+    table_bottom = 50 * mm
+    # Patička faktury (součty, platební údaje) musí končit nad touto hranicí
+    # (na stránce s QR kódem nad QR_BLOCK_TOP)
+    footer_bottom = 30 * mm
+    # Výška patičky bez souhrnu DPH, poznámky a doložky (viz get_footer_height)
+    footer_height = 40 * mm
+    # Výška jedné sazby v souhrnu DPH a poznámky v patičce
+    footer_rate_height = 9 * mm
+    footer_note_height = 12 * mm
+    
     def __init__(self):
         """Inicializace šablony."""
         self.page_width, self.page_height = A4
         self.margin = 20 * mm
         self.current_y = self.page_height - self.margin
+        self.qr_page = None
         
         # Registrace fontu s podporou diakritiky
         self._register_fonts()
     
     def _register_fonts(self):
-        """Registruje fonty s podporou české diakritiky."""
-        import os
-        import sys
-        
-        # Určení cesty k fontům
-        # Pokud je spuštěno z src/, použij fonts/
-        # Pokud z root, použij src/fonts/
-        possible_paths = [
-            'fonts/DejaVuSans.ttf',  # Spuštěno z src/
-            'src/fonts/DejaVuSans.ttf',  # Spuštěno z root
-            os.path.join(os.path.dirname(__file__), '..', 'fonts', 'DejaVuSans.ttf'),  # Relativní k tomuto souboru
-        ]
-        
-        font_path_regular = None
-        font_path_bold = None
-        
-        # Najdi existující cestu
-        for path in possible_paths:
-            if os.path.exists(path):
-                font_path_regular = path
-                font_path_bold = path.replace('DejaVuSans.ttf', 'DejaVuSans-Bold.ttf')
-                break
-        
-        if font_path_regular and os.path.exists(font_path_regular):
-            try:
-                # Registrace DejaVu Sans s českou diakritikou
-                pdfmetrics.registerFont(TTFont('DejaVuSans', font_path_regular))
-                if os.path.exists(font_path_bold):
-                    pdfmetrics.registerFont(TTFont('DejaVuSans-Bold', font_path_bold))
-                
-                self.font_regular = 'DejaVuSans'
-                self.font_bold = 'DejaVuSans-Bold'
-                print(f"[OK] Font DejaVu Sans úspěšně zaregistrován: {font_path_regular}")
-            except Exception as e:
-                print(f"[WARN] Chyba při registraci fontu: {e}")
-                print("[WARN] Používám výchozí font Helvetica (bez české diakritiky)")
-                self.font_regular = 'Helvetica'
-                self.font_bold = 'Helvetica-Bold'
-        else:
-            print("[WARN] DejaVu Sans font nebyl nalezen!")
-            print("[WARN] Hledáno v:")
-            for path in possible_paths:
-                print(f"        - {path}")
-            print("[WARN] Používám výchozí font Helvetica (bez české diakritiky)")
-            self.font_regular = 'Helvetica'
-            self.font_bold = 'Helvetica-Bold'
+        """
+        Nastaví fonty s podporou české diakritiky.
+        
+        Vyhledání a registrace fontů proběhne jen jednou za proces, další
+        instance šablon převezmou už zaregistrované řezy.
+        """
+        global _registered_fonts
+        
+        if _registered_fonts is None:
+            _registered_fonts = _discover_and_register_fonts()
+        
+        self.font_regular, self.font_bold = _registered_fonts
     
     @abstractmethod
     def get_colors(self) -> dict:
@@ -107,6 +279,37 @@ class BaseTemplate(ABC):
         """
         pass
     
+    @abstractmethod
+    def draw_table_header(self, c: canvas.Canvas, y_pos: float) -> float:
+        """
+        Vykreslí hlavičku tabulky položek a nastaví písmo řádků.
+        
+        Volá se na první stránce tabulky i na každé další.
+        
+        Args:
+            c: Canvas objekt
+            y_pos: Y souřadnice horního okraje hlavičky
+            
+        Returns:
+            Y souřadnice prvního řádku položek
+        """
+        pass
+    
+    @abstractmethod
+    def draw_item_row(self, c: canvas.Canvas, invoice: Invoice, row: ItemRow,
+                      index: int, y_pos: float):
+        """
+        Vykreslí jeden řádek položky.
+        
+        Args:
+            c: Canvas objekt
+            invoice: Instance faktury (formátování cen)
+            row: Řádek z Invoice.item_rows()
+            index: Pořadí řádku v tabulce (od 0)
+            y_pos: Y souřadnice řádku
+        """
+        pass
+    
     @abstractmethod
     def draw_footer(self, c: canvas.Canvas, invoice: Invoice):
         """
@@ -118,28 +321,289 @@ class BaseTemplate(ABC):
         """
         pass
     
-    def generate(self, invoice: Invoice, output_path: str):
+    def generate(self, invoice: Invoice, output_path: Union[str, BinaryIO], with_qr: bool = False,
+                 with_isdoc: bool = False, isdoc_xml: Optional[bytes] = None,
+                 qr_backend: Optional[str] = None, invariant: bool = False,
+                 profile: Optional[str] = None):
         """
         Hlavní metoda pro generování PDF.
         
         Args:
             invoice: Instance faktury
-            output_path: Cesta k výstupnímu souboru
+            output_path: Cesta k výstupnímu souboru nebo binární proud (soubor, BytesIO)
+            with_qr: Zda vykreslit platební QR kód na první stránku
+            with_isdoc: Zda vložit ISDOC XML jako přílohu PDF
+            isdoc_xml: Předem vygenerované ISDOC XML (implikuje vložení přílohy)
+            qr_backend: Způsob vykreslení QR kódu ('vector' nebo 'raster')
+            invariant: Zda vynechat časové údaje (datum vytvoření, ID dokumentu),
+                aby stejná faktura dala bajtově shodné PDF
+            profile: Výstupní profil ('fast', 'balanced', 'smallest'; None = výchozí,
+                od COMPRESS_FROM_ITEMS položek 'balanced')
         """
-        c = canvas.Canvas(output_path, pagesize=A4, pageCompression=0)
+        output_profile = get_output_profile(profile)
+        # Bez zvoleného profilu se velmi dlouhé faktury komprimují, aby dokument
+        # v paměti zůstal malý; výslovně zvolený profil (i 'fast') se dodrží
+        if (profile is None and output_profile.compression_level is None
+                and len(invoice.items) >= COMPRESS_FROM_ITEMS):
+            output_profile = get_output_profile('balanced')
+        c = InvoiceCanvas(output_path, pagesize=A4, profile=output_profile,
+                          invariant=int(invariant))
         
         # Metadata PDF
         c.setAuthor(invoice.supplier.name)
         c.setTitle(f"Faktura {invoice.invoice_number}")
         c.setSubject("Faktura - daňový doklad")
         
+        # ISDOC příloha se zapíše spolu s PDF, bez dalšího přepisování souboru
+        if with_isdoc and isdoc_xml is None:
+            from isdoc_generator import ISDOCGenerator
+            isdoc_xml = ISDOCGenerator.to_bytes(invoice, invariant=invariant)
+        if isdoc_xml is not None:
+            c.attach_file('isdoc.xml', isdoc_xml)
+        
+        self.draw_invoice(c, invoice, with_qr=with_qr, qr_backend=qr_backend)
+        c.save()
+    
+    def generate_document(self, invoices: Iterable[Invoice], output_path: Union[str, BinaryIO],
+                          with_qr: bool = False, with_isdoc: bool = False,
+                          qr_backend: Optional[str] = None, invariant: bool = False,
+                          profile: Optional[str] = None) -> List[dict]:
+        """
+        Vykreslí více faktur do jednoho PDF dokumentu.
+        
+        Fonty a další zdroje se do dokumentu vloží jen jednou, každá faktura
+        začíná na nové stránce a má vlastní záložku v osnově dokumentu.
+        
+        Args:
+            invoices: Faktury k vykreslení (může být i generátor)
+            output_path: Cesta k výstupnímu souboru nebo binární proud
+            with_qr: Zda vykreslit platební QR kód na první stránku každé faktury
+            with_isdoc: Zda vložit ISDOC XML každé faktury jako přílohu
+            qr_backend: Způsob vykreslení QR kódu ('vector' nebo 'raster')
+            invariant: Zda vynechat časové údaje, aby výstup byl reprodukovatelný
+            profile: Výstupní profil ('fast', 'balanced', 'smallest'; None = výchozí)
+            
+        Returns:
+            Index stránek - seznam slovníků s klíči 'invoice_number',
+            'first_page' a 'last_page' (stránky číslované od 1)
+        """
+        c = InvoiceCanvas(output_path, pagesize=A4, profile=get_output_profile(profile),
+                          invariant=int(invariant))
+        c.setTitle("Faktury")
+        c.setSubject("Faktury - daňové doklady")
+        
+        page_index = []
+        for position, invoice in enumerate(invoices, start=1):
+            bookmark = f"invoice{position}"
+            c.bookmarkPage(bookmark)
+            c.addOutlineEntry(f"Faktura {invoice.invoice_number}", bookmark, level=0)
+            
+            if with_isdoc:
+                from isdoc_generator import ISDOCGenerator
+                filename = f"isdoc_{invoice.invoice_number}.xml".replace("/", "_").replace(" ", "_")
+                if filename in c.attachments:
+                    filename = filename.replace('.xml', f"_{position}.xml")
+                c.attach_file(filename, ISDOCGenerator.to_bytes(invoice, invariant=invariant))
+            
+            first_page, last_page = self.draw_invoice(c, invoice, with_qr=with_qr,
+                                                      qr_backend=qr_backend)
+            page_index.append({
+                'invoice_number': invoice.invoice_number,
+                'first_page': first_page,
+                'last_page': last_page,
+            })
+        
+        c.save()
+        return page_index
+    
+    def draw_invoice(self, c: canvas.Canvas, invoice: Invoice, with_qr: bool = False,
+                     qr_backend: Optional[str] = None) -> tuple:
+        """
+        Vykreslí jednu fakturu od aktuální stránky a poslední stránku uzavře.
+        
+        Args:
+            c: Canvas objekt (InvoiceCanvas kvůli překryvu s QR kódem)
+            invoice: Instance faktury
+            with_qr: Zda vykreslit platební QR kód na první stránku faktury
+            qr_backend: Způsob vykreslení QR kódu ('vector' nebo 'raster')
+            
+        Returns:
+            Dvojice (první stránka, poslední stránka) faktury
+        """
+        first_page = c.getPageNumber()
+        self.current_y = self.page_height - self.margin
+        self.qr_page = None
+        
+        # QR kód se kreslí nad obsah první stránky při jejím uzavření
+        if with_qr:
+            self.qr_page = first_page
+            c.add_page_overlay(first_page,
+                               lambda c_: self.draw_qr(c_, invoice, backend=qr_backend))
+        
         # Vykreslení sekcí
         self.draw_header(c, invoice)
         self.draw_body(c, invoice)
+        
+        # Patička se nedělí - když se pod tabulku nevejde (na stránce s QR
+        # kódem nad QR_BLOCK_TOP), začne na nové stránce
+        bottom = QR_BLOCK_TOP if c.getPageNumber() == self.qr_page else self.footer_bottom
+        if self.current_y - self.get_footer_height(invoice) < bottom:
+            c.showPage()
+            self.current_y = self.page_height - self.margin
+        
         self.draw_footer(c, invoice)
         
+        last_page = c.getPageNumber()
         c.showPage()
-        c.save()
+        return first_page, last_page
+    
+    def draw_static(self, c: canvas.Canvas, name: str, draw_func, y: float = 0):
+        """
+        Vykreslí statickou část šablony (pruhy, rámečky, popisky).
+        
+        Statická část nezávisí na datech faktury. Poprvé se v dokumentu
+        nakreslí přímo do stránky, při druhém použití se zachytí jako Form
+        XObject a další stránky a faktury ve stejném dokumentu na něj jen
+        odkazují - ušetří se volání kreslicích metod i velikost PDF, přitom
+        jednostránková faktura nenese režii formuláře.
+        
+        Args:
+            c: InvoiceCanvas
+            name: Krátký název statické části (jedinečný v rámci šablony)
+            draw_func: Funkce přijímající canvas, která část vykreslí
+            y: Svislý posun - draw_func kreslí vůči y = 0 a část se
+               umístí na y (0 = absolutní souřadnice stránky)
+        """
+        # Krátký název - opakuje se ve zdrojích každé stránky
+        form_name = f"{type(self).__name__[:3]}{name}"
+        
+        if not c.hasForm(form_name) and form_name in c.static_parts:
+            # Rámeček formuláře sahá i pod počátek kvůli posunutým částem
+            c.beginForm(form_name, lowery=-self.page_height)
+            draw_func(c)
+            c.endForm()
+        
+        # Stav kreslení (písmo, barvy) se obnoví stejně jako po formuláři
+        c.saveState()
+        if y:
+            c.translate(0, y)
+        if c.hasForm(form_name):
+            c.doForm(form_name)
+        else:
+            c.static_parts.add(form_name)
+            draw_func(c)
+        c.restoreState()
+    
+    def draw_items(self, c: canvas.Canvas, invoice: Invoice, y_pos: float) -> float:
+        """
+        Vykreslí tabulku položek přes libovolný počet stránek.
+        
+        Řádky se čtou proudově z Invoice.item_rows(), takže paměť nezávisí na
+        počtu položek. Když další řádek nevejde nad table_bottom (na stránce
+        s QR kódem nad QR_BLOCK_TOP), vypíše se průběžný součet, stránka se
+        uzavře a na nové stránce se součet převede a zopakuje se hlavička
+        tabulky.
+        
+        Args:
+            c: Canvas objekt
+            invoice: Instance faktury
+            y_pos: Y souřadnice horního okraje hlavičky tabulky
+            
+        Returns:
+            Y souřadnice pod posledním řádkem
+        """
+        row_height = self.row_height
+        # Na stránce s QR kódem musí nad QR_BLOCK_TOP zůstat i řádek průběžného součtu
+        bottom = (QR_BLOCK_TOP + row_height if c.getPageNumber() == self.qr_page
+                  else self.table_bottom)
+        
+        y_pos = self.draw_table_header(c, y_pos)
+        carried = 0
+        for index, row in enumerate(invoice.item_rows()):
+            if y_pos < bottom:
+                self.draw_carried_total(c, invoice, y_pos, carried, "Převod na další stranu:")
+                c.showPage()
+                bottom = self.table_bottom
+                y_pos = self.draw_carried_total(c, invoice, self.page_height - self.margin,
+                                                carried, "Převod z předchozí strany:")
+                y_pos = self.draw_table_header(c, y_pos - 2 * mm)
+            
+            self.draw_item_row(c, invoice, row, index, y_pos)
+            *_, total = row
+            carried += total
+            y_pos -= row_height
+        
+        return y_pos
+    
+    def draw_carried_total(self, c: canvas.Canvas, invoice: Invoice, y_pos: float,
+                           amount: int, label: str) -> float:
+        """
+        Vykreslí průběžný součet položek (s DPH) při přechodu na další stránku.
+        
+        Args:
+            c: Canvas objekt
+            invoice: Instance faktury
+            y_pos: Y souřadnice řádku
+            amount: Součet položek na předchozích stránkách
+            label: Popisek součtu
+            
+        Returns:
+            Y souřadnice pod řádkem se součtem
+        """
+        c.setFont(self.font_bold, 8)
+        c.setFillColor(self.get_colors()['text'])
+        c.drawRightString(self.page_width - 60 * mm, y_pos, label)
+        c.drawRightString(self.page_width - self.margin, y_pos, invoice.format_price(amount))
+        return y_pos - self.row_height
+    
+    def get_footer_height(self, invoice: Invoice) -> float:
+        """
+        Vrátí výšku, kterou patička faktury zabere pod tabulkou položek.
+        
+        Args:
+            invoice: Instance faktury
+            
+        Returns:
+            Výška v bodech
+        """
+        height = self.footer_height + self.footer_rate_height * len(invoice.get_vat_summary())
+        if invoice.note:
+            height += self.footer_note_height
+        if invoice.assignment_clause:
+            # Stejné zalomení jako v draw_assignment_clause
+            from reportlab.lib.utils import simpleSplit
+            lines = simpleSplit(invoice.assignment_clause, self.font_regular, 7,
+                                self.page_width - 2 * self.margin)
+            height += (len(lines) + 1) * 9 + 5 * mm
+        return height
+    
+    def render_bytes(self, invoice: Invoice, **options) -> bytes:
+        """
+        Vygeneruje PDF do paměti.
+        
+        Args:
+            invoice: Instance faktury
+            **options: Volby metody generate (with_qr, with_isdoc, isdoc_xml, qr_backend,
+                invariant, profile)
+            
+        Returns:
+            Obsah PDF souboru
+        """
+        buffer = BytesIO()
+        self.generate(invoice, buffer, **options)
+        return buffer.getvalue()
+    
+    def draw_qr(self, c: canvas.Canvas, invoice: Invoice, backend: Optional[str] = None):
+        """
+        Vykreslí platební QR kód (SPD) do pravého dolního rohu stránky.
+        
+        Args:
+            c: Canvas objekt
+            invoice: Instance faktury
+            backend: Způsob vykreslení QR kódu ('vector' nebo 'raster')
+        """
+        from qr_generator import QRGenerator
+        QRGenerator.draw_payment_block(c, invoice, self.page_width, backend=backend)
     
     def format_date(self, date_obj) -> str:
         """
@@ -5,6 +5,7 @@ from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
 
 from models.invoice import Invoice
+from models.item_columns import ItemRow
 from .base import BaseTemplate
 
 
@@ -18,6 +19,15 @@ class ClassicTemplate(BaseTemplate):
     - Přehledné oddělení sekcí
     """
     
+    def __init__(self):
+        """Inicializace šablony a pozic sloupců tabulky položek."""
+        super().__init__()
+        self.col_desc = self.margin + 2 * mm
+        self.col_qty = self.page_width - 110 * mm
+        self.col_unit = self.page_width - 95 * mm
+        self.col_price = self.page_width - 75 * mm
+        self.col_vat = self.page_width - 50 * mm
+    
     def get_colors(self) -> dict:
         """Vrací modrošedé barevné schéma."""
         return {
@@ -33,30 +43,19 @@ class ClassicTemplate(BaseTemplate):
         colors_scheme = self.get_colors()
         y_pos = self.page_height - self.margin
         
-        # Nadpis FAKTURA
-        c.setFont(self.font_bold, 24)
-        c.setFillColor(colors_scheme['primary'])
-        c.drawString(self.margin, y_pos, "FAKTURA")
+        # Nadpis, oddělení, box a popisky (viz draw_static)
+        self.draw_static(c, 'Header', self._draw_header_chrome)
         
         # Číslo faktury napravo
         c.setFont(self.font_regular, 10)
+        c.setFillColor(colors_scheme['primary'])
         c.drawRightString(self.page_width - self.margin, y_pos, 
                          f"č. {invoice.invoice_number}")
         
-        y_pos -= 15 * mm
-        
-        # Oddělení
-        self.draw_line(c, self.margin, y_pos, self.page_width - self.margin, y_pos,
-                      width=2, color=colors_scheme['secondary'])
-        
-        y_pos -= 10 * mm
+        y_pos -= 25 * mm
         
         # Dodavatel (vlevo)
-        c.setFont(self.font_bold, 11)
         c.setFillColor(colors_scheme['text'])
-        c.drawString(self.margin, y_pos, "Dodavatel:")
-        
-        c.setFont(self.font_regular, 10)
         y_pos -= 5 * mm
         c.drawString(self.margin, y_pos, invoice.supplier.name)
         y_pos -= 4 * mm
@@ -72,10 +71,6 @@ class ClassicTemplate(BaseTemplate):
         y_pos_right = self.page_height - self.margin - 25 * mm
         x_right = self.page_width / 2 + 10 * mm
         
-        c.setFont(self.font_bold, 11)
-        c.drawString(x_right, y_pos_right, "Odběratel:")
-        
-        c.setFont(self.font_regular, 10)
         y_pos_right -= 5 * mm
         c.drawString(x_right, y_pos_right, invoice.customer.name)
         y_pos_right -= 4 * mm
@@ -87,90 +82,74 @@ class ClassicTemplate(BaseTemplate):
         y_pos_right -= 4 * mm
         c.drawString(x_right, y_pos_right, f"DIČ: {invoice.customer.dic}")
         
-        # Informace o faktuře
-        y_pos = y_pos_right - 10 * mm
-        
-        # Box s informacemi
-        box_height = 25 * mm
-        self.draw_rect(c, self.margin, y_pos - box_height, 
-                      self.page_width - 2 * self.margin, box_height,
-                      fill_color=colors_scheme['accent'])
-        
-        y_pos -= 5 * mm
-        c.setFillColor(colors_scheme['text'])
+        # Informace o faktuře (hodnoty v boxu)
+        y_pos = y_pos_right - 15 * mm
         
         # Levý sloupec
-        c.drawString(self.margin + 5 * mm, y_pos, f"Datum vystavení:")
         c.drawString(self.margin + 45 * mm, y_pos, self.format_date(invoice.issue_date))
         
         y_pos -= 5 * mm
-        c.drawString(self.margin + 5 * mm, y_pos, f"Datum splatnosti:")
         c.drawString(self.margin + 45 * mm, y_pos, self.format_date(invoice.due_date))
         
         # Pravý sloupec
         y_pos_right = y_pos + 5 * mm
         x_right_col = self.page_width / 2 + 10 * mm
         
-        c.drawString(x_right_col, y_pos_right, f"Variabilní symbol:")
         c.drawString(x_right_col + 40 * mm, y_pos_right, invoice.variable_symbol)
         
         y_pos_right -= 5 * mm
-        c.drawString(x_right_col, y_pos_right, f"Způsob platby:")
         c.drawString(x_right_col + 40 * mm, y_pos_right, invoice.payment_method)
         
         self.current_y = y_pos - 10 * mm
     
-    def draw_body(self, c: canvas.Canvas, invoice: Invoice):
-        """Vykreslí tabulku s položkami."""
+    def _draw_header_chrome(self, c: canvas.Canvas):
+        """Vykreslí statickou část hlavičky - nadpis, oddělení, box a popisky."""
         colors_scheme = self.get_colors()
-        y_pos = self.current_y
+        y_pos = self.page_height - self.margin
         
-        # Tabulka položek
-        table_y = y_pos - 5 * mm
+        # Nadpis FAKTURA
+        c.setFont(self.font_bold, 24)
+        c.setFillColor(colors_scheme['primary'])
+        c.drawString(self.margin, y_pos, "FAKTURA")
         
-        # Hlavička tabulky
-        header_height = 8 * mm
-        self.draw_rect(c, self.margin, table_y - header_height,
-                      self.page_width - 2 * self.margin, header_height,
-                      fill_color=colors_scheme['secondary'])
+        y_pos -= 15 * mm
         
-        c.setFillColor(colors.white)
-        c.setFont(self.font_bold, 9)
+        # Oddělení
+        self.draw_line(c, self.margin, y_pos, self.page_width - self.margin, y_pos,
+                      width=2, color=colors_scheme['secondary'])
         
-        # Pozice sloupců
-        col_desc = self.margin + 2 * mm
-        col_qty = self.page_width - 110 * mm
-        col_unit = self.page_width - 95 * mm
-        col_price = self.page_width - 75 * mm
-        col_vat = self.page_width - 50 * mm
-        
-        header_y = table_y - 5 * mm
-        c.drawString(col_desc, header_y, "Popis")
-        c.drawString(col_qty, header_y, "Množ.")
-        c.drawString(col_unit, header_y, "Jedn.")
-        c.drawString(col_price, header_y, "Cena/j.")
-        c.drawString(col_vat, header_y, "DPH")
-        c.drawRightString(self.page_width - self.margin, header_y, "Celkem")
+        y_pos -= 10 * mm
         
-        y_pos = table_y - header_height - 3 * mm
+        # Dodavatel (vlevo) a odběratel (vpravo)
+        c.setFont(self.font_bold, 11)
         c.setFillColor(colors_scheme['text'])
-        c.setFont(self.font_regular, 9)
+        c.drawString(self.margin, y_pos, "Dodavatel:")
+        c.drawString(self.page_width / 2 + 10 * mm, y_pos, "Odběratel:")
         
-        # Položky
-        for item in invoice.items:
-            if y_pos < 50 * mm:  # Kontrola, zda máme místo
-                c.showPage()
-                y_pos = self.page_height - self.margin
-            
-            c.drawString(col_desc, y_pos, item.description[:40])
-            c.drawString(col_qty, y_pos, str(item.quantity))
-            c.drawString(col_unit, y_pos, item.unit)
-            c.drawRightString(col_price + 20 * mm, y_pos, invoice.format_price(item.unit_price))
-            c.drawString(col_vat, y_pos, f"{item.vat_rate}%")
-            c.drawRightString(self.page_width - self.margin, y_pos, 
-                            invoice.format_price(item.total_price_with_vat))
-            
-            y_pos -= 5 * mm
+        # Box s informacemi o faktuře
+        y_pos -= 32 * mm
+        box_height = 25 * mm
+        self.draw_rect(c, self.margin, y_pos - box_height, 
+                      self.page_width - 2 * self.margin, box_height,
+                      fill_color=colors_scheme['accent'])
+        
+        y_pos -= 5 * mm
+        c.setFont(self.font_regular, 10)
+        c.setFillColor(colors_scheme['text'])
+        x_right_col = self.page_width / 2 + 10 * mm
+        
+        c.drawString(self.margin + 5 * mm, y_pos, "Datum vystavení:")
+        c.drawString(x_right_col, y_pos, "Variabilní symbol:")
+        y_pos -= 5 * mm
+        c.drawString(self.margin + 5 * mm, y_pos, "Datum splatnosti:")
+        c.drawString(x_right_col, y_pos, "Způsob platby:")
+    
+    def draw_body(self, c: canvas.Canvas, invoice: Invoice):
+        """Vykreslí tabulku s položkami."""
+        colors_scheme = self.get_colors()
+        
+        # Tabulka položek (stránkování viz BaseTemplate.draw_items)
+        y_pos = self.draw_items(c, invoice, self.current_y - 5 * mm)
         
         # Oddělení před součty
         y_pos -= 2 * mm
@@ -179,6 +158,45 @@ class ClassicTemplate(BaseTemplate):
         
         self.current_y = y_pos
     
+    def draw_table_header(self, c: canvas.Canvas, y_pos: float) -> float:
+        """Vykreslí modrou hlavičku tabulky položek."""
+        self.draw_static(c, 'Table', self._draw_table_header_chrome, y=y_pos)
+        
+        c.setFillColor(self.get_colors()['text'])
+        c.setFont(self.font_regular, 9)
+        return y_pos - 8 * mm - 3 * mm
+    
+    def _draw_table_header_chrome(self, c: canvas.Canvas):
+        """Vykreslí pruh s názvy sloupců (vůči hornímu okraji y = 0)."""
+        colors_scheme = self.get_colors()
+        
+        header_height = 8 * mm
+        self.draw_rect(c, self.margin, -header_height,
+                      self.page_width - 2 * self.margin, header_height,
+                      fill_color=colors_scheme['secondary'])
+        
+        c.setFillColor(colors.white)
+        c.setFont(self.font_bold, 9)
+        
+        header_y = -5 * mm
+        c.drawString(self.col_desc, header_y, "Popis")
+        c.drawString(self.col_qty, header_y, "Množ.")
+        c.drawString(self.col_unit, header_y, "Jedn.")
+        c.drawString(self.col_price, header_y, "Cena/j.")
+        c.drawString(self.col_vat, header_y, "DPH")
+        c.drawRightString(self.page_width - self.margin, header_y, "Celkem")
+    
+    def draw_item_row(self, c: canvas.Canvas, invoice: Invoice, row: ItemRow,
+                      index: int, y_pos: float):
+        """Vykreslí řádek položky."""
+        description, quantity, unit, unit_price, vat_rate, _, _, total = row
+        c.drawString(self.col_desc, y_pos, description[:40])
+        c.drawString(self.col_qty, y_pos, str(quantity))
+        c.drawString(self.col_unit, y_pos, unit)
+        c.drawRightString(self.col_price + 20 * mm, y_pos, invoice.format_price(unit_price))
+        c.drawString(self.col_vat, y_pos, f"{vat_rate}%")
+        c.drawRightString(self.page_width - self.margin, y_pos, invoice.format_price(total))
+    
     def draw_footer(self, c: canvas.Canvas, invoice: Invoice):
         """Vykreslí součty a bankovní údaje."""
         colors_scheme = self.get_colors()
@@ -200,14 +218,11 @@ class ClassicTemplate(BaseTemplate):
             c.drawRightString(x_value, y_pos, invoice.format_price(amounts['vat']))
             y_pos -= 5 * mm
         
-        # Celková částka
+        # Celková částka (box s popiskem viz _draw_total_chrome)
         y_pos -= 2 * mm
-        self.draw_rect(c, self.page_width - 120 * mm, y_pos - 8 * mm,
-                      100 * mm, 8 * mm, fill_color=colors_scheme['primary'])
+        self.draw_static(c, 'Total', self._draw_total_chrome, y=y_pos)
         
         c.setFillColor(colors.white)
-        c.setFont(self.font_bold, 11)
-        c.drawString(self.page_width - 115 * mm, y_pos - 5 * mm, "K úhradě:")
         c.setFont(self.font_bold, 13)
         c.drawRightString(self.page_width - self.margin, y_pos - 5 * mm, 
                          invoice.format_price(invoice.total_with_vat))
@@ -240,9 +255,21 @@ class ClassicTemplate(BaseTemplate):
             c.drawString(self.margin, y_pos, invoice.note)
         
         # Patička
-        y_pos = 20 * mm
+        self.draw_static(c, 'Footer', self._draw_disclaimer)
+    
+    def _draw_total_chrome(self, c: canvas.Canvas):
+        """Vykreslí box s popiskem K úhradě (vůči hornímu okraji y = 0)."""
+        self.draw_rect(c, self.page_width - 120 * mm, -8 * mm,
+                      100 * mm, 8 * mm, fill_color=self.get_colors()['primary'])
+        
+        c.setFillColor(colors.white)
+        c.setFont(self.font_bold, 11)
+        c.drawString(self.page_width - 115 * mm, -5 * mm, "K úhradě:")
+    
+    def _draw_disclaimer(self, c: canvas.Canvas):
+        """Vykreslí text patičky stránky."""
         c.setFont(self.font_regular, 8)
-        c.setFillColor(colors_scheme['light_text'])
-        c.drawCentredString(self.page_width / 2, y_pos,
+        c.setFillColor(self.get_colors()['light_text'])
+        c.drawCentredString(self.page_width / 2, 20 * mm,
                            "Faktura vystavena elektronicky a je platná bez podpisu a razítka.")
 
@@ -0,0 +1,146 @@
+"""Diskový cache předzpracovaných TrueType fontů pro rychlý studený start."""
+
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+from pathlib import Path
+from typing import Optional
+from weakref import WeakKeyDictionary
+
+import reportlab
+from reportlab.pdfbase.ttfonts import TTFont, TTFontFace
+
+
+# Verze formátu cache - zvýšit při změně ukládaných dat
+CACHE_VERSION = 1
+
+# Atributy, které se do cache neukládají (obnoví se při načtení)
+_FACE_TRANSIENT = ('_ttf_data', '_pdfScale', '_pos', 'filename')
+_FONT_TRANSIENT = ('face', 'state')
+
+
+def get_cache_dir() -> Optional[Path]:
+    """
+    Vrací adresář cache fontů.
+
+    Lze přenastavit proměnnou prostředí INVOICE_GENERATOR_CACHE_DIR,
+    proměnná INVOICE_GENERATOR_NO_FONT_CACHE=1 cache vypne.
+
+    Returns:
+        Cesta k adresáři nebo None, pokud je cache vypnutá
+    """
+    if os.environ.get('INVOICE_GENERATOR_NO_FONT_CACHE') == '1':
+        return None
+
+    base_dir = os.environ.get('INVOICE_GENERATOR_CACHE_DIR')
+    if base_dir:
+        return Path(base_dir) / 'fonts'
+
+    xdg_cache = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(xdg_cache) / 'invoice_generator' / 'fonts'
+
+
+def load_ttfont(name: str, path: str) -> TTFont:
+    """
+    Vrátí TTFont, přednostně z diskového cache.
+
+    Cache je klíčovaný hashem obsahu fontu, verzí formátu a verzí reportlabu.
+    Při změně fontu nebo poškozeném záznamu se font znovu zparsuje
+    a záznam se atomicky přepíše.
+
+    Args:
+        name: Název, pod kterým bude font registrován
+        path: Cesta k TTF souboru
+
+    Returns:
+        Instance TTFont připravená k registraci
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return TTFont(name, path)
+
+    digest = hashlib.sha256(data).hexdigest()
+    cache_path = cache_dir / f"{name}-{digest[:16]}.v{CACHE_VERSION}.pickle"
+
+    font = _read_cache_entry(cache_path, name, path, data, digest)
+    if font is not None:
+        return font
+
+    font = TTFont(name, path)
+    _write_cache_entry(cache_dir, cache_path, name, font, digest)
+    return font
+
+
+def _read_cache_entry(cache_path: Path, name: str, path: str,
+                      data: bytes, digest: str) -> Optional[TTFont]:
+    """Načte font ze záznamu cache, nebo vrátí None, pokud je neplatný."""
+    try:
+        with open(cache_path, 'rb') as f:
+            entry = pickle.load(f)
+    except Exception:
+        return None
+
+    if (not isinstance(entry, dict)
+            or entry.get('version') != CACHE_VERSION
+            or entry.get('reportlab') != reportlab.Version
+            or entry.get('sha256') != digest):
+        return None
+
+    face = TTFontFace.__new__(TTFontFace)
+    face.__dict__.update(entry['face'])
+    face._ttf_data = data
+    face._pos = 0
+    face.filename = path
+    face._pdfScale = _make_pdf_scale(face.unitsPerEm)
+
+    font = TTFont.__new__(TTFont)
+    font.__dict__.update(entry['font'])
+    font.fontName = name
+    font.face = face
+    font.state = WeakKeyDictionary()
+    return font
+
+
+def _write_cache_entry(cache_dir: Path, cache_path: Path, name: str,
+                       font: TTFont, digest: str):
+    """Atomicky uloží zparsovaný font a odstraní zastaralé záznamy."""
+    entry = {
+        'version': CACHE_VERSION,
+        'reportlab': reportlab.Version,
+        'sha256': digest,
+        'face': {k: v for k, v in font.face.__dict__.items() if k not in _FACE_TRANSIENT},
+        'font': {k: v for k, v in font.__dict__.items() if k not in _FONT_TRANSIENT},
+    }
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        # Záznamy pro dřívější verze fontu už nejsou potřeba
+        stale_pattern = re.compile(re.escape(name) + r'-[0-9a-f]{16}\.v\d+\.pickle')
+        for stale in cache_dir.glob(f"{name}-*.pickle"):
+            if stale != cache_path and stale_pattern.fullmatch(stale.name):
+                stale.unlink(missing_ok=True)
+    except OSError:
+        # Cache je jen optimalizace - nezapisovatelný adresář nevadí
+        pass
+
+
+def _make_pdf_scale(units_per_em: int):
+    """Přepočet jednotek fontu na tisíciny bodu (stejně jako reportlab)."""
+    if units_per_em == 1000:
+        return lambda x: x
+    _1000mult = 1000 / units_per_em
+    return lambda x: x * _1000mult
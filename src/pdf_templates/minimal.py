@@ -5,6 +5,7 @@ from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
 
 from models.invoice import Invoice
+from models.item_columns import ItemRow
 from .base import BaseTemplate
 
 
@@ -19,6 +20,19 @@ class MinimalTemplate(BaseTemplate):
     - Zaměření na čitelnost
     """
     
+    # Patička: souhrn DPH, částka k úhradě a platební údaje (viz draw_footer)
+    footer_height = 35 * mm
+    footer_note_height = 5 * mm
+    
+    def __init__(self):
+        """Inicializace šablony a pozic sloupců tabulky položek."""
+        super().__init__()
+        self.col_desc = self.margin
+        self.col_qty = self.page_width - 100 * mm
+        self.col_unit = self.page_width - 85 * mm
+        self.col_price = self.page_width - 65 * mm
+        self.col_vat = self.page_width - 40 * mm
+    
     def get_colors(self) -> dict:
         """Vrací minimalistické barevné schéma (odstíny šedi)."""
         return {
@@ -35,85 +49,80 @@ class MinimalTemplate(BaseTemplate):
         colors_scheme = self.get_colors()
         y_pos = self.page_height - self.margin
         
-        # Jednoduchý nadpis
-        c.setFont(self.font_bold, 32)
-        c.setFillColor(colors_scheme['primary'])
-        c.drawString(self.margin, y_pos, "FAKTURA")
+        # Nadpis, čára a popisky (viz draw_static)
+        self.draw_static(c, 'Header', self._draw_header_chrome)
         
-        # Číslo faktury pod ním
+        # Číslo faktury pod nadpisem
         c.setFont(self.font_regular, 10)
         c.setFillColor(colors_scheme['light_text'])
         y_pos -= 8 * mm
         c.drawString(self.margin, y_pos, f"Číslo: {invoice.invoice_number}")
         
-        # Tenká oddělovací čára
-        y_pos -= 5 * mm
-        self.draw_line(c, self.margin, y_pos, self.page_width - self.margin, y_pos,
-                      width=0.5, color=colors_scheme['line'])
-        
-        y_pos -= 10 * mm
+        y_pos -= 15 * mm
         
         # Základní informace v jednoduchém layoutu
         c.setFont(self.font_regular, 9)
         c.setFillColor(colors_scheme['text'])
         
         info_y = y_pos
-        c.drawString(self.margin, info_y, "Datum vystavení:")
         c.drawString(self.margin + 40 * mm, info_y, self.format_date(invoice.issue_date))
         
         info_y -= 5 * mm
-        c.drawString(self.margin, info_y, "Datum splatnosti:")
         c.drawString(self.margin + 40 * mm, info_y, self.format_date(invoice.due_date))
         
         info_y -= 5 * mm
-        c.drawString(self.margin, info_y, "Variabilní symbol:")
         c.drawString(self.margin + 40 * mm, info_y, invoice.variable_symbol)
         
         y_pos -= 20 * mm
         
-        # Dodavatel a odběratel - jednoduchý text bez rámečků
-        # Dodavatel
-        c.setFont(self.font_bold, 9)
-        c.setFillColor(colors_scheme['secondary'])
-        c.drawString(self.margin, y_pos, "OD:")
+        # Dodavatel a odběratel - jednoduchý text bez rámečků (odběratel o 4 mm výš)
+        x_right = self.page_width / 2 + 10 * mm
+        for x, company, y_company in ((self.margin, invoice.supplier, y_pos),
+                                      (x_right, invoice.customer, y_pos + 4 * mm)):
+            y_company -= 5 * mm
+            c.setFillColor(colors_scheme['text'])
+            c.drawString(x, y_company, company.name)
+            y_company -= 4 * mm
+            c.drawString(x, y_company, company.street)
+            y_company -= 4 * mm
+            c.drawString(x, y_company, f"{company.zip_code} {company.city}")
+            y_company -= 4 * mm
+            c.setFillColor(colors_scheme['light_text'])
+            c.drawString(x, y_company, f"IČO: {company.ico}  |  DIČ: {company.dic}")
         
-        c.setFont(self.font_regular, 9)
-        c.setFillColor(colors_scheme['text'])
-        y_pos -= 5 * mm
-        c.drawString(self.margin, y_pos, invoice.supplier.name)
-        y_pos -= 4 * mm
-        c.drawString(self.margin, y_pos, invoice.supplier.street)
-        y_pos -= 4 * mm
-        c.drawString(self.margin, y_pos, 
-                    f"{invoice.supplier.zip_code} {invoice.supplier.city}")
-        y_pos -= 4 * mm
-        c.setFillColor(colors_scheme['light_text'])
-        c.drawString(self.margin, y_pos, 
-                    f"IČO: {invoice.supplier.ico}  |  DIČ: {invoice.supplier.dic}")
+        self.current_y = y_pos - 17 * mm - 15 * mm
+    
+    def _draw_header_chrome(self, c: canvas.Canvas):
+        """Vykreslí statickou část hlavičky - nadpis, čáru a popisky."""
+        colors_scheme = self.get_colors()
+        y_pos = self.page_height - self.margin
         
-        # Odběratel
-        y_customer = y_pos + 21 * mm
-        x_right = self.page_width / 2 + 10 * mm
+        # Jednoduchý nadpis
+        c.setFont(self.font_bold, 32)
+        c.setFillColor(colors_scheme['primary'])
+        c.drawString(self.margin, y_pos, "FAKTURA")
         
-        c.setFont(self.font_bold, 9)
-        c.setFillColor(colors_scheme['secondary'])
-        c.drawString(x_right, y_customer, "PRO:")
+        # Tenká oddělovací čára
+        y_pos -= 13 * mm
+        self.draw_line(c, self.margin, y_pos, self.page_width - self.margin, y_pos,
+                      width=0.5, color=colors_scheme['line'])
         
+        y_pos -= 10 * mm
+        
+        # Popisky základních informací
         c.setFont(self.font_regular, 9)
         c.setFillColor(colors_scheme['text'])
-        y_customer -= 5 * mm
-        c.drawString(x_right, y_customer, invoice.customer.name)
-        y_customer -= 4 * mm
-        c.drawString(x_right, y_customer, invoice.customer.street)
-        y_customer -= 4 * mm
-        c.drawString(x_right, y_customer, 
-                    f"{invoice.customer.zip_code} {invoice.customer.city}")
-        y_customer -= 4 * mm
-        c.setFillColor(colors_scheme['light_text'])
-        c.drawString(x_right, y_customer, 
-                    f"IČO: {invoice.customer.ico}  |  DIČ: {invoice.customer.dic}")
+        c.drawString(self.margin, y_pos, "Datum vystavení:")
+        c.drawString(self.margin, y_pos - 5 * mm, "Datum splatnosti:")
+        c.drawString(self.margin, y_pos - 10 * mm, "Variabilní symbol:")
         
-        self.current_y = y_pos - 15 * mm
+        y_pos -= 20 * mm
+        
+        # Dodavatel a odběratel
+        c.setFont(self.font_bold, 9)
+        c.setFillColor(colors_scheme['secondary'])
+        c.drawString(self.margin, y_pos, "OD:")
+        c.drawString(self.page_width / 2 + 10 * mm, y_pos + 4 * mm, "PRO:")
     
     def draw_body(self, c: canvas.Canvas, invoice: Invoice):
         """Vykreslí minimalistickou tabulku položek."""
@@ -124,55 +133,52 @@ class MinimalTemplate(BaseTemplate):
         self.draw_line(c, self.margin, y_pos, self.page_width - self.margin, y_pos,
                       width=0.5, color=colors_scheme['line'])
         
-        y_pos -= 8 * mm
-        
-        # Hlavička tabulky - pouze text, žádné pozadí
-        c.setFont(self.font_bold, 8)
-        c.setFillColor(colors_scheme['secondary'])
-        
-        col_desc = self.margin
-        col_qty = self.page_width - 100 * mm
-        col_unit = self.page_width - 85 * mm
-        col_price = self.page_width - 65 * mm
-        col_vat = self.page_width - 40 * mm
-        
-        c.drawString(col_desc, y_pos, "Popis")
-        c.drawString(col_qty, y_pos, "Množství")
-        c.drawString(col_unit, y_pos, "J.")
-        c.drawString(col_price, y_pos, "Cena/j.")
-        c.drawString(col_vat, y_pos, "DPH")
-        c.drawRightString(self.page_width - self.margin, y_pos, "Celkem")
+        # Položky - jednoduché řádky (stránkování viz BaseTemplate.draw_items)
+        y_pos = self.draw_items(c, invoice, y_pos - 8 * mm)
         
-        y_pos -= 2 * mm
+        # Oddělovací čára
         self.draw_line(c, self.margin, y_pos, self.page_width - self.margin, y_pos,
                       width=0.5, color=colors_scheme['line'])
         
-        y_pos -= 5 * mm
+        self.current_y = y_pos - 5 * mm
+    
+    def draw_table_header(self, c: canvas.Canvas, y_pos: float) -> float:
+        """Vykreslí hlavičku tabulky - pouze text, žádné pozadí."""
+        self.draw_static(c, 'Table', self._draw_table_header_chrome, y=y_pos)
+        
         c.setFont(self.font_regular, 8)
-        c.setFillColor(colors_scheme['text'])
+        c.setFillColor(self.get_colors()['text'])
+        return y_pos - 2 * mm - 5 * mm
+    
+    def _draw_table_header_chrome(self, c: canvas.Canvas):
+        """Vykreslí názvy sloupců s čarou (vůči účaří názvů y = 0)."""
+        colors_scheme = self.get_colors()
         
-        # Položky - jednoduché řádky
-        for item in invoice.items:
-            if y_pos < 50 * mm:
-                c.showPage()
-                y_pos = self.page_height - self.margin
-            
-            c.drawString(col_desc, y_pos, item.description[:50])
-            c.drawString(col_qty, y_pos, str(item.quantity))
-            c.drawString(col_unit, y_pos, item.unit)
-            c.drawRightString(col_price + 20 * mm, y_pos, 
-                            invoice.format_price(item.unit_price))
-            c.drawString(col_vat, y_pos, f"{item.vat_rate}%")
-            c.drawRightString(self.page_width - self.margin, y_pos, 
-                            invoice.format_price(item.total_price_with_vat))
-            
-            y_pos -= 5 * mm
+        c.setFont(self.font_bold, 8)
+        c.setFillColor(colors_scheme['secondary'])
         
-        # Oddělovací čára
-        self.draw_line(c, self.margin, y_pos, self.page_width - self.margin, y_pos,
-                      width=0.5, color=colors_scheme['line'])
+        c.drawString(self.col_desc, 0, "Popis")
+        c.drawString(self.col_qty, 0, "Množství")
+        c.drawString(self.col_unit, 0, "J.")
+        c.drawString(self.col_price, 0, "Cena/j.")
+        c.drawString(self.col_vat, 0, "DPH")
+        c.drawRightString(self.page_width - self.margin, 0, "Celkem")
         
-        self.current_y = y_pos - 5 * mm
+        self.draw_line(c, self.margin, -2 * mm, self.page_width - self.margin, -2 * mm,
+                      width=0.5, color=colors_scheme['line'])
+    
+    def draw_item_row(self, c: canvas.Canvas, invoice: Invoice, row: ItemRow,
+                      index: int, y_pos: float):
+        """Vykreslí řádek položky."""
+        description, quantity, unit, unit_price, vat_rate, _, _, total = row
+        c.drawString(self.col_desc, y_pos, description[:50])
+        c.drawString(self.col_qty, y_pos, str(quantity))
+        c.drawString(self.col_unit, y_pos, unit)
+        c.drawRightString(self.col_price + 20 * mm, y_pos, 
+                        invoice.format_price(unit_price))
+        c.drawString(self.col_vat, y_pos, f"{vat_rate}%")
+        c.drawRightString(self.page_width - self.margin, y_pos, 
+                        invoice.format_price(total))
     
     def draw_footer(self, c: canvas.Canvas, invoice: Invoice):
         """Vykreslí minimalistický footer."""
@@ -196,16 +202,13 @@ class MinimalTemplate(BaseTemplate):
             c.drawRightString(x_value, y_pos, invoice.format_price(amounts['vat']))
             y_pos -= 5 * mm
         
-        # Celková částka - pouze čára a zvětšené písmo
+        # Celková částka - pouze čára a zvětšené písmo (viz _draw_total_chrome)
         y_pos -= 2 * mm
-        self.draw_line(c, x_label - 5 * mm, y_pos, self.page_width - self.margin, y_pos,
-                      width=1, color=colors_scheme['primary'])
+        self.draw_static(c, 'Total', self._draw_total_chrome, y=y_pos)
         
         y_pos -= 7 * mm
-        c.setFont(self.font_bold, 10)
-        c.setFillColor(colors_scheme['primary'])
-        c.drawString(x_label, y_pos, "K úhradě")
         c.setFont(self.font_bold, 14)
+        c.setFillColor(colors_scheme['primary'])
         c.drawRightString(self.page_width - self.margin, y_pos, invoice.format_price(invoice.total_with_vat))
         
         # Cestní doložka
@@ -232,8 +235,23 @@ class MinimalTemplate(BaseTemplate):
             c.drawString(self.margin, y_bank, invoice.note)
         
         # Minimální patička
+        self.draw_static(c, 'Footer', self._draw_disclaimer)
+    
+    def _draw_total_chrome(self, c: canvas.Canvas):
+        """Vykreslí čáru a popisek K úhradě (vůči čáře y = 0)."""
+        colors_scheme = self.get_colors()
+        x_label = self.page_width - 90 * mm
+        self.draw_line(c, x_label - 5 * mm, 0, self.page_width - self.margin, 0,
+                      width=1, color=colors_scheme['primary'])
+        
+        c.setFont(self.font_bold, 10)
+        c.setFillColor(colors_scheme['primary'])
+        c.drawString(x_label, -7 * mm, "K úhradě")
+    
+    def _draw_disclaimer(self, c: canvas.Canvas):
+        """Vykreslí text patičky stránky."""
         c.setFont(self.font_regular, 7)
-        c.setFillColor(colors_scheme['light_text'])
+        c.setFillColor(self.get_colors()['light_text'])
         c.drawCentredString(self.page_width / 2, 20 * mm,
                            "Elektronická faktura - platná bez podpisu")
 
@@ -5,6 +5,7 @@ from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
 
 from models.invoice import Invoice
+from models.item_columns import ItemRow
 from .base import BaseTemplate
 
 
@@ -19,6 +20,21 @@ class ModernTemplate(BaseTemplate):
     - Větší akcent na vizuální hierarchii
     """
     
+    # Patička: souhrn DPH, box K úhradě a platební údaje (viz draw_footer)
+    footer_height = 35 * mm
+    footer_note_height = 6 * mm
+    
+    def __init__(self):
+        """Inicializace šablony, barev a pozic sloupců tabulky položek."""
+        super().__init__()
+        # Barvy se čtou u každého řádku tabulky, proto se připraví jednou
+        self.colors_scheme = self.get_colors()
+        self.col_desc = self.margin + 2 * mm
+        self.col_qty = self.page_width - 105 * mm
+        self.col_unit = self.page_width - 90 * mm
+        self.col_price = self.page_width - 70 * mm
+        self.col_vat = self.page_width - 45 * mm
+    
     def get_colors(self) -> dict:
         """Vrací moderní barevné schéma."""
         return {
@@ -35,16 +51,11 @@ class ModernTemplate(BaseTemplate):
         colors_scheme = self.get_colors()
         y_pos = self.page_height - self.margin
         
-        # Barevný pruh nahoře
-        self.draw_rect(c, 0, self.page_height - 15 * mm,
-                      self.page_width, 15 * mm, fill_color=colors_scheme['primary'])
-        
-        # FAKTURA text
-        c.setFillColor(colors.white)
-        c.setFont(self.font_bold, 28)
-        c.drawString(self.margin, y_pos - 10 * mm, "FAKTURA")
+        # Pruh, boxy, rámečky a popisky (viz draw_static)
+        self.draw_static(c, 'Header', self._draw_header_chrome)
         
         # Číslo faktury
+        c.setFillColor(colors.white)
         c.setFont(self.font_regular, 11)
         c.drawRightString(self.page_width - self.margin, y_pos - 10 * mm,
                          invoice.invoice_number)
@@ -57,89 +68,85 @@ class ModernTemplate(BaseTemplate):
         gap = 5 * mm
         
         # Box datum vystavení
-        self.draw_rect(c, self.margin, y_pos - box_height, box_width, box_height,
-                      fill_color=colors_scheme['accent'])
-        
         c.setFillColor(colors_scheme['text'])
-        c.setFont(self.font_regular, 8)
-        c.drawString(self.margin + 2 * mm, y_pos - 5 * mm, "DATUM VYSTAVENÍ")
         c.setFont(self.font_bold, 12)
         c.drawString(self.margin + 2 * mm, y_pos - 12 * mm, 
                     self.format_date(invoice.issue_date))
         
         # Box datum splatnosti
         box_x = self.margin + box_width + gap
-        self.draw_rect(c, box_x, y_pos - box_height, box_width, box_height,
-                      fill_color=colors_scheme['accent'])
-        
-        c.setFillColor(colors_scheme['text'])
-        c.setFont(self.font_regular, 8)
-        c.drawString(box_x + 2 * mm, y_pos - 5 * mm, "DATUM SPLATNOSTI")
-        c.setFont(self.font_bold, 12)
         c.setFillColor(colors_scheme['secondary'])
         c.drawString(box_x + 2 * mm, y_pos - 12 * mm, 
                     self.format_date(invoice.due_date))
         
         # Variabilní symbol
         box_x = self.margin + 2 * (box_width + gap)
-        self.draw_rect(c, box_x, y_pos - box_height, box_width, box_height,
-                      fill_color=colors_scheme['accent'])
-        
         c.setFillColor(colors_scheme['text'])
-        c.setFont(self.font_regular, 8)
-        c.drawString(box_x + 2 * mm, y_pos - 5 * mm, "VAR. SYMBOL")
-        c.setFont(self.font_bold, 12)
         c.drawString(box_x + 2 * mm, y_pos - 12 * mm, invoice.variable_symbol)
         
         y_pos -= box_height + 10 * mm
         
         # Dodavatel a Odběratel vedle sebe
         col_width = (self.page_width - 2 * self.margin - 10 * mm) / 2
+        x_right = self.margin + col_width + 10 * mm
         
-        # Dodavatel
-        self.draw_rect(c, self.margin, y_pos - 35 * mm, col_width, 35 * mm,
-                      stroke_color=colors_scheme['primary'], line_width=2)
+        for x, company in ((self.margin, invoice.supplier), (x_right, invoice.customer)):
+            c.setFont(self.font_bold, 11)
+            c.drawString(x + 3 * mm, y_pos - 12 * mm, company.name)
+            
+            c.setFont(self.font_regular, 9)
+            c.drawString(x + 3 * mm, y_pos - 17 * mm, company.street)
+            c.drawString(x + 3 * mm, y_pos - 21 * mm, 
+                        f"{company.zip_code} {company.city}")
+            c.drawString(x + 3 * mm, y_pos - 26 * mm, f"IČO: {company.ico}")
+            c.drawString(x + 3 * mm, y_pos - 30 * mm, f"DIČ: {company.dic}")
         
-        c.setFillColor(colors_scheme['primary'])
-        c.setFont(self.font_bold, 10)
-        c.drawString(self.margin + 3 * mm, y_pos - 6 * mm, "DODAVATEL")
+        self.current_y = y_pos - 40 * mm
+    
+    def _draw_header_chrome(self, c: canvas.Canvas):
+        """Vykreslí statickou část hlavičky - pruh, boxy, rámečky a popisky."""
+        colors_scheme = self.get_colors()
+        y_pos = self.page_height - self.margin
         
-        c.setFillColor(colors_scheme['text'])
-        c.setFont(self.font_bold, 11)
-        c.drawString(self.margin + 3 * mm, y_pos - 12 * mm, invoice.supplier.name)
+        # Barevný pruh nahoře
+        self.draw_rect(c, 0, self.page_height - 15 * mm,
+                      self.page_width, 15 * mm, fill_color=colors_scheme['primary'])
         
-        c.setFont(self.font_regular, 9)
-        c.drawString(self.margin + 3 * mm, y_pos - 17 * mm, invoice.supplier.street)
-        c.drawString(self.margin + 3 * mm, y_pos - 21 * mm, 
-                    f"{invoice.supplier.zip_code} {invoice.supplier.city}")
-        c.drawString(self.margin + 3 * mm, y_pos - 26 * mm, 
-                    f"IČO: {invoice.supplier.ico}")
-        c.drawString(self.margin + 3 * mm, y_pos - 30 * mm, 
-                    f"DIČ: {invoice.supplier.dic}")
-        
-        # Odběratel
-        x_right = self.margin + col_width + 10 * mm
-        self.draw_rect(c, x_right, y_pos - 35 * mm, col_width, 35 * mm,
-                      stroke_color=colors_scheme['secondary'], line_width=2)
+        # FAKTURA text
+        c.setFillColor(colors.white)
+        c.setFont(self.font_bold, 28)
+        c.drawString(self.margin, y_pos - 10 * mm, "FAKTURA")
         
-        c.setFillColor(colors_scheme['secondary'])
-        c.setFont(self.font_bold, 10)
-        c.drawString(x_right + 3 * mm, y_pos - 6 * mm, "ODBĚRATEL")
+        y_pos -= 25 * mm
         
-        c.setFillColor(colors_scheme['text'])
-        c.setFont(self.font_bold, 11)
-        c.drawString(x_right + 3 * mm, y_pos - 12 * mm, invoice.customer.name)
+        # Boxy s datem vystavení, splatností a variabilním symbolem
+        box_width = 45 * mm
+        box_height = 18 * mm
+        gap = 5 * mm
         
-        c.setFont(self.font_regular, 9)
-        c.drawString(x_right + 3 * mm, y_pos - 17 * mm, invoice.customer.street)
-        c.drawString(x_right + 3 * mm, y_pos - 21 * mm, 
-                    f"{invoice.customer.zip_code} {invoice.customer.city}")
-        c.drawString(x_right + 3 * mm, y_pos - 26 * mm, 
-                    f"IČO: {invoice.customer.ico}")
-        c.drawString(x_right + 3 * mm, y_pos - 30 * mm, 
-                    f"DIČ: {invoice.customer.dic}")
+        for position, label in enumerate(("DATUM VYSTAVENÍ", "DATUM SPLATNOSTI", "VAR. SYMBOL")):
+            box_x = self.margin + position * (box_width + gap)
+            self.draw_rect(c, box_x, y_pos - box_height, box_width, box_height,
+                          fill_color=colors_scheme['accent'])
+            
+            c.setFillColor(colors_scheme['text'])
+            c.setFont(self.font_regular, 8)
+            c.drawString(box_x + 2 * mm, y_pos - 5 * mm, label)
         
-        self.current_y = y_pos - 40 * mm
+        y_pos -= box_height + 10 * mm
+        
+        # Rámečky dodavatele a odběratele
+        col_width = (self.page_width - 2 * self.margin - 10 * mm) / 2
+        x_right = self.margin + col_width + 10 * mm
+        
+        for x, label, color in ((self.margin, "DODAVATEL", colors_scheme['primary']),
+                                (x_right, "ODBĚRATEL", colors_scheme['secondary'])):
+            self.draw_rect(c, x, y_pos - 35 * mm, col_width, 35 * mm,
+                          stroke_color=color, line_width=2)
+            
+            c.setFillColor(color)
+            c.setFont(self.font_bold, 10)
+            c.drawString(x + 3 * mm, y_pos - 6 * mm, label)
     
     def draw_body(self, c: canvas.Canvas, invoice: Invoice):
         """Vykreslí moderní tabulku položek."""
@@ -153,61 +160,58 @@ class ModernTemplate(BaseTemplate):
         
         y_pos -= 8 * mm
         
-        # Tabulka
-        # Pozice sloupců
-        col_desc = self.margin + 2 * mm
-        col_qty = self.page_width - 105 * mm
-        col_unit = self.page_width - 90 * mm
-        col_price = self.page_width - 70 * mm
-        col_vat = self.page_width - 45 * mm
+        # Tabulka (stránkování viz BaseTemplate.draw_items)
+        y_pos = self.draw_items(c, invoice, y_pos)
         
+        self.current_y = y_pos - 5 * mm
+    
+    def draw_table_header(self, c: canvas.Canvas, y_pos: float) -> float:
+        """Vykreslí barevnou hlavičku tabulky položek."""
+        self.draw_static(c, 'Table', self._draw_table_header_chrome, y=y_pos)
+        
+        c.setFillColor(self.colors_scheme['text'])
+        c.setFont(self.font_regular, 8)
+        return y_pos - 7 * mm - 3 * mm
+    
+    def _draw_table_header_chrome(self, c: canvas.Canvas):
+        """Vykreslí tmavý pruh s názvy sloupců (vůči hornímu okraji y = 0)."""
         # Hlavička - barevná
         header_height = 7 * mm
-        self.draw_rect(c, self.margin, y_pos - header_height,
+        self.draw_rect(c, self.margin, -header_height,
                       self.page_width - 2 * self.margin, header_height,
-                      fill_color=colors_scheme['dark'])
+                      fill_color=self.colors_scheme['dark'])
         
         c.setFillColor(colors.white)
         c.setFont(self.font_bold, 8)
-        header_y = y_pos - 4.5 * mm
-        c.drawString(col_desc, header_y, "POPIS")
-        c.drawString(col_qty, header_y, "MNŽ")
-        c.drawString(col_unit, header_y, "J.")
-        c.drawString(col_price, header_y, "CENA/J")
-        c.drawString(col_vat, header_y, "DPH")
+        header_y = -4.5 * mm
+        c.drawString(self.col_desc, header_y, "POPIS")
+        c.drawString(self.col_qty, header_y, "MNŽ")
+        c.drawString(self.col_unit, header_y, "J.")
+        c.drawString(self.col_price, header_y, "CENA/J")
+        c.drawString(self.col_vat, header_y, "DPH")
         c.drawRightString(self.page_width - self.margin, header_y, "CELKEM")
+    
+    def draw_item_row(self, c: canvas.Canvas, invoice: Invoice, row: ItemRow,
+                      index: int, y_pos: float):
+        """Vykreslí řádek položky se střídavým pozadím."""
+        colors_scheme = self.colors_scheme
+        description, quantity, unit, unit_price, vat_rate, _, _, total = row
+        
+        # Střídavé pozadí
+        if index % 2 == 0:
+            self.draw_rect(c, self.margin, y_pos - 5 * mm,
+                         self.page_width - 2 * self.margin, 5 * mm,
+                         fill_color=colors_scheme['accent'])
         
-        y_pos -= header_height + 3 * mm
         c.setFillColor(colors_scheme['text'])
-        c.setFont(self.font_regular, 8)
-        
-        # Položky se střídavým pozadím
-        alternate = True
-        for item in invoice.items:
-            if y_pos < 50 * mm:
-                c.showPage()
-                y_pos = self.page_height - self.margin
-            
-            # Střídavé pozadí
-            if alternate:
-                self.draw_rect(c, self.margin, y_pos - 5 * mm,
-                             self.page_width - 2 * self.margin, 5 * mm,
-                             fill_color=colors_scheme['accent'])
-            
-            c.setFillColor(colors_scheme['text'])
-            c.drawString(col_desc, y_pos - 3.5 * mm, item.description[:45])
-            c.drawString(col_qty, y_pos - 3.5 * mm, str(item.quantity))
-            c.drawString(col_unit, y_pos - 3.5 * mm, item.unit)
-            c.drawRightString(col_price + 20 * mm, y_pos - 3.5 * mm, 
-                            invoice.format_price(item.unit_price))
-            c.drawString(col_vat, y_pos - 3.5 * mm, f"{item.vat_rate}%")
-            c.drawRightString(self.page_width - self.margin, y_pos - 3.5 * mm, 
-                            invoice.format_price(item.total_price_with_vat))
-            
-            y_pos -= 5 * mm
-            alternate = not alternate
-        
-        self.current_y = y_pos - 5 * mm
+        c.drawString(self.col_desc, y_pos - 3.5 * mm, description[:45])
+        c.drawString(self.col_qty, y_pos - 3.5 * mm, str(quantity))
+        c.drawString(self.col_unit, y_pos - 3.5 * mm, unit)
+        c.drawRightString(self.col_price + 20 * mm, y_pos - 3.5 * mm, 
+                        invoice.format_price(unit_price))
+        c.drawString(self.col_vat, y_pos - 3.5 * mm, f"{vat_rate}%")
+        c.drawRightString(self.page_width - self.margin, y_pos - 3.5 * mm, 
+                        invoice.format_price(total))
     
     def draw_footer(self, c: canvas.Canvas, invoice: Invoice):
         """Vykreslí moderní footer se součty."""
@@ -231,15 +235,11 @@ class ModernTemplate(BaseTemplate):
             c.drawRightString(x_value, y_pos, invoice.format_price(amounts['vat']))
             y_pos -= 5 * mm
         
-        # Celkem - velký box
+        # Celkem - velký box (box s popiskem viz _draw_total_chrome)
         y_pos -= 3 * mm
-        box_height = 12 * mm
-        self.draw_rect(c, self.page_width - 110 * mm, y_pos - box_height,
-                      90 * mm, box_height, fill_color=colors_scheme['primary'])
+        self.draw_static(c, 'Total', self._draw_total_chrome, y=y_pos)
         
         c.setFillColor(colors.white)
-        c.setFont(self.font_bold, 11)
-        c.drawString(self.page_width - 105 * mm, y_pos - 7 * mm, "K ÚHRADĚ")
         c.setFont(self.font_bold, 14)
         c.drawRightString(self.page_width - self.margin, y_pos - 7 * mm, 
                          invoice.format_price(invoice.total_with_vat))
@@ -269,8 +269,22 @@ class ModernTemplate(BaseTemplate):
             c.drawString(self.margin, y_bank, invoice.note)
         
         # Patička
+        self.draw_static(c, 'Footer', self._draw_disclaimer)
+    
+    def _draw_total_chrome(self, c: canvas.Canvas):
+        """Vykreslí box s popiskem K ÚHRADĚ (vůči hornímu okraji y = 0)."""
+        box_height = 12 * mm
+        self.draw_rect(c, self.page_width - 110 * mm, -box_height,
+                      90 * mm, box_height, fill_color=self.colors_scheme['primary'])
+        
+        c.setFillColor(colors.white)
+        c.setFont(self.font_bold, 11)
+        c.drawString(self.page_width - 105 * mm, -7 * mm, "K ÚHRADĚ")
+    
+    def _draw_disclaimer(self, c: canvas.Canvas):
+        """Vykreslí text patičky stránky."""
         c.setFont(self.font_regular, 7)
-        c.setFillColor(colors_scheme['light_text'])
+        c.setFillColor(self.colors_scheme['light_text'])
         c.drawCentredString(self.page_width / 2, 25 * mm,
                            "Faktura vystavena elektronicky a je platná bez podpisu.")
 
@@ -0,0 +1,257 @@
+"""Výstupní profily PDF - volba mezi rychlostí generování a velikostí souboru.
+
+Modul nezávisí na reportlabu, aby CLI mohlo profily validovat bez
+importu těžkých modulů.
+"""
+
+import struct
+import zlib
+from typing import BinaryIO, List, NamedTuple, Optional
+
+
+class FlateFilter:
+    """
+    Filtr proudu FlateDecode se zvolenou úrovní komprese.
+
+    Má stejné rozhraní jako filtry reportlabu (pdfdoc.PDFZCompress), takže
+    se dá nastavit dokumentu jako výchozí filtr proudů.
+    """
+
+    pdfname = 'FlateDecode'
+
+    def __init__(self, level: int = zlib.Z_DEFAULT_COMPRESSION):
+        self.level = level
+
+    def encode(self, text) -> bytes:
+        if isinstance(text, str):
+            text = text.encode('utf8')
+        return zlib.compress(text, self.level)
+
+    def decode(self, encoded: bytes) -> bytes:
+        return zlib.decompress(encoded)
+
+
+class OutputProfile(NamedTuple):
+    """
+    Nastavení komprese výstupního PDF.
+
+    Profil 'smallest' navíc uloží všechny objekty kromě proudů (stránky,
+    slovníky fontů, anotace, přílohy) komprimovaně v proudu objektů
+    (/ObjStm) a tabulku odkazů jako proud (/XRef, PDF 1.5) - viz
+    pack_object_streams. Při přepisu hotového PDF přes pypdf
+    (add_qr_to_existing_pdf, attach_isdoc_to_pdf) se před tím ještě sloučí
+    shodné objekty.
+
+    Attributes:
+        name: Název profilu
+        compression_level: Úroveň zlib pro proudy stránek, fontů, formulářů
+            a příloh (None = proudy se nekomprimují, přílohy výchozí úrovní)
+        deduplicate: Zda při přepisu hotového PDF (pypdf) sloučit shodné
+            objekty a odstranit nepoužité
+        object_streams: Zda uložit objekty do proudu objektů s tabulkou
+            odkazů jako proudem
+    """
+    name: str
+    compression_level: Optional[int]
+    deduplicate: bool = False
+    object_streams: bool = False
+
+    @property
+    def stream_filters(self) -> Optional[List[FlateFilter]]:
+        """Filtry proudů pro reportlab (None = bez komprese)."""
+        if self.compression_level is None:
+            return None
+        return [FlateFilter(self.compression_level)]
+
+
+# fast - proudy bez komprese (dosavadní výstup, nejrychlejší zápis)
+# balanced - Flate bez ASCII85 obalu, zhruba poloviční velikost
+# smallest - nejvyšší úroveň Flate, proudy objektů a tabulka odkazů jako
+#            proud, při přepisu hotového PDF slučování shodných objektů
+OUTPUT_PROFILES = {
+    'fast': OutputProfile('fast', None),
+    'balanced': OutputProfile('balanced', zlib.Z_DEFAULT_COMPRESSION),
+    'smallest': OutputProfile('smallest', zlib.Z_BEST_COMPRESSION, deduplicate=True,
+                              object_streams=True),
+}
+
+DEFAULT_PROFILE = 'fast'
+
+
+def get_output_profile(name: Optional[str] = None) -> OutputProfile:
+    """
+    Vrací výstupní profil podle názvu.
+
+    Args:
+        name: Název profilu (None = DEFAULT_PROFILE)
+
+    Returns:
+        Instance OutputProfile
+
+    Raises:
+        ValueError: Pokud profil neexistuje
+    """
+    name = name or DEFAULT_PROFILE
+    if name not in OUTPUT_PROFILES:
+        raise ValueError(f"Neznámý výstupní profil: {name}. Dostupné: {', '.join(OUTPUT_PROFILES)}")
+    return OUTPUT_PROFILES[name]
+
+
+def compress_pdf_writer(writer, profile: OutputProfile):
+    """
+    Zkomprimuje PDF přepisované přes pypdf podle výstupního profilu.
+
+    Pypdf zapisuje sloučený obsah stránek i nové přílohy bez komprese
+    a nekomprimované proudy původního PDF (fonty z profilu 'fast') jen
+    přenese. Volá se těsně před zápisem, po přidání stránek a příloh.
+    Používá jen veřejné API pypdf: obsah stránek komprimuje
+    PageObject.compress_content_streams, ostatní proudy dosažitelné z katalogu
+    dokumentu se zakódují na místě (set_data s filtrem FlateDecode).
+
+    Args:
+        writer: pypdf.PdfWriter se sestaveným dokumentem
+        profile: Výstupní profil
+    """
+    from pypdf.generic import (ArrayObject, DictionaryObject, IndirectObject,
+                               NameObject, StreamObject)
+
+    level = profile.compression_level
+    if level is None:
+        return
+
+    for page in writer.pages:
+        page.compress_content_streams(level=level)
+
+    # Průchod grafem objektů od katalogu - každý nepřímý objekt jen jednou
+    seen = set()
+    stack = [writer.root_object]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, IndirectObject):
+            if obj.idnum in seen:
+                continue
+            seen.add(obj.idnum)
+            obj = obj.get_object()
+        if isinstance(obj, StreamObject) and '/Filter' not in obj:
+            data = obj.get_data()
+            obj[NameObject('/Filter')] = NameObject('/FlateDecode')
+            obj.set_data(zlib.compress(data, level))
+        if isinstance(obj, DictionaryObject):
+            stack.extend(obj.values())
+        elif isinstance(obj, ArrayObject):
+            stack.extend(obj)
+
+    if profile.deduplicate:
+        writer.compress_identical_objects()
+
+
+def write_pdf_writer(writer, stream: BinaryIO, profile: OutputProfile):
+    """
+    Zapíše PDF přepisované přes pypdf do proudu podle výstupního profilu.
+
+    Args:
+        writer: pypdf.PdfWriter se sestaveným (a zkomprimovaným) dokumentem
+        stream: Cílový binární proud
+        profile: Výstupní profil
+    """
+    if not profile.object_streams:
+        writer.write(stream)
+        return
+
+    from io import BytesIO
+
+    buffer = BytesIO()
+    writer.write(buffer)
+    stream.write(pack_object_streams(buffer.getvalue(), profile.compression_level))
+
+
+def pack_object_streams(pdf: bytes, level: int = zlib.Z_BEST_COMPRESSION) -> bytes:
+    """
+    Přepíše PDF tak, aby objekty kromě proudů byly v jednom proudu objektů.
+
+    Pypdf ani reportlab proudy objektů nezapisují. Dokument se proto načte
+    přes pypdf a objekty se serializují jeho veřejným API (write_to_stream)
+    se stejnými čísly objektů, takže odkazy mezi nimi platí dál. Proudy
+    (obsah stránek, fonty, obrázky, přílohy) zůstanou samostatnými objekty
+    beze změny, ostatní objekty se zapíší komprimovaně do jednoho /ObjStm
+    a tabulka odkazů do proudu /XRef. Šifrované PDF se vrátí beze změny.
+
+    Args:
+        pdf: Obsah PDF
+        level: Úroveň zlib pro proud objektů a tabulku odkazů
+
+    Returns:
+        Obsah PDF 1.5 s proudem objektů
+    """
+    from io import BytesIO
+
+    from pypdf import PdfReader
+    from pypdf.generic import StreamObject
+
+    reader = PdfReader(BytesIO(pdf))
+    trailer = reader.trailer
+    if '/Encrypt' in trailer:
+        return pdf
+
+    # Čísla objektů bez záznamu v tabulce odkazů (např. po slučování
+    # shodných objektů v pypdf) zůstanou volná
+    idnums = sorted(set(reader.xref.get(0, ())) | set(reader.xref_objStm))
+    streams = []
+    packed = []
+    for idnum in idnums:
+        obj = reader.get_object(idnum)
+        if obj is None:
+            continue
+        buffer = BytesIO()
+        obj.write_to_stream(buffer)
+        (streams if isinstance(obj, StreamObject) else packed).append((idnum, buffer.getvalue()))
+
+    output = BytesIO()
+    output.write(b'%PDF-1.5\n%\xe2\xe3\xcf\xd3\n')
+    # Záznamy tabulky odkazů: (typ, pole 2, pole 3) podle čísla objektu
+    entries = {0: (0, 0, 65535)}
+
+    def write_object(idnum: int, body: bytes):
+        entries[idnum] = (1, output.tell(), 0)
+        output.write(b'%d 0 obj\n' % idnum + body + b'\nendobj\n')
+
+    def stream_body(dictionary: bytes, data: bytes) -> bytes:
+        data = zlib.compress(data, level)
+        return (b'<< ' + dictionary + b' /Filter /FlateDecode /Length %d >>\nstream\n' % len(data)
+                + data + b'\nendstream')
+
+    for idnum, body in streams:
+        write_object(idnum, body)
+
+    objstm_id = max(trailer['/Size'], idnums[-1] + 1 if idnums else 1)
+    if packed:
+        offsets = []
+        content = BytesIO()
+        for position, (idnum, body) in enumerate(packed):
+            offsets.append(b'%d %d' % (idnum, content.tell()))
+            content.write(body + b'\n')
+            entries[idnum] = (2, objstm_id, position)
+        header = b' '.join(offsets) + b'\n'
+        write_object(objstm_id, stream_body(
+            b'/Type /ObjStm /N %d /First %d' % (len(packed), len(header)),
+            header + content.getvalue()))
+
+    xref_id = objstm_id + 1
+    xref_offset = output.tell()
+    entries[xref_id] = (1, xref_offset, 0)
+    # Chybějící čísla objektů jsou volné záznamy (typ 0)
+    table = b''.join(struct.pack('>BIH', *entries.get(idnum, (0, 0, 0)))
+                     for idnum in range(xref_id + 1))
+
+    # Odkazy na katalog, metadata a ID dokumentu přejdou z původního traileru
+    trailer_keys = BytesIO()
+    for key in ('/Root', '/Info', '/ID'):
+        if key in trailer:
+            trailer_keys.write(key.encode('ascii') + b' ')
+            trailer[key].write_to_stream(trailer_keys)
+            trailer_keys.write(b' ')
+    write_object(xref_id, stream_body(
+        b'/Type /XRef /Size %d /W [1 4 2] ' % (xref_id + 1) + trailer_keys.getvalue(), table))
+
+    output.write(b'startxref\n%d\n%%%%EOF\n' % xref_offset)
+    return output.getvalue()
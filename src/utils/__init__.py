@@ -1,6 +1,7 @@
 """Pomocné utility funkce."""
 
-from .file_utils import ensure_output_dir, generate_filename
-
-__all__ = ['ensure_output_dir', 'generate_filename']
+from .file_utils import ensure_output_dir, generate_filename, create_unique_file
+from .sinks import OutputSink, DirectorySink, ZipSink, TarSink, StdoutSink, open_sink
 
+__all__ = ['ensure_output_dir', 'generate_filename', 'create_unique_file',
+           'OutputSink', 'DirectorySink', 'ZipSink', 'TarSink', 'StdoutSink', 'open_sink']
@@ -51,6 +51,37 @@ def generate_filename(prefix: str, extension: str, invoice_number: str = None, o
         return f"{prefix}_{timestamp}.{extension}"
 
 
+def create_unique_file(output_dir: Path, filename: str) -> Path:
+    """
+    Atomicky vytvoří prázdný soubor s unikátním názvem.
+    
+    Soubor se zakládá s O_EXCL (režim 'xb'), takže dva procesy nikdy
+    nedostanou stejný název, ani když generují faktury se stejným číslem
+    současně. Při kolizi se před příponu doplní pořadí (_2, _3, ...),
+    stejně jako v sincích (OutputSink).
+    
+    Args:
+        output_dir: Výstupní adresář
+        filename: Požadovaný název souboru
+        
+    Returns:
+        Cesta k vytvořenému (prázdnému) souboru
+    """
+    stem, dot, extension = filename.rpartition('.')
+    if not dot:
+        stem, extension = filename, ''
+    
+    candidate, counter = filename, 2
+    while True:
+        file_path = Path(output_dir) / candidate
+        try:
+            with open(file_path, 'xb'):
+                return file_path
+        except FileExistsError:
+            candidate = f"{stem}_{counter}{dot}{extension}"
+            counter += 1
+
+
 def get_font_path(font_name: str) -> str:
     """
     Vrací cestu k fontu nebo None, pokud se použije výchozí font.
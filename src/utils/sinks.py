@@ -0,0 +1,205 @@
+"""Výstupní úložiště (sinky) pro dávkové generování faktur."""
+
+import io
+import sys
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from .file_utils import ensure_output_dir
+
+
+class OutputSink(ABC):
+    """
+    Cíl, do kterého se průběžně zapisují hotové soubory dávky.
+
+    Každý soubor se zapíše hned po vygenerování, celá dávka tedy nikdy
+    neleží v paměti. Sink se používá jako context manager.
+    """
+
+    # Zda sink zapisuje na standardní výstup (výpisy pak musí jít na stderr)
+    uses_stdout = False
+
+    def __init__(self):
+        self._names = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add(self, name: str, data: bytes) -> str:
+        """
+        Zapíše jeden soubor do sinku.
+
+        Args:
+            name: Požadovaný název souboru (při kolizi se doplní pořadí)
+            data: Obsah souboru
+
+        Returns:
+            Popis umístění zapsaného souboru
+        """
+        name = self._unique_name(name)
+        self._names.add(name)
+        return self._write(name, data)
+
+    def _unique_name(self, name: str) -> str:
+        """Zajistí, že se soubor stejného jména nepřepíše."""
+        if not self._exists(name):
+            return name
+
+        stem, dot, extension = name.rpartition('.')
+        if not dot:
+            stem, extension = name, ''
+        counter = 2
+        while True:
+            candidate = f"{stem}_{counter}{dot}{extension}"
+            if not self._exists(candidate):
+                return candidate
+            counter += 1
+
+    def _exists(self, name: str) -> bool:
+        return name in self._names
+
+    @abstractmethod
+    def _write(self, name: str, data: bytes) -> str:
+        """Zapíše soubor s již unikátním názvem."""
+
+    def close(self):
+        """Dokončí a uzavře výstup."""
+
+
+class DirectorySink(OutputSink):
+    """Ukládá soubory jednotlivě do adresáře."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = ensure_output_dir(path)
+
+    def _exists(self, name: str) -> bool:
+        return name in self._names or (self.path / name).exists()
+
+    def _write(self, name: str, data: bytes) -> str:
+        file_path = self.path / name
+        file_path.write_bytes(data)
+        return str(file_path)
+
+    def __str__(self):
+        return str(self.path)
+
+
+class ZipSink(OutputSink):
+    """Zapisuje soubory průběžně do ZIP archivu."""
+
+    def __init__(self, path: str, compresslevel: int = 6):
+        import zipfile
+
+        super().__init__()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._archive = zipfile.ZipFile(self.path, 'w', compression=zipfile.ZIP_DEFLATED,
+                                        compresslevel=compresslevel)
+
+    def _write(self, name: str, data: bytes) -> str:
+        self._archive.writestr(name, data)
+        return f"{self.path}:{name}"
+
+    def close(self):
+        self._archive.close()
+
+    def __str__(self):
+        return str(self.path)
+
+
+class TarSink(OutputSink):
+    """
+    Zapisuje soubory průběžně do tar archivu nebo tar proudu.
+
+    Při zápisu do proudu (např. stdout) se používá neseekovatelný režim 'w|',
+    takže výstup lze rovnou posílat rourou dalšímu programu.
+    """
+
+    def __init__(self, path: Optional[str] = None, stream: Optional[BinaryIO] = None):
+        import tarfile
+
+        super().__init__()
+        self.path = Path(path) if path else None
+
+        if stream is not None:
+            self._archive = tarfile.open(fileobj=stream, mode='w|')
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            compression = 'gz' if self.path.name.endswith(('.tar.gz', '.tgz')) else ''
+            self._archive = tarfile.open(self.path, mode=f'w:{compression}')
+
+    def _write(self, name: str, data: bytes) -> str:
+        import tarfile
+
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        self._archive.addfile(info, io.BytesIO(data))
+        return f"{self}:{name}"
+
+    def close(self):
+        self._archive.close()
+
+    def __str__(self):
+        return str(self.path) if self.path else '<stdout>'
+
+
+class StdoutSink(TarSink):
+    """Posílá dávku jako tar proud na standardní výstup."""
+
+    uses_stdout = True
+
+    def __init__(self):
+        super().__init__(stream=sys.stdout.buffer)
+
+    def close(self):
+        super().close()
+        sys.stdout.buffer.flush()
+
+
+def open_sink(spec: str) -> OutputSink:
+    """
+    Vytvoří sink podle textové specifikace z příkazové řádky.
+
+    Podporované tvary:
+        dir:CESTA         - jednotlivé soubory v adresáři
+        zip:CESTA.zip     - ZIP archiv
+        tar:CESTA.tar     - tar archiv (.tar.gz/.tgz s kompresí gzip)
+        tar: nebo tar:-   - tar proud na stdout
+        -                 - tar proud na stdout
+
+    Args:
+        spec: Specifikace sinku
+
+    Returns:
+        Otevřený sink
+
+    Raises:
+        ValueError: Při neznámém typu nebo chybějící cestě
+    """
+    if spec == '-':
+        return StdoutSink()
+
+    kind, sep, target = spec.partition(':')
+    if not sep:
+        raise ValueError(f"Neplatná specifikace výstupu '{spec}' (očekáváno typ:cesta nebo -)")
+
+    if kind == 'tar':
+        return StdoutSink() if target in ('', '-') else TarSink(target)
+
+    if not target:
+        raise ValueError(f"Výstup '{kind}' vyžaduje cestu, např. {kind}:output")
+
+    if kind == 'dir':
+        return DirectorySink(target)
+    if kind == 'zip':
+        return ZipSink(target)
+
+    raise ValueError(f"Neznámý typ výstupu '{kind}' (podporováno: dir, zip, tar, -)")
@@ -0,0 +1,7 @@
+"""Společné nastavení testů - moduly generátoru se importují ze src/ jako v CLI."""
+
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+sys.path.insert(0, str(SRC_DIR))
@@ -0,0 +1,62 @@
+"""Testy uložených součtů faktury a jejich zneplatnění."""
+
+import random
+from datetime import date
+
+import pytest
+
+import data_utils
+from models import Invoice, Item
+
+
+def _invoice(items: list) -> Invoice:
+    """Faktura se zadaným seznamem položek a náhodnými firmami."""
+    rng = random.Random(0)
+    return Invoice(invoice_number='20250101001',
+                   supplier=data_utils.generate_czech_company(rng=rng),
+                   customer=data_utils.generate_czech_company(rng=rng),
+                   items=items, issue_date=date(2025, 1, 1), due_date=date(2025, 1, 15))
+
+
+def _expected_base(items) -> int:
+    return sum(item.quantity * item.unit_price for item in items)
+
+
+def test_invoice_shares_callers_list():
+    items = [Item('Konzultace', 2, 'hod', 100)]
+    invoice = _invoice(items)
+    assert invoice.total_without_vat == 200
+
+    items.append(Item('Licence', 1, 'ks', 50, 10))
+
+    assert invoice.items is items
+    assert invoice.total_without_vat == 250
+    assert set(invoice.get_vat_summary()) == {21, 10}
+
+
+@pytest.mark.parametrize('change', [
+    lambda items: items.__setitem__(0, Item('Školení', 3, 'hod', 100)),
+    lambda items: items.__delitem__(0),
+    lambda items: items.extend([Item('Licence', 4, 'ks', 25)]),
+    lambda items: items.reverse(),
+    lambda items: setattr(items[0], 'quantity', 7),
+    lambda items: setattr(items[1], 'vat_rate', 0),
+], ids=['setitem', 'delitem', 'extend', 'reverse', 'quantity', 'vat_rate'])
+def test_cached_totals_follow_changes(change):
+    items = [Item('Konzultace', 2, 'hod', 100), Item('Licence', 1, 'ks', 50, 10)]
+    invoice = _invoice(items)
+    invoice.total_with_vat
+
+    change(items)
+
+    assert invoice.total_without_vat == _expected_base(items)
+    assert invoice.total_vat == sum(item.vat_amount for item in items)
+
+
+def test_replaced_items_list():
+    invoice = _invoice([Item('Konzultace', 2, 'hod', 100)])
+    invoice.total_without_vat
+
+    invoice.items = [Item('Licence', 1, 'ks', 50)]
+
+    assert invoice.total_without_vat == 50
@@ -0,0 +1,51 @@
+"""Testy sloupcového úložiště položek (ItemColumns) a jeho použití z konfigurace."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from data_utils import COLUMN_ITEMS_THRESHOLD, InvoicePrototype
+from invoice_generator import InvoiceGenerator
+from models import Item, ItemColumns
+
+_CONFIG = Path(__file__).resolve().parent.parent / 'src' / 'test_config.json'
+
+
+def _config(count: int, quantity, unit_price) -> dict:
+    """Testovací konfigurace se zadaným počtem stejných položek."""
+    with open(_CONFIG, encoding='utf-8') as f:
+        data = json.load(f)
+    data['items'] = [{'description': f'Odběrné místo {i}', 'quantity': quantity, 'unit': 'kWh',
+                      'unit_price': unit_price, 'vat_rate': 21} for i in range(count)]
+    return data
+
+
+@pytest.mark.parametrize('count', [COLUMN_ITEMS_THRESHOLD - 1, COLUMN_ITEMS_THRESHOLD])
+def test_fractional_items_load_around_threshold(count):
+    invoice = InvoicePrototype(_config(count, 1.5, 2)).build()
+
+    assert type(invoice.items[0]) is Item
+    assert invoice.total_without_vat == pytest.approx(count * 3.0)
+
+
+def test_fractional_items_render():
+    invoice = InvoicePrototype(_config(COLUMN_ITEMS_THRESHOLD, 0.25, 4)).build()
+    result = InvoiceGenerator(output_dir=None).render_invoice(invoice=invoice, invariant=True)
+
+    assert result['pdf'].startswith(b'%PDF')
+
+
+def test_integral_items_use_columns():
+    prototype = InvoicePrototype(_config(COLUMN_ITEMS_THRESHOLD, 3, 2))
+
+    assert type(prototype.items) is ItemColumns
+    assert prototype.build().total_without_vat == COLUMN_ITEMS_THRESHOLD * 6
+
+
+@pytest.mark.parametrize('values', [(1.5, 2, 21), (1, 2.5, 21), (1, 2, 21.0)])
+def test_add_rejects_non_integral_values(values):
+    quantity, unit_price, vat_rate = values
+
+    with pytest.raises(ValueError):
+        ItemColumns().add('Odběr', quantity, 'kWh', unit_price, vat_rate)
@@ -0,0 +1,51 @@
+"""Testy výstupních profilů PDF."""
+
+from io import BytesIO
+
+import pypdf
+import pytest
+
+import data_utils
+from invoice_generator import InvoiceGenerator
+from isdoc_generator import attach_isdoc_to_pdf
+from pdf_templates import get_template
+from qr_generator import add_qr_to_existing_pdf
+
+
+def _read(pdf: bytes) -> pypdf.PdfReader:
+    return pypdf.PdfReader(BytesIO(pdf), strict=True)
+
+
+@pytest.mark.parametrize('template', ['classic', 'modern', 'minimal'])
+def test_smallest_uses_object_streams(template):
+    invoice = data_utils.generate_seeded_invoice(7, 0)
+    generator = InvoiceGenerator(output_dir=None)
+    balanced, smallest = (
+        generator.render_invoice(invoice=invoice, template=template, with_qr=True,
+                                 with_isdoc=True, invariant=True, profile=profile)['pdf']
+        for profile in ('balanced', 'smallest'))
+
+    assert smallest.startswith(b'%PDF-1.5')
+    assert b'/ObjStm' in smallest and b'/XRef' in smallest
+    assert len(smallest) < len(balanced) * 0.97
+
+    expected, packed = _read(balanced), _read(smallest)
+    assert [page.extract_text() for page in packed.pages] == \
+        [page.extract_text() for page in expected.pages]
+    assert packed.attachments == expected.attachments
+    assert packed.metadata.title == expected.metadata.title
+
+
+def test_smallest_rewrite_of_existing_pdf(tmp_path):
+    invoice = data_utils.generate_seeded_invoice(7, 1)
+    path = tmp_path / 'invoice.pdf'
+    get_template('classic')().generate(invoice, str(path), invariant=True, profile='fast')
+
+    add_qr_to_existing_pdf(invoice, str(path), profile='smallest')
+    attach_isdoc_to_pdf(invoice, str(path), profile='smallest')
+
+    data = path.read_bytes()
+    reader = _read(data)
+    assert b'/ObjStm' in data
+    assert len(reader.pages) == 1
+    assert list(reader.attachments) == ['isdoc.xml']
@@ -0,0 +1,46 @@
+"""Testy reprodukovatelnosti dávky se --seed (faktura i nezávisí na způsobu generování)."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+
+COUNT = 6
+SEED = 42
+
+
+def _generate(output_dir: Path, count: int, *options) -> list:
+    """
+    Vygeneruje faktury přes CLI a vrátí je v pořadí dávky.
+
+    Returns:
+        Seznam dvojic (název souboru, obsah PDF)
+    """
+    result = subprocess.run(
+        [sys.executable, 'main.py', 'generate', '--count', str(count), '--seed', str(SEED),
+         '--qr', '--isdoc', '--output', str(output_dir), *options],
+        cwd=SRC_DIR, check=True, capture_output=True, text=True
+    )
+    # Cesty se vypisují v pořadí dávky - u jedné faktury jako "PDF: ...",
+    # u dávky jako "[i/N] Vygenerováno: ..."
+    paths = [line.rsplit(': ', 1)[1] for line in result.stdout.splitlines()
+             if 'Vygenerováno: ' in line or line.strip().startswith('PDF: ')]
+    assert len(paths) == count, result.stdout
+    return [(Path(path).name, Path(path).read_bytes()) for path in paths]
+
+
+@pytest.mark.parametrize('pool_options', [
+    (),
+    ('--suppliers', '3', '--customers', '3'),
+    ('--suppliers', '2', '--customers', '5', '--skew', '1.0'),
+], ids=['no-pools', 'pools', 'skewed-pools'])
+def test_single_sequential_and_parallel_are_identical(tmp_path, pool_options):
+    single = _generate(tmp_path / 'single', 1, *pool_options)
+    sequential = _generate(tmp_path / 'sequential', COUNT, '--workers', '1', *pool_options)
+    parallel = _generate(tmp_path / 'parallel', COUNT, '--workers', '4', *pool_options)
+
+    assert single == sequential[:1]
+    assert sequential == parallel